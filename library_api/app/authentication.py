@@ -0,0 +1,78 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from app.cache import LRUCache
+
+token_cache = LRUCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
+stamp_key = 'token-auth:stamp:{}'
+
+TOKEN_FIELDS = ('key', 'user_id', 'created')
+
+
+def get_user_fields():
+    # In model order, as `Model.from_db` expects.
+    user_model = get_user_model()
+    cached = {user_model._meta.pk.attname, user_model.USERNAME_FIELD, 'is_active', 'is_staff', 'is_superuser'}
+    return tuple(field.attname for field in user_model._meta.concrete_fields if field.attname in cached)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for `TokenAuthentication` that remembers successful
+    token lookups in a process-local LRU cache.
+
+    An entry holds the token and the user's id, username and flags, not
+    model instances, and every request builds its own instances from them.
+    It is only used while the token's stamp in the default cache is still
+    the one read before the lookup: the signal handlers in `app.signals`
+    replace the stamp whenever the token is deleted or its user is saved,
+    so with a default cache shared between workers revocation and
+    permission changes apply from the next request in every process. The
+    TTL bounds staleness for changes that bypass signals (e.g.
+    `QuerySet.update`).
+    """
+
+    def authenticate_credentials(self, key):
+        stamp = cache.get(stamp_key.format(key))
+        cached = token_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return self.build_credentials(*cached[1:])
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, (
+            stamp,
+            tuple(getattr(user, field) for field in get_user_fields()),
+            tuple(getattr(token, field) for field in TOKEN_FIELDS),
+        ))
+
+        return user, token
+
+    def build_credentials(self, user_values, token_values):
+        # Other user fields are deferred and loaded on first access.
+        user = get_user_model().from_db(DEFAULT_DB_ALIAS, get_user_fields(), user_values)
+        token = Token.from_db(DEFAULT_DB_ALIAS, TOKEN_FIELDS, token_values)
+        token.user = user
+
+        return user, token
+
+
+def invalidate_token(key):
+    def replace_stamp():
+        cache.set(stamp_key.format(key), uuid.uuid4().hex, settings.TOKEN_CACHE_TTL)
+
+    # Again on commit, or a lookup between the two could cache the old row.
+    replace_stamp()
+    transaction.on_commit(replace_stamp)
+    token_cache.delete(key)
+
+
+def invalidate_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
@@ -0,0 +1,130 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class LRUCache:
+    """
+    Small thread-safe in-process LRU cache with a per-entry time to live.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class ResponseCache:
+    """
+    Cache of serialized GET responses with version-based invalidation.
+
+    Every response declares the resources it depends on, e.g. `books` for
+    the book list or `books:42` for one book. Each resource has a version
+    (the second it last changed) kept in the cache; the response key is
+    derived from the URL and the current versions of its dependencies, so
+    touching a resource makes every response built from it unreachable
+    without having to track or delete the entries themselves.
+
+    The key doubles as the ETag and the newest version as Last-Modified, so
+    conditional requests are answered without touching the database. Since
+    Last-Modified has whole-second precision, a touch always moves a version
+    to a later second, running ahead of the clock while a resource changes
+    more than once a second; otherwise a client could be sent a 304 for a
+    change made in the same second as its copy.
+
+    The default local-memory backend is per process; with several workers
+    configure a shared backend (e.g. `FileBasedCache`) so invalidations are
+    seen by all of them. Commands that write the catalog outside the web
+    processes, `run_workers` included, refuse to run without one.
+    """
+    version_key = 'response-cache:version:{}'
+    data_key = 'response-cache:data:{}'
+
+    def __init__(self, alias='default', timeout=600):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def shared(self):
+        return not isinstance(self.cache, LocMemCache)
+
+    def get_versions(self, dependencies):
+        keys = [self.version_key.format(dependency) for dependency in dependencies]
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                self.cache.add(key, math.ceil(time.time()), None)
+                versions[key] = self.cache.get(key)
+
+        return [versions[key] for key in keys]
+
+    def touch(self, *dependencies):
+        now = math.ceil(time.time())
+        keys = [self.version_key.format(dependency) for dependency in dependencies]
+        previous = self.cache.get_many(keys)
+        self.cache.set_many({key: max(now, math.floor(previous.get(key, 0)) + 1) for key in keys}, None)
+
+    def make_key(self, *parts):
+        return hashlib.md5(repr(parts).encode()).hexdigest()
+
+    def get(self, key):
+        return self.cache.get(self.data_key.format(key))
+
+    def set(self, key, data):
+        self.cache.set(self.data_key.format(key), data, self.timeout)
+
+
+response_cache = ResponseCache(timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+LOCAL_CACHE_ERROR = (
+    'The default cache is local to this process, so the web processes would keep serving responses cached '
+    'before its writes. Set CACHE_BACKEND to a shared backend, e.g. FileBasedCache.'
+)
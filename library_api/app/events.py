@@ -0,0 +1,226 @@
+import asyncio
+import itertools
+import json
+import threading
+import uuid
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+class Event:
+    __slots__ = ('id', 'name', 'data', '_encoded')
+
+    def __init__(self, id, name, data):
+        self.id = id
+        self.name = name
+        self.data = data
+        self._encoded = None
+
+    def encode(self):
+        # Encoded once and shared by every subscriber.
+        if self._encoded is None:
+            data = json.dumps(self.data, cls=DjangoJSONEncoder, separators=(',', ':'))
+            self._encoded = f'id: {self.id}\nevent: {self.name}\ndata: {data}\n\n'.encode()
+
+        return self._encoded
+
+
+# Sent instead of a replay when the requested event is no longer known to
+# this process; the client has to catch up through the change feed.
+RESET_EVENT = b'event: reset\ndata: {}\n\n'
+KEEP_ALIVE = b': keep-alive\n\n'
+
+
+class Subscription:
+    """
+    Events published to one client that it has not been sent yet.
+
+    At most `max_pending` events are queued. A client that falls further
+    behind is marked `overflowed` and no longer receives events, so a slow
+    reader never holds up the publisher or other subscribers; its stream is
+    closed and it resumes from its last event id.
+    """
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.overflowed = False
+        self.loop = None
+        self._lock = threading.Lock()
+        self._notified = False
+        self._wakeup = None
+        self._overflow = None
+
+    def bind(self):
+        """
+        Bind to the running event loop so `wait` and `wait_overflowed` wake
+        up on events pushed from other threads.
+        """
+        with self._lock:
+            self.loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._overflow = asyncio.Event()
+            self._notified = bool(self.pending)
+            self.wake()
+
+    def push(self, event):
+        """
+        Queue `event` and return whether the subscriber has to be woken up
+        with `wake` on its loop.
+        """
+        with self._lock:
+            if self.overflowed:
+                return False
+            if len(self.pending) >= self.max_pending:
+                self.overflowed = True
+                self.pending.clear()
+            else:
+                self.pending.append(event)
+            if self.loop is None or (self._notified and not self.overflowed):
+                return False
+            self._notified = True
+            return True
+
+    def wake(self):
+        if self.pending:
+            self._wakeup.set()
+        if self.overflowed:
+            self._overflow.set()
+
+    def drain(self):
+        with self._lock:
+            events = list(self.pending)
+            self.pending.clear()
+            if self._wakeup is not None:
+                self._wakeup.clear()
+            self._notified = False
+            return events
+
+    async def wait(self):
+        """
+        Wait until events are pending or the subscription overflowed.
+        """
+        await self._wakeup.wait()
+
+    async def wait_overflowed(self):
+        await self._overflow.wait()
+
+
+def wake_all(subscriptions):
+    for subscription in subscriptions:
+        subscription.wake()
+
+
+class EventHub:
+    """
+    In-process broadcast of catalog events to any number of subscribers.
+
+    Published events get an id unique to this hub and the last `backlog`
+    of them are kept, so a reconnecting client that passes the id of the
+    last event it saw is replayed what it missed. Ids from another process
+    or from before a restart are not known here; those clients are sent a
+    `reset` event instead.
+    """
+
+    def __init__(self, backlog=1000, max_pending=100, max_subscribers=1000):
+        self.backlog = deque(maxlen=backlog)
+        self.max_pending = max_pending
+        self.max_subscribers = max_subscribers
+        self.subscriptions = set()
+        self._prefix = uuid.uuid4().hex[:8]
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, name, data):
+        woken = defaultdict(list)
+        with self._lock:
+            event = Event(f'{self._prefix}-{next(self._ids)}', name, data)
+            self.backlog.append(event)
+            for subscription in self.subscriptions:
+                if subscription.push(event):
+                    woken[subscription.loop].append(subscription)
+
+        # One callback per loop rather than per subscriber.
+        for loop, subscriptions in woken.items():
+            loop.call_soon_threadsafe(wake_all, subscriptions)
+
+        return event
+
+    def replay(self, last_event_id):
+        """
+        Return the events published after `last_event_id`, or None if that
+        event is not in the backlog.
+        """
+        with self._lock:
+            return self._replay(last_event_id)
+
+    def _replay(self, last_event_id):
+        if not last_event_id:
+            return []
+
+        events = list(self.backlog)
+        for index, event in enumerate(events):
+            if event.id == last_event_id:
+                return events[index + 1:]
+
+        return None
+
+    def subscribe(self, last_event_id=None):
+        """
+        Return `(subscription, replayed)` with the events after
+        `last_event_id` replayed and every later event pushed to the
+        subscription, or None if `max_subscribers` are already subscribed.
+        """
+        with self._lock:
+            if len(self.subscriptions) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.max_pending)
+            self.subscriptions.add(subscription)
+            return subscription, self._replay(last_event_id)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscriptions.discard(subscription)
+
+    def clear(self):
+        with self._lock:
+            self.backlog.clear()
+            self.subscriptions.clear()
+
+
+event_hub = EventHub(backlog=settings.EVENT_STREAM_BACKLOG, max_pending=settings.EVENT_STREAM_MAX_PENDING,
+                     max_subscribers=settings.EVENT_STREAM_MAX_SUBSCRIBERS)
+
+
+def encode_replay(events):
+    if events is None:
+        return RESET_EVENT
+
+    return b''.join(event.encode() for event in events)
+
+
+class EventStreamResponse(StreamingHttpResponse):
+    """
+    `text/event-stream` of the events published to `hub`.
+
+    `CatalogASGIHandler` keeps the stream open and sends events as they are
+    published. Any other handler sends the events missed since
+    `last_event_id` and ends the response, and the client reconnects after
+    `retry` milliseconds, which degrades to polling.
+    """
+
+    def __init__(self, hub, last_event_id=None, retry=3000):
+        self.hub = hub
+        self.last_event_id = last_event_id
+        self.retry = retry
+        super().__init__(self.replay(), content_type='text/event-stream')
+        self['Cache-Control'] = 'no-cache'
+        # Keeps reverse proxies such as nginx from buffering the stream.
+        self['X-Accel-Buffering'] = 'no'
+
+    def replay(self):
+        yield f'retry: {self.retry}\n\n'.encode()
+        yield encode_replay(self.hub.replay(self.last_event_id))
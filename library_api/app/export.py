@@ -0,0 +1,88 @@
+import csv
+import json
+
+from app.models import Author, Book
+from app.renderers import FastJSONRenderer
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'json')
+
+# Output field name -> model column, in output order. Field names match the
+# API serializers so an exported row looks like a list-endpoint item.
+EXPORT_COLUMNS = {
+    'authors': (Author, (('id', 'id'), ('name', 'name'), ('surname', 'surname'), ('book_count', 'book_count'))),
+    'books': (Book, (('id', 'id'), ('author', 'author_id'), ('name', 'name'))),
+}
+
+
+class Echo:
+    """
+    File-like object whose `write` returns the value instead of buffering
+    it, so `csv.writer` can be used to format one row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_export_fields(resource):
+    _, columns = EXPORT_COLUMNS[resource]
+
+    return [field for field, _ in columns]
+
+
+def report_progress(rows, every, progress):
+    """
+    Pass `rows` through, calling `progress` with the number of rows read
+    every `every` rows and once all of them were read.
+    """
+    count = 0
+    for count, row in enumerate(rows, 1):
+        yield row
+        if count % every == 0:
+            progress(count)
+    progress(count)
+
+
+def iter_rows(resource, chunk_size, progress=None):
+    model, columns = EXPORT_COLUMNS[resource]
+    queryset = model._default_manager.order_by('pk').values_list(*(column for _, column in columns))
+    rows = queryset.iterator(chunk_size=chunk_size)
+    if progress is None:
+        return rows
+
+    return report_progress(rows, chunk_size, progress)
+
+
+def iter_ndjson(resource, chunk_size, progress=None):
+    fields = get_export_fields(resource)
+    for row in iter_rows(resource, chunk_size, progress):
+        yield json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+
+
+def iter_json(resource, chunk_size, progress=None):
+    fields = get_export_fields(resource)
+    rows = (dict(zip(fields, row)) for row in iter_rows(resource, chunk_size, progress))
+
+    for chunk in FastJSONRenderer().iter_render(rows, chunk_size):
+        yield chunk.decode()
+
+
+def iter_csv(resource, chunk_size, progress=None):
+    writer = csv.writer(Echo())
+    yield writer.writerow(get_export_fields(resource))
+    for row in iter_rows(resource, chunk_size, progress):
+        yield writer.writerow(row)
+
+
+def iter_export(resource, export_format, chunk_size, progress=None):
+    """
+    Return an iterator of the export of `resource` as text. `progress` is
+    called with the number of rows exported so far.
+    """
+    if export_format == 'csv':
+        return iter_csv(resource, chunk_size, progress)
+
+    if export_format == 'json':
+        return iter_json(resource, chunk_size, progress)
+
+    return iter_ndjson(resource, chunk_size, progress)
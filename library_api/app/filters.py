@@ -0,0 +1,68 @@
+import sys
+
+from django.db import connections
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from app.utils import MAX_DB_INT
+
+
+def prefix_range(field, prefix):
+    """
+    Express `field__startswith=prefix` as a half-open range.
+
+    `LIKE 'prefix%'` never uses an index under SQLite's default
+    case-insensitive LIKE, while `field >= 'prefix' AND field < 'prefiy'` is
+    an index range scan that keeps case-sensitive semantics, since SQLite
+    compares text code point by code point. That only holds under a binary
+    collation: under a linguistic one, as usual on PostgreSQL, the range
+    also holds e.g. `leonid` and `Lé` for `Le`.
+    """
+    # The last code point cannot be incremented past U+10FFFF; every string
+    # starting with the rest of the prefix followed by it sorts last anyway.
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return {f'{field}__gte': prefix}
+
+    upper = ord(stem[-1]) + 1
+    if 0xD800 <= upper <= 0xDFFF:
+        # Surrogates cannot be encoded; skip to the next code point after them.
+        upper = 0xE000
+
+    return {f'{field}__gte': prefix, f'{field}__lt': stem[:-1] + chr(upper)}
+
+
+class IndexedLookupFilter(BaseFilterBackend):
+    """
+    Filters the queryset by the query params declared in the view's
+    `lookup_filters` mapping of `param -> (field, lookup)`, where lookup is
+    `exact`, `int` or `startswith`. Every declared field must be the leading
+    column of an index on the model, and on PostgreSQL `startswith` fields
+    also of a `varchar_pattern_ops` one.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for param, (field, lookup) in getattr(view, 'lookup_filters', {}).items():
+            value = request.query_params.get(param)
+            if not value:
+                continue
+
+            if lookup == 'startswith':
+                if connections[queryset.db].vendor == 'sqlite':
+                    queryset = queryset.filter(**prefix_range(field, value))
+                else:
+                    # LIKE, served by the varchar_pattern_ops indexes of
+                    # migration 0009 on PostgreSQL.
+                    queryset = queryset.filter(**{f'{field}__startswith': value})
+            elif lookup == 'int':
+                try:
+                    value = int(value)
+                except ValueError:
+                    value = None
+                if value is None or abs(value) > MAX_DB_INT:
+                    raise ValidationError({param: ['A valid integer is required.']})
+                queryset = queryset.filter(**{field: value})
+            else:
+                queryset = queryset.filter(**{field: value})
+
+        return queryset
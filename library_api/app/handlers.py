@@ -0,0 +1,150 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from django.db import close_old_connections
+
+from app.events import KEEP_ALIVE, EventStreamResponse, encode_replay
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# `receive` of the connection being served, for watching event streams for
+# the client going away.
+current_receive = contextvars.ContextVar('current_receive')
+
+
+class CatalogASGIHandler(ASGIHandler):
+    """
+    ASGI handler that runs requests on explicit, bounded thread pools.
+
+    Django 3.0 has no async views; the stock handler runs every request
+    through `sync_to_async`, which depending on the asgiref version either
+    funnels all of them through a single thread or an unbounded default
+    executor. Here safe-method requests share a pool of `read_threads`
+    workers, so one process keeps that many reads in flight while the event
+    loop holds any number of slow clients, and writes go through a separate
+    pool of `write_threads` (one by default, which keeps SQLite writers from
+    contending for the database lock).
+
+    `EventStreamResponse`s are served on the event loop itself and stay
+    open, so a subscriber costs a coroutine rather than a thread. Other
+    streaming responses, such as exports, query the database while they are
+    iterated, so they are iterated on a read pool thread that holds it until
+    the client has read the whole body.
+    """
+
+    def __init__(self, read_threads=16, write_threads=1, heartbeat_seconds=15):
+        super().__init__()
+        self.read_executor = ThreadPoolExecutor(read_threads, thread_name_prefix='catalog-read')
+        self.write_executor = ThreadPoolExecutor(write_threads, thread_name_prefix='catalog-write')
+        self.heartbeat_seconds = heartbeat_seconds
+
+    async def __call__(self, scope, receive, send):
+        current_receive.set(receive)
+        await super().__call__(scope, receive, send)
+
+    async def get_response(self, request):
+        executor = self.read_executor if request.method in SAFE_METHODS else self.write_executor
+
+        return await asyncio.get_running_loop().run_in_executor(executor, self.get_response_in_thread, request)
+
+    def get_response_in_thread(self, request):
+        # Pool threads outlive requests, so apply CONN_MAX_AGE to their
+        # connections the way request_started/request_finished would.
+        close_old_connections()
+        try:
+            return BaseHandler.get_response(self, request)
+        finally:
+            close_old_connections()
+
+    async def send_response(self, response, send):
+        if isinstance(response, EventStreamResponse):
+            try:
+                await self.send_event_stream(response, send)
+            finally:
+                response.close()
+        elif response.streaming:
+            await self.send_streaming_response(response, send)
+        else:
+            await super().send_response(response, send)
+
+    def get_response_headers(self, response):
+        headers = [(key.encode('ascii'), value.encode('latin1')) for key, value in response.items()]
+        for cookie in response.cookies.values():
+            headers.append((b'Set-Cookie', cookie.output(header='').encode('ascii').strip()))
+
+        return headers
+
+    async def send_streaming_response(self, response, send):
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': self.get_response_headers(response),
+        })
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.read_executor, self.stream_in_thread, response, send, loop)
+
+    def stream_in_thread(self, response, send, loop):
+        # The whole body is iterated on one thread, so a chunked query keeps
+        # using the connection it was started on.
+        close_old_connections()
+        try:
+            for part in response:
+                for chunk, _ in self.chunk_bytes(part):
+                    body = {'type': 'http.response.body', 'body': chunk, 'more_body': True}
+                    asyncio.run_coroutine_threadsafe(send(body), loop).result()
+            asyncio.run_coroutine_threadsafe(send({'type': 'http.response.body'}), loop).result()
+        finally:
+            response.close()
+            close_old_connections()
+
+    async def send_event_stream(self, response, send):
+        subscribed = response.hub.subscribe(response.last_event_id)
+        if subscribed is None:
+            response.status_code = 503
+            response['Retry-After'] = str(response.retry // 1000)
+            return await super().send_response(response, send)
+
+        subscription, replayed = subscribed
+        subscription.bind()
+        # The stream ends when the client goes away or, since a send only
+        # completes once the client reads, when it falls too far behind.
+        watchers = [
+            asyncio.ensure_future(self.wait_for_disconnect(current_receive.get())),
+            asyncio.ensure_future(subscription.wait_overflowed()),
+        ]
+        ended = asyncio.ensure_future(asyncio.wait(watchers, return_when=asyncio.FIRST_COMPLETED))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': response.status_code,
+                'headers': self.get_response_headers(response),
+            })
+            body = f'retry: {response.retry}\n\n'.encode() + encode_replay(replayed)
+            stalled = False
+            while not ended.done():
+                sending = asyncio.ensure_future(send({'type': 'http.response.body', 'body': body, 'more_body': True}))
+                await asyncio.wait({sending, ended}, return_when=asyncio.FIRST_COMPLETED)
+                if not sending.done():
+                    sending.cancel()
+                    stalled = True
+                    break
+
+                waiting = asyncio.ensure_future(subscription.wait())
+                await asyncio.wait({waiting, ended}, timeout=self.heartbeat_seconds,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                waiting.cancel()
+                body = b''.join(event.encode() for event in subscription.drain()) or KEEP_ALIVE
+
+            if not stalled:
+                await send({'type': 'http.response.body'})
+        finally:
+            response.hub.unsubscribe(subscription)
+            for task in (ended, *watchers):
+                task.cancel()
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
@@ -0,0 +1,160 @@
+import csv
+import itertools
+import json
+import os
+import time
+
+from django.db import transaction
+
+from app.models import Author, Book, ImportCheckpoint, ImportedAuthor
+from app.utils import chunked
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+
+
+class CatalogImportError(Exception):
+    pass
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    if extension not in IMPORT_FORMATS:
+        raise CatalogImportError(f'Cannot detect format of {path}, expected one of: {", ".join(IMPORT_FORMATS)}.')
+
+    return extension
+
+
+def iter_records(path, import_format, skip=0):
+    """
+    Lazily yield one dict per record, skipping the first `skip` records.
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        if import_format == 'csv':
+            yield from itertools.islice(csv.DictReader(file), skip, None)
+        else:
+            lines = (line for line in file if line.strip())
+            for line in itertools.islice(lines, skip, None):
+                yield json.loads(line)
+
+
+class Checkpoint:
+    """
+    Import progress stored in the database under `name`.
+
+    `ImportCheckpoint` rows hold the number of committed records per
+    resource and `ImportedAuthor` rows the pks of imported authors by source
+    id. `commit` is called in the transaction that imported the chunk, so
+    progress and rows commit or roll back together and a resumed import
+    neither skips nor repeats records. Without a name progress is only kept
+    in memory.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.positions = {'authors': 0, 'books': 0}
+        self.author_map = {}
+
+        if name:
+            self.positions.update(ImportCheckpoint.objects.filter(name=name).values_list('resource', 'position'))
+            self.author_map = dict(ImportedAuthor.objects.filter(name=name).values_list('source_id', 'author_id'))
+
+    def commit(self, resource, count, author_map=None):
+        position = self.positions[resource] + count
+        if self.name:
+            ImportCheckpoint.objects.update_or_create(name=self.name, resource=resource,
+                                                      defaults={'position': position})
+            if author_map:
+                ImportedAuthor.objects.bulk_create([
+                    ImportedAuthor(name=self.name, source_id=source_id, author_id=pk)
+                    for source_id, pk in author_map.items()
+                ])
+
+        self.positions[resource] = position
+        if author_map:
+            self.author_map.update(author_map)
+
+
+class CatalogImporter:
+    """
+    Load authors and books from NDJSON/CSV files through batched `bulk_create`.
+
+    Records flow through a generator pipeline, so memory is bounded by
+    `transaction_size`. Each transaction chunk is recorded in the checkpoint
+    as part of its transaction; after a failure the import resumes from the
+    last committed chunk.
+    """
+
+    def __init__(self, batch_size=1000, transaction_size=20000, checkpoint=None, progress=None):
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+        self.checkpoint = checkpoint or Checkpoint()
+        self.progress = progress
+
+    def import_authors(self, path, import_format=None):
+        return self._import('authors', path, import_format, self._load_authors)
+
+    def import_books(self, path, import_format=None):
+        return self._import('books', path, import_format, self._load_books)
+
+    def _import(self, resource, path, import_format, load):
+        import_format = import_format or detect_format(path)
+        position = self.checkpoint.positions[resource]
+        records = iter_records(path, import_format, skip=position)
+        imported = 0
+        started = time.monotonic()
+
+        for chunk in chunked(records, self.transaction_size):
+            try:
+                with transaction.atomic():
+                    author_map = load(chunk)
+                    self.checkpoint.commit(resource, len(chunk), author_map)
+            except (KeyError, ValueError) as error:
+                raise CatalogImportError(f'Invalid {resource} record after row {position + imported}: {error!r}')
+
+            imported += len(chunk)
+            if self.progress:
+                self.progress(resource, position + imported, imported / (time.monotonic() - started))
+
+        return imported
+
+    def _load_authors(self, records):
+        authors = Author.objects.bulk_create(
+            [Author(name=record['name'], surname=record['surname']) for record in records],
+            batch_size=self.batch_size
+        )
+
+        return {
+            str(record['id']): author.pk
+            for record, author in zip(records, authors)
+            if record.get('id') not in (None, '')
+        }
+
+    def _load_books(self, records):
+        Book.objects.bulk_create(
+            [Book(author_id=author_id, name=record['name'])
+             for record, author_id in zip(records, self._resolve_authors(records))],
+            batch_size=self.batch_size
+        )
+
+    def _resolve_authors(self, records):
+        """
+        Map each record's `author` through the author map, or, for authors
+        that were not part of an import, treat it as an existing Author pk.
+        """
+        author_map = self.checkpoint.author_map
+        author_ids = []
+        unmapped = set()
+        for record in records:
+            reference = str(record['author'])
+            if reference in author_map:
+                author_ids.append(author_map[reference])
+            else:
+                author_ids.append(int(reference))
+                unmapped.add(int(reference))
+
+        for batch in chunked(unmapped, self.batch_size):
+            missing = set(batch) - set(Author.objects.filter(pk__in=batch).values_list('pk', flat=True))
+            if missing:
+                raise ValueError(f'Unknown authors: {sorted(missing)[:10]}')
+
+        return author_ids
@@ -0,0 +1,326 @@
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, OperationalError, close_old_connections, connection, connections
+from django.utils import timezone
+from rest_framework import serializers
+
+from app.export import EXPORT_COLUMNS, EXPORT_FORMATS, iter_export
+from app.models import Author, Book, CatalogCounter, Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobKind:
+    def __init__(self, handler, params_serializer=None, max_attempts=None):
+        self.handler = handler
+        self.params_serializer = params_serializer
+        self.max_attempts = max_attempts
+
+
+# Handlers by `Job.kind`, filled in by `register_job`.
+JOB_KINDS = {}
+
+
+def register_job(kind, params_serializer=None, max_attempts=None):
+    """
+    Register the decorated function as the handler of jobs of `kind`.
+
+    It is called with a `JobRun` and the job's params as keyword arguments,
+    after the API validated them with `params_serializer`, and returns the
+    JSON result of the job.
+    """
+    def decorator(handler):
+        JOB_KINDS[kind] = JobKind(handler, params_serializer, max_attempts)
+        return handler
+
+    return decorator
+
+
+def enqueue(kind, params=None, **kwargs):
+    kwargs.setdefault('max_attempts', JOB_KINDS[kind].max_attempts or settings.JOB_MAX_ATTEMPTS)
+    return Job.objects.create(kind=kind, params=params or {}, **kwargs)
+
+
+class JobFailed(Exception):
+    """
+    Raised by a handler to fail its job without retrying it.
+    """
+
+
+class LeaseLost(Exception):
+    """
+    The job's lease expired and another worker may have claimed it.
+    """
+
+
+class JobRun:
+    """
+    A claimed job as seen by its handler.
+    """
+
+    def __init__(self, job, worker):
+        self.job = job
+        self.worker = worker
+        self.lease_lost = False
+
+    def leased(self):
+        # Matching the attempt as well keeps a worker that lost the lease
+        # from touching the job after someone else claimed it again.
+        return Job.objects.filter(pk=self.job.pk, status=Job.RUNNING, leased_by=self.worker.name,
+                                  attempts=self.job.attempts)
+
+    def progress(self, done, total=None):
+        """
+        Report `done` of `total` units of work; raises `LeaseLost` if the
+        job is no longer leased to this worker, so the handler stops.
+        """
+        fields = {'progress_done': done}
+        if total is not None:
+            fields['progress_total'] = total
+        if self.lease_lost or not self.leased().update(**fields):
+            raise LeaseLost(self.job.pk)
+
+    def renew_lease(self):
+        lease = timedelta(seconds=self.worker.lease_seconds)
+        if not self.leased().update(leased_until=timezone.now() + lease):
+            self.lease_lost = True
+
+
+class Heartbeat(threading.Thread):
+    """
+    Renews the lease of a running job every third of the lease period, so
+    jobs may run for longer than the lease while a crashed worker's jobs are
+    picked up again soon.
+    """
+
+    def __init__(self, run):
+        super().__init__(name=f'{threading.current_thread().name}-heartbeat', daemon=True)
+        self.job_run = run
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.job_run.worker.lease_seconds / 3):
+                self.job_run.renew_lease()
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Worker:
+    """
+    Claims and runs jobs until `stop` is set, or until none is left with
+    `burst`.
+
+    A failing job is retried after `retry_seconds`, doubled on every
+    further attempt, until it has been attempted `max_attempts` times.
+    """
+
+    def __init__(self, name, kinds=None, stop=None, lease_seconds=60, poll_seconds=1.0, retry_seconds=10):
+        self.name = name
+        self.kinds = kinds
+        self.stop = stop or threading.Event()
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+
+    def run(self, burst=False):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    job = Job.objects.claim(self.name, self.lease_seconds, self.kinds)
+                except DatabaseError:
+                    # Keep the thread alive through a database outage.
+                    logger.exception('Could not claim a job')
+                    connection.close()
+                    self.stop.wait(self.poll_seconds)
+                    continue
+                if job is not None:
+                    self.run_job(job)
+                elif burst:
+                    return
+                else:
+                    self.stop.wait(self.poll_seconds)
+        finally:
+            connection.close()
+
+    def run_job(self, job):
+        run = JobRun(job, self)
+        kind = JOB_KINDS.get(job.kind)
+        if kind is None:
+            return self.finish(run, Job.FAILED, error=f'Unknown job kind: {job.kind}')
+        if job.attempts > job.max_attempts:
+            # Claimed again after its lease expired on the last attempt.
+            return self.finish(run, Job.FAILED, error=job.error or 'Lease expired on the last attempt.')
+
+        logger.info('Running job %s (attempt %d of %d)', job, job.attempts, job.max_attempts)
+        heartbeat = Heartbeat(run)
+        heartbeat.start()
+        try:
+            result = kind.handler(run, **job.params)
+        except LeaseLost:
+            logger.warning('Lost the lease of job %s', job)
+        except JobFailed as error:
+            self.finish(run, Job.FAILED, error=str(error))
+        except Exception:
+            logger.exception('Job %s failed', job)
+            self.retry_or_fail(run, traceback.format_exc())
+        else:
+            self.finish(run, Job.SUCCEEDED, result=result)
+        finally:
+            heartbeat.stop()
+
+    def update_job(self, run, attempts=5, **fields):
+        # The outcome of a job would be lost, and the job run again once its
+        # lease expired, so the update is retried while the database is busy.
+        for attempt in range(attempts):
+            try:
+                return run.leased().update(**fields)
+            except OperationalError:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(0.1 * 2 ** attempt)
+
+    def finish(self, run, status, **fields):
+        self.update_job(run, status=status, finished_at=timezone.now(), leased_until=None, **fields)
+
+    def retry_or_fail(self, run, error):
+        job = run.job
+        if job.attempts >= job.max_attempts:
+            return self.finish(run, Job.FAILED, error=error)
+
+        delay = timedelta(seconds=self.retry_seconds * 2 ** (job.attempts - 1))
+        self.update_job(run, status=Job.QUEUED, run_after=timezone.now() + delay, leased_until=None, error=error)
+
+
+def run_worker_threads(threads, burst=False, **options):
+    """
+    Run `threads` workers in this process until SIGTERM/SIGINT, which let
+    the running jobs finish.
+    """
+    stop = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *args: stop.set())
+
+    host = socket.gethostname()
+    workers = [
+        threading.Thread(target=Worker(f'{host}:{os.getpid()}:{i}', stop=stop, **options).run, args=(burst,),
+                         name=f'job-worker-{i}')
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def run_workers(processes=1, threads=1, burst=False, **options):
+    """
+    Run `processes` worker processes of `threads` workers each. Threads
+    share a process's GIL, so CPU-heavy jobs need processes; threads are
+    enough for jobs that mostly wait on the database.
+
+    Jobs invalidate cached responses through the shared default cache, but
+    their writes are not sent to server-sent event clients.
+    """
+    if processes == 1:
+        return run_worker_threads(threads, burst, **options)
+
+    # Forked children must not share the parent's database connections.
+    connections.close_all()
+    children = [
+        multiprocessing.Process(target=run_worker_threads, args=(threads, burst), kwargs=options,
+                                name=f'job-workers-{i}')
+        for i in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def terminate(*args):
+        for child in children:
+            child.terminate()
+
+    signal.signal(signal.SIGTERM, terminate)
+    # On SIGINT the whole process group gets the signal, children included.
+    signal.signal(signal.SIGINT, lambda *args: None)
+    for child in children:
+        child.join()
+
+
+class DeleteAuthorsParamsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1,
+                                max_length=settings.MAX_BULK_SIZE)
+
+
+@register_job('delete_authors', DeleteAuthorsParamsSerializer)
+def delete_authors(run, ids):
+    authors = Author.objects.filter(pk__in=ids)
+    total = authors.count() + Book.objects.filter(author__in=ids).count()
+    run.progress(0, total)
+    deleted = authors.delete_in_batches(settings.DELETE_BATCH_SIZE, progress=lambda done: run.progress(done))
+
+    return {'deleted': deleted}
+
+
+class ExportCatalogParamsSerializer(serializers.Serializer):
+    resource = serializers.ChoiceField(choices=list(EXPORT_COLUMNS))
+    format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default='ndjson')
+
+
+@register_job('export_catalog', ExportCatalogParamsSerializer)
+def export_catalog(run, resource, format='ndjson'):
+    os.makedirs(settings.JOB_OUTPUT_DIR, exist_ok=True)
+    file_name = f'{run.job.pk}-{resource}.{format}'
+    path = os.path.join(settings.JOB_OUTPUT_DIR, file_name)
+    run.progress(0, CatalogCounter.objects.values_dict().get(resource))
+    exported = 0
+
+    def report(rows):
+        nonlocal exported
+        exported = rows
+        run.progress(rows)
+
+    with open(f'{path}.part', 'w', newline='', encoding='utf-8') as output:
+        for text in iter_export(resource, format, settings.EXPORT_CHUNK_SIZE, progress=report):
+            output.write(text)
+    # Only complete exports appear under the final name.
+    os.replace(f'{path}.part', path)
+    run.progress(exported, exported)
+
+    return {'file': file_name, 'size': os.path.getsize(path)}
+
+
+def call_job_command(name):
+    stdout = io.StringIO()
+    try:
+        call_command(name, stdout=stdout)
+    except CommandError as error:
+        raise JobFailed(str(error))
+
+    return {'output': stdout.getvalue().strip()}
+
+
+@register_job('rebuild_search_index')
+def rebuild_search_index(run):
+    return call_job_command('rebuild_search_index')
+
+
+@register_job('repair_book_counts')
+def repair_book_counts(run):
+    return call_job_command('repair_book_counts')
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from app.export import EXPORT_COLUMNS, EXPORT_FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = 'Stream every author or book as NDJSON or CSV with constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=EXPORT_COLUMNS.keys())
+        parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--output', help='File to write to. Defaults to stdout.')
+        parser.add_argument('--chunk-size', type=int, default=settings.EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        lines = iter_export(options['resource'], options['export_format'], options['chunk_size'])
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,38 @@
+from django.core.management import BaseCommand, CommandError
+
+from app.importer import IMPORT_FORMATS, CatalogImporter, CatalogImportError, Checkpoint
+
+
+class Command(BaseCommand):
+    help = 'Bulk load authors and books from NDJSON or CSV files, resuming from a checkpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', help='Authors file with id, name and surname.')
+        parser.add_argument('--books', help='Books file with author and name. `author` refers to an id '
+                                            'from the authors file, or to an existing author pk.')
+        parser.add_argument('--format', dest='import_format', choices=IMPORT_FORMATS,
+                            help='Input format. Detected from the file extension by default.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement.')
+        parser.add_argument('--transaction-size', type=int, default=20000, help='Rows per transaction.')
+        parser.add_argument('--checkpoint', help='Name under which progress is stored in the database, to resume '
+                                                 'an interrupted import by running it again with the same name.')
+
+    def handle(self, *args, **options):
+        if not options['authors'] and not options['books']:
+            raise CommandError('Nothing to import, pass --authors and/or --books.')
+
+        importer = CatalogImporter(batch_size=options['batch_size'],
+                                   transaction_size=options['transaction_size'],
+                                   checkpoint=Checkpoint(options['checkpoint']),
+                                   progress=self.report_progress)
+
+        try:
+            if options['authors']:
+                importer.import_authors(options['authors'], options['import_format'])
+            if options['books']:
+                importer.import_books(options['books'], options['import_format'])
+        except CatalogImportError as error:
+            raise CommandError(str(error))
+
+    def report_progress(self, resource, rows, rows_per_second):
+        self.stdout.write(f'{resource}: {rows} rows committed ({rows_per_second:.0f} rows/s)')
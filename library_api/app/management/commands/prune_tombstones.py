@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from app.models import Tombstone, TombstoneHorizon
+
+
+class Command(BaseCommand):
+    help = 'Delete change feed tombstones older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TOMBSTONE_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        tombstones = Tombstone.objects.filter(deleted_at__lt=cutoff)
+        with transaction.atomic():
+            # Cursors before the last pruned tombstone could miss deletes from now on.
+            last_pruned = tombstones.aggregate(change_seq=Max('change_seq'))['change_seq']
+            if last_pruned is not None:
+                TombstoneHorizon.objects.raise_horizon(last_pruned)
+            deleted, _ = tombstones.delete()
+
+        self.stdout.write(f'Deleted {deleted} tombstones.')
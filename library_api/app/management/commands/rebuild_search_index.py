@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from app.search import get_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the author and book tables.'
+
+    def handle(self, *args, **options):
+        search_index = get_search_index()
+        if not search_index.is_available():
+            raise CommandError('Full-text search is not available on this database backend.')
+
+        with transaction.atomic():
+            search_index.rebuild()
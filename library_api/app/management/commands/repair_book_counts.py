@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from app.cache import LOCAL_CACHE_ERROR, response_cache
+from app.models import Author, Book, CatalogCounter
+from app.signals import touch_cached_responses
+
+
+class Command(BaseCommand):
+    help = 'Recompute Author.book_count and the catalog totals from the tables.'
+
+    def handle(self, *args, **options):
+        if not response_cache.shared:
+            raise CommandError(LOCAL_CACHE_ERROR)
+
+        with transaction.atomic():
+            stale = Author.objects.all().refresh_book_counts()
+            CatalogCounter.objects.update_or_create(name='authors', defaults={'value': Author.objects.count()})
+            CatalogCounter.objects.update_or_create(name='books', defaults={'value': Book.objects.count()})
+        # The UPDATE bypasses the signals that invalidate cached responses.
+        touch_cached_responses(Author, stale)
+
+        self.stdout.write(f'Fixed book_count of {len(stale)} authors.')
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from app.cache import LOCAL_CACHE_ERROR, response_cache
+from app.jobs import JOB_KINDS, run_workers
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the job table until stopped with SIGTERM or SIGINT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.JOB_WORKER_PROCESSES)
+        parser.add_argument('--threads', type=int, default=settings.JOB_WORKER_THREADS,
+                            help='Worker threads per process.')
+        parser.add_argument('--kind', dest='kinds', action='append', choices=sorted(JOB_KINDS),
+                            help='Only run jobs of this kind. May be repeated.')
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is left to run.')
+        parser.add_argument('--poll-seconds', type=float, default=settings.JOB_POLL_SECONDS)
+        parser.add_argument('--lease-seconds', type=int, default=settings.JOB_LEASE_SECONDS)
+        parser.add_argument('--retry-seconds', type=int, default=settings.JOB_RETRY_SECONDS)
+
+    def handle(self, *args, **options):
+        if not response_cache.shared:
+            raise CommandError(LOCAL_CACHE_ERROR)
+
+        run_workers(
+            processes=options['processes'],
+            threads=options['threads'],
+            burst=options['burst'],
+            kinds=options['kinds'],
+            poll_seconds=options['poll_seconds'],
+            lease_seconds=options['lease_seconds'],
+            retry_seconds=options['retry_seconds'],
+        )
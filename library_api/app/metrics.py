@@ -0,0 +1,136 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """
+    Prometheus-style histogram with one series per label tuple.
+
+    Only the bucket an observation falls into is incremented; `render`
+    accumulates the counts into the cumulative `le` buckets.
+    """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = defaultdict(lambda: [[0] * (len(buckets) + 1), 0.0])
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series[labels]
+            series[0][index] += 1
+            series[1] += value
+
+    def get(self, labels):
+        """
+        Return `(count, sum)` of a series.
+        """
+        with self._lock:
+            counts, total = self._series.get(labels, ((), 0.0))
+            return sum(counts), total
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total in sorted(series):
+            label_text = ','.join(f'{name}="{escape_label(value)}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+
+        return '\n'.join(lines)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class QueryRecorder:
+    """
+    `connection.execute_wrapper` that counts and times queries and keeps
+    the SQL of the first `max_statements` for slow request logs.
+    """
+
+    def __init__(self, max_statements=50):
+        self.max_statements = max_statements
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if len(self.statements) < self.max_statements:
+                self.statements.append((elapsed, sql))
+
+
+class RequestMetrics:
+    """
+    Per-process request metrics, exposed in the Prometheus text format.
+
+    Every worker process keeps its own; Prometheus aggregates across
+    scrape targets.
+    """
+
+    def __init__(self, prefix='library_api'):
+        self.request_duration = Histogram(
+            f'{prefix}_request_duration_seconds', 'Time spent handling a request.',
+            ('view', 'method', 'status'), LATENCY_BUCKETS,
+        )
+        self.request_queries = Histogram(
+            f'{prefix}_request_queries', 'SQL queries executed per request.',
+            ('view', 'method'), QUERY_COUNT_BUCKETS,
+        )
+        self.request_query_duration = Histogram(
+            f'{prefix}_request_query_duration_seconds', 'Time spent in SQL queries per request.',
+            ('view', 'method'), LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            f'{prefix}_response_size_bytes', 'Size of non-streaming response bodies.',
+            ('view', 'method'), SIZE_BUCKETS,
+        )
+
+    @property
+    def histograms(self):
+        return self.request_duration, self.request_queries, self.request_query_duration, self.response_size
+
+    def observe(self, view, method, status, duration, queries: QueryRecorder, size=None):
+        self.request_duration.observe((view, method, status), duration)
+        self.request_queries.observe((view, method), queries.count)
+        self.request_query_duration.observe((view, method), queries.duration)
+        if size is not None:
+            self.response_size.observe((view, method), size)
+
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+
+    def render(self):
+        return '\n'.join(histogram.render() for histogram in self.histograms) + '\n'
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,94 @@
+import hashlib
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from app.metrics import QueryRecorder, request_metrics
+from app.routers import use_replicas
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count and time, and response size per view
+    into `request_metrics`, and logs requests slower than
+    `SLOW_REQUEST_SECONDS` with their SQL.
+
+    Streaming responses are measured up to the first byte; their body and
+    the queries made while it is sent are not included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        recorder = QueryRecorder(max_statements=settings.SLOW_REQUEST_MAX_STATEMENTS)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        request_metrics.observe(view, request.method, response.status_code, duration, recorder, size)
+
+        if duration >= settings.SLOW_REQUEST_SECONDS:
+            self.log_slow_request(request, response, duration, recorder)
+
+        return response
+
+    def log_slow_request(self, request, response, duration, recorder):
+        statements = '\n'.join(f'  {elapsed * 1000:.1f}ms {sql}' for elapsed, sql in recorder.statements)
+        logger.warning(
+            'Slow request %s %s: %s in %.3fs, %d queries in %.3fs\n%s',
+            request.method, request.get_full_path(), response.status_code, duration,
+            recorder.count, recorder.duration, statements,
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serves safe-method requests from the read replicas, except for clients
+    that wrote within the last `REPLICA_STICKY_SECONDS`: those read from the
+    primary so they see their own writes despite replication lag.
+
+    Clients are told apart by their Authorization header, session or
+    address. The sticky marks live in the default cache, which must be
+    shared between workers for the window to hold across processes.
+    """
+    pin_key = 'replica-routing:pin:{}'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def get_client_key(self, request):
+        client = (
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get('REMOTE_ADDR', '')
+        )
+        return self.pin_key.format(hashlib.md5(client.encode()).hexdigest())
+
+    def __call__(self, request):
+        if not settings.READ_REPLICAS:
+            return self.get_response(request)
+
+        client_key = self.get_client_key(request)
+        if request.method not in SAFE_METHODS:
+            cache.set(client_key, True, settings.REPLICA_STICKY_SECONDS)
+            return self.get_response(request)
+
+        with use_replicas(not cache.get(client_key)):
+            return self.get_response(request)
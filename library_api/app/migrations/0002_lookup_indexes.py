@@ -0,0 +1,35 @@
+# Generated by Django 3.0.8 on 2026-10-18 04:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='app.Author'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['surname', 'name'], name='author_surname_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['name'], name='author_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author', 'name'], name='book_author_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['name'], name='book_name_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+TOKENIZER = "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+
+
+def create_search_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute(f'CREATE VIRTUAL TABLE app_author_search USING fts5(document, {TOKENIZER})')
+    schema_editor.execute(f'CREATE VIRTUAL TABLE app_book_search USING fts5(document, {TOKENIZER})')
+    schema_editor.execute(
+        "INSERT INTO app_author_search(rowid, document) "
+        "SELECT id, name || ' ' || surname FROM app_author"
+    )
+    schema_editor.execute(
+        "INSERT INTO app_book_search(rowid, document) "
+        "SELECT app_book.id, app_book.name || ' ' || app_author.name || ' ' || app_author.surname "
+        "FROM app_book JOIN app_author ON app_author.id = app_book.author_id"
+    )
+
+
+def drop_search_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute('DROP TABLE app_author_search')
+    schema_editor.execute('DROP TABLE app_book_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
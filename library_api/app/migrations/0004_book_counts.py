@@ -0,0 +1,43 @@
+# Generated by Django 3.0.8 on 2026-10-18 04:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counts(apps, schema_editor):
+    Author = apps.get_model('app', 'Author')
+    Book = apps.get_model('app', 'Book')
+    CatalogCounter = apps.get_model('app', 'CatalogCounter')
+
+    book_counts = Book.objects.filter(author=OuterRef('pk')).order_by().values('author').annotate(count=Count('pk'))
+    Author.objects.update(book_count=Coalesce(Subquery(book_counts.values('count')), 0))
+    CatalogCounter.objects.create(name='authors', value=Author.objects.count())
+    CatalogCounter.objects.create(name='books', value=Book.objects.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='book_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['book_count', 'id'], name='author_book_count_idx'),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
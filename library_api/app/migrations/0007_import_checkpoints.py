@@ -0,0 +1,39 @@
+# Generated by Django 3.0.8 on 2026-10-18 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('resource', models.CharField(max_length=16)),
+                ('position', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ImportedAuthor',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('source_id', models.CharField(max_length=255)),
+                ('author_id', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='importedauthor',
+            constraint=models.UniqueConstraint(fields=('name', 'source_id'), name='imported_author_name_source_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='importcheckpoint',
+            constraint=models.UniqueConstraint(fields=('name', 'resource'), name='import_checkpoint_name_resource_uniq'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.0.8 on 2026-10-18 05:30
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+
+def move_horizon(apps, schema_editor):
+    # The horizon used to be stored as epoch seconds in a catalog counter.
+    CatalogCounter = apps.get_model('app', 'CatalogCounter')
+    TombstoneHorizon = apps.get_model('app', 'TombstoneHorizon')
+
+    counter = CatalogCounter.objects.filter(name='tombstone_horizon').first()
+    if counter is not None:
+        TombstoneHorizon.objects.create(pk=1, pruned_before=datetime.fromtimestamp(counter.value, timezone.utc))
+        counter.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_import_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TombstoneHorizon',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('pruned_before', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(move_horizon, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# On PostgreSQL `startswith` filters are a LIKE, which only uses an index
+# built with pattern operators under a linguistic collation.
+PATTERN_INDEXES = {
+    'author_surname_name_like_idx': 'app_author (surname varchar_pattern_ops, name varchar_pattern_ops)',
+    'author_name_like_idx': 'app_author (name varchar_pattern_ops)',
+    'book_author_name_like_idx': 'app_book (author_id, name varchar_pattern_ops)',
+    'book_name_like_idx': 'app_book (name varchar_pattern_ops)',
+}
+
+
+def create_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, columns in PATTERN_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX {name} ON {columns}')
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name in PATTERN_INDEXES:
+        schema_editor.execute(f'DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_tombstone_horizon'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pattern_indexes, drop_pattern_indexes),
+    ]
@@ -0,0 +1,153 @@
+from django.db import migrations, models
+
+# Tables whose rows are stamped with a change_seq, and the columns whose
+# updates restamp them.
+STAMPED_TABLES = {
+    'app_author': ('name', 'surname', 'book_count', 'updated_at'),
+    'app_book': ('author_id', 'name', 'updated_at'),
+    'app_tombstone': (),
+}
+
+# Key of the advisory lock that serializes catalog writers on PostgreSQL.
+CHANGE_SEQ_LOCK = 4710
+
+
+def backfill_change_seq(schema_editor):
+    # Existing rows are numbered in their old feed order.
+    schema_editor.execute(
+        'CREATE TEMPORARY TABLE app_change_backfill AS '
+        'SELECT resource, id, row_number() OVER (ORDER BY changed_at, rank, id) AS seq FROM ('
+        "SELECT 'app_author' AS resource, 0 AS rank, id, updated_at AS changed_at FROM app_author "
+        "UNION ALL SELECT 'app_book', 1, id, updated_at FROM app_book "
+        "UNION ALL SELECT 'app_tombstone', 2, id, deleted_at FROM app_tombstone"
+        ') AS changes'
+    )
+    schema_editor.execute('CREATE INDEX app_change_backfill_idx ON app_change_backfill (resource, id)')
+    for table in STAMPED_TABLES:
+        schema_editor.execute(
+            f'UPDATE {table} SET change_seq = (SELECT seq FROM app_change_backfill AS backfill '
+            f"WHERE backfill.resource = '{table}' AND backfill.id = {table}.id)"
+        )
+    schema_editor.execute('DROP TABLE app_change_backfill')
+
+
+def last_change_seq(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(f'SELECT max(change_seq) FROM {table}' for table in STAMPED_TABLES))
+        return max(value or 0 for value, in cursor.fetchall())
+
+
+def create_triggers(apps, schema_editor):
+    """
+    Stamp every insert and update of a catalog row or tombstone with the next
+    value of a counter, while holding a lock that is only released at commit:
+    SQLite's write lock, or an advisory lock on PostgreSQL. Change sequence
+    numbers therefore become visible in order, and a change feed cursor never
+    passes a change that has yet to commit.
+
+    SQLite drops the triggers of a table that a later migration rebuilds, so
+    such a migration has to create them again.
+    """
+    backfill_change_seq(schema_editor)
+    last = last_change_seq(schema_editor)
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'CREATE SEQUENCE app_change_seq START WITH {last + 1}')
+        schema_editor.execute(
+            'CREATE FUNCTION app_stamp_change() RETURNS trigger AS $$ BEGIN '
+            f'PERFORM pg_advisory_xact_lock({CHANGE_SEQ_LOCK}); '
+            "NEW.change_seq := nextval('app_change_seq'); "
+            'RETURN NEW; END; $$ LANGUAGE plpgsql'
+        )
+        for table, columns in STAMPED_TABLES.items():
+            events = f'INSERT OR UPDATE OF {", ".join(columns)}' if columns else 'INSERT'
+            schema_editor.execute(
+                f'CREATE TRIGGER {table}_stamp_change BEFORE {events} ON {table} '
+                'FOR EACH ROW EXECUTE PROCEDURE app_stamp_change()'
+            )
+        return
+
+    schema_editor.execute('CREATE TABLE app_change_counter (id integer PRIMARY KEY, value bigint NOT NULL)')
+    schema_editor.execute(f'INSERT INTO app_change_counter (id, value) VALUES (1, {last})')
+    for table, columns in STAMPED_TABLES.items():
+        stamp = (
+            'BEGIN UPDATE app_change_counter SET value = value + 1 WHERE id = 1; '
+            f'UPDATE {table} SET change_seq = (SELECT value FROM app_change_counter WHERE id = 1) '
+            'WHERE id = NEW.id; END'
+        )
+        schema_editor.execute(f'CREATE TRIGGER {table}_stamp_insert AFTER INSERT ON {table} {stamp}')
+        if columns:
+            schema_editor.execute(
+                f'CREATE TRIGGER {table}_stamp_update AFTER UPDATE OF {", ".join(columns)} ON {table} {stamp}'
+            )
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for table in STAMPED_TABLES:
+            schema_editor.execute(f'DROP TRIGGER {table}_stamp_change ON {table}')
+        schema_editor.execute('DROP FUNCTION app_stamp_change()')
+        schema_editor.execute('DROP SEQUENCE app_change_seq')
+        return
+
+    for table, columns in STAMPED_TABLES.items():
+        schema_editor.execute(f'DROP TRIGGER {table}_stamp_insert')
+        if columns:
+            schema_editor.execute(f'DROP TRIGGER {table}_stamp_update')
+    schema_editor.execute('DROP TABLE app_change_counter')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RemoveIndex(
+            model_name='author',
+            name='author_updated_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='book',
+            name='book_updated_at_idx',
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['change_seq'], name='author_change_seq_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['change_seq'], name='book_change_seq_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['change_seq'], name='tombstone_change_seq_idx'),
+        ),
+        # Time-based cursors are no longer accepted, so the old horizon is moot.
+        migrations.RemoveField(
+            model_name='tombstonehorizon',
+            name='pruned_before',
+        ),
+        migrations.AddField(
+            model_name='tombstonehorizon',
+            name='change_seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
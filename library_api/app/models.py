@@ -1,17 +1,402 @@
-from django.db import models
+import json
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction, connections, router
+from django.db.models import F, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from app.utils import chunked
+
+# Sent after bulk_create/bulk_update, which bypass post_save, with the
+# affected `instances` and `created` telling which of the two it was.
+post_bulk_save = Signal()
+# Sent by `delete_in_batches`, which bypasses post_delete, with each batch
+# of deleted `instances`.
+post_bulk_delete = Signal()
+
+
+class CatalogQuerySet(models.QuerySet):
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        objs = list(objs)
+        connection = connections[self.db]
+
+        # Django 3.0 passes an explicit batch_size through uncapped, which
+        # breaks SQLite's limits on query parameters and compound SELECTs.
+        fields = [field for field in self.model._meta.concrete_fields if not isinstance(field, models.AutoField)]
+        max_batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+        batch_size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+
+        assign_pks = (
+            connection.vendor == 'sqlite'
+            and not connection.features.can_return_rows_from_bulk_insert
+            and not ignore_conflicts
+            and all(obj.pk is None for obj in objs)
+        )
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+
+            # SQLite serializes writers and hands out rowids as max(rowid) + 1,
+            # so while the transaction holds the write lock the newest
+            # len(objs) primary keys are exactly the rows just inserted.
+            if assign_pks and objs:
+                pks = self.order_by('-pk').values_list('pk', flat=True)[:len(objs)]
+                for obj, pk in zip(objs, reversed(list(pks))):
+                    obj.pk = pk
+
+            post_bulk_save.send(sender=self.model, instances=objs, created=True, using=self.db)
+
+        return objs
+
+    def update(self, **kwargs):
+        # Set-based updates skip auto_now; stamp them for the change feed.
+        if any(field.name == 'updated_at' for field in self.model._meta.concrete_fields):
+            kwargs.setdefault('updated_at', timezone.now())
+
+        return super().update(**kwargs)
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            super().bulk_update(objs, fields, batch_size=batch_size)
+            post_bulk_save.send(sender=self.model, instances=objs, created=False, using=self.db)
+
+    def lock_for_write(self):
+        """
+        On SQLite, take the write lock at the start of the current transaction.
+
+        A transaction that reads first keeps its snapshot and cannot take the
+        write lock once another writer has committed: it fails with "database
+        is locked" right away instead of waiting out the busy timeout.
+        """
+        connection = connections[self.db]
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(self.model._meta.db_table)} WHERE 0')
+
+    def delete_in_batches(self, batch_size=1000, progress=None):
+        """
+        Delete the rows with one set-based DELETE per batch of at most
+        `batch_size` rows, each in its own transaction unless called inside
+        one, and return the number of deleted rows. `progress` is called
+        with the running total after every batch.
+
+        `delete()` collects every row, and every row cascading from it, in
+        memory and sends `post_delete` one row at a time. Here only a batch
+        is held at once and `post_bulk_delete` is sent per batch instead.
+        Related rows are not collected, so models that other rows cascade
+        from have to delete those first (see `AuthorQuerySet`).
+        """
+        connection = connections[self.db]
+        max_batch_size = connection.features.max_query_params or batch_size
+        batch_size = min(batch_size, max_batch_size)
+
+        # No ordering: any batch will do, and sorting the remaining rows
+        # again for every batch is what would make this quadratic.
+        queryset = self.order_by()
+        deleted = 0
+        while True:
+            with transaction.atomic(using=self.db, savepoint=False):
+                self.lock_for_write()
+                instances = list(queryset[:batch_size])
+                if not instances:
+                    return deleted
+
+                # Plain DELETE ... WHERE id IN (...), without the collector.
+                batch = self.model._base_manager.using(self.db).filter(pk__in=[obj.pk for obj in instances])
+                batch._raw_delete(self.db)
+                post_bulk_delete.send(sender=self.model, instances=instances, using=self.db)
+                deleted += len(instances)
+
+            if progress is not None:
+                progress(deleted)
+
+
+class AuthorQuerySet(CatalogQuerySet):
+    def delete_in_batches(self, batch_size=1000, progress=None):
+        """
+        Delete the authors after deleting their books in batches, so the
+        cascade left to `delete()` is empty however many books they have.
+        """
+        books = Book.objects.using(self.db).filter(author__in=self.values('pk'))
+        deleted = books.delete_in_batches(batch_size, progress)
+        with transaction.atomic(using=self.db, savepoint=False):
+            self.lock_for_write()
+            # Also cascades to books added in the meantime.
+            deleted += self.delete()[0]
+
+        if progress is not None:
+            progress(deleted)
+
+        return deleted
+
+    def refresh_book_counts(self):
+        """
+        Recompute `book_count` from the book table and return the pks of the
+        authors whose count was wrong.
+        """
+        actual = Coalesce(Subquery(
+            Book.objects.filter(author=OuterRef('pk')).order_by().values('author')
+            .annotate(count=Count('pk')).values('count')
+        ), 0)
+        stale = list(self.annotate(actual_book_count=actual).exclude(book_count=F('actual_book_count'))
+                     .values_list('pk', flat=True))
+        # Only touch the stale rows so they alone show up in the change feed.
+        for chunk in chunked(stale, 500):
+            self.model.objects.filter(pk__in=chunk).update(book_count=actual)
+
+        return stale
+
+
+class CatalogCounterManager(models.Manager):
+    def increment(self, name, delta=1):
+        if not self.filter(name=name).update(value=F('value') + delta):
+            self.get_or_create(name=name, defaults={'value': delta})
+
+    def values_dict(self):
+        return dict(self.values_list('name', 'value'))
+
+
+class CatalogCounter(models.Model):
+    """
+    Row counts of the catalog tables, kept up to date by `app.signals`, so
+    totals are read from a single row instead of a `COUNT(*)` scan.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    objects = CatalogCounterManager()
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted author or book, so the change feed can report
+    deletes. Pruned by `manage.py prune_tombstones`.
+    """
+    resource = models.CharField(max_length=16)
+    object_id = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_at_idx'),
+            models.Index(fields=['change_seq'], name='tombstone_change_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.resource}:{self.object_id}'
+
+
+class TombstoneHorizonManager(models.Manager):
+    def get_horizon(self):
+        return self.values_list('change_seq', flat=True).first() or 0
+
+    def raise_horizon(self, change_seq):
+        if not self.filter(pk=1, change_seq__lt=change_seq).update(change_seq=change_seq):
+            self.get_or_create(pk=1, defaults={'change_seq': change_seq})
+
+
+class TombstoneHorizon(models.Model):
+    """
+    Single row holding the newest `change_seq` of the tombstones deleted by
+    `prune_tombstones`; change feed cursors before it may have missed deletes.
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    change_seq = models.BigIntegerField(default=0)
+
+    objects = TombstoneHorizonManager()
+
+    def __str__(self):
+        return f'Tombstones pruned up to change {self.change_seq}'
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Number of records of `resource` committed by the `import_catalog` run
+    resumable under `name`.
+    """
+    name = models.CharField(max_length=255)
+    resource = models.CharField(max_length=16)
+    position = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'resource'], name='import_checkpoint_name_resource_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} {self.resource}: {self.position}'
+
+
+class ImportedAuthor(models.Model):
+    """
+    Author pk of a source id imported under checkpoint `name`, so a resumed
+    books import still resolves authors inserted by an earlier run.
+    """
+    name = models.CharField(max_length=255)
+    source_id = models.CharField(max_length=255)
+    author_id = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'source_id'], name='imported_author_name_source_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} {self.source_id}: {self.author_id}'
 
 
 class Author(models.Model):
     name = models.CharField(max_length=200)
     surname = models.CharField(max_length=200)
+    # Denormalized count of the author's books, maintained by `app.signals`
+    # and repaired by `manage.py repair_book_counts`.
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Position in the change feed, stamped by database triggers in commit
+    # order (see migration 0010).
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    objects = AuthorQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['surname', 'name'], name='author_surname_name_idx'),
+            models.Index(fields=['name'], name='author_name_idx'),
+            models.Index(fields=['book_count', 'id'], name='author_book_count_idx'),
+            models.Index(fields=['change_seq'], name='author_change_seq_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name} {self.surname}'
 
 
 class Book(models.Model):
-    author = models.ForeignKey(Author, on_delete=models.CASCADE)
+    # Lookups by author are served by book_author_name_idx below.
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=200)
+    updated_at = models.DateTimeField(auto_now=True)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    objects = CatalogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['author', 'name'], name='book_author_name_idx'),
+            models.Index(fields=['name'], name='book_name_idx'),
+            models.Index(fields=['change_seq'], name='book_change_seq_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored author so a reassignment can move the count.
+        instance._loaded_author_id = instance.__dict__.get('author_id')
+
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Keep the row and the book_count updates made by post_save handlers
+        # in one transaction.
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Book, instance=self), savepoint=False):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
+
+
+class JSONTextField(models.TextField):
+    """
+    JSON document stored as text; Django 3.0 has no JSONField outside
+    PostgreSQL.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else json.loads(value)
+
+    def to_python(self, value):
+        return json.loads(value) if isinstance(value, str) else value
+
+    def get_prep_value(self, value):
+        return None if value is None else json.dumps(value, cls=DjangoJSONEncoder)
+
+
+class JobQuerySet(models.QuerySet):
+    def claimable(self, now):
+        """
+        Queued jobs that are due, and running jobs whose worker let the lease
+        expire (it crashed or lost its database connection).
+        """
+        return self.filter(
+            models.Q(status=Job.QUEUED, run_after__lte=now) | models.Q(status=Job.RUNNING, leased_until__lt=now)
+        )
+
+    def claim(self, worker, lease_seconds, kinds=None, candidates=10):
+        """
+        Lease the next claimable job to `worker` and return it, or None.
+
+        The lease is taken with a conditional UPDATE, so of several workers
+        racing for the same job exactly one gets it, on any backend and
+        without holding row locks.
+        """
+        now = timezone.now()
+        jobs = self.claimable(now)
+        if kinds:
+            jobs = jobs.filter(kind__in=kinds)
+
+        for pk in jobs.order_by('run_after', 'id').values_list('pk', flat=True)[:candidates]:
+            claimed = self.claimable(now).filter(pk=pk).update(
+                status=Job.RUNNING,
+                leased_by=worker,
+                leased_until=now + timedelta(seconds=lease_seconds),
+                attempts=F('attempts') + 1,
+                started_at=now,
+            )
+            if claimed:
+                return self.get(pk=pk)
+
+        return None
+
+
+class Job(models.Model):
+    """
+    Background job run by `manage.py run_workers`; see `app.jobs`.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (SUCCEEDED, 'Succeeded'), (FAILED, 'Failed')]
+
+    kind = models.CharField(max_length=50)
+    params = JSONTextField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    leased_by = models.CharField(max_length=100, blank=True)
+    leased_until = models.DateTimeField(null=True, blank=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    result = JSONTextField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'id'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
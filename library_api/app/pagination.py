@@ -0,0 +1,142 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from app.utils import MAX_DB_INT
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination with opaque cursors.
+
+    Pages are fetched with `WHERE (key) > (last seen key) ORDER BY key LIMIT n`,
+    so the cost of a page does not depend on how deep into the table it is.
+    The key is the primary key, or `(<ordering field>, id)` when the client
+    picks one of the view's `keyset_orderings` with `?ordering=`, which keeps
+    the order total and stable even when many rows share a value. Both
+    directions use the same `(<field>, id)` index.
+    """
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    page_size_query_param = 'page_size'
+    page_size = settings.PAGE_SIZE
+    max_page_size = settings.MAX_PAGE_SIZE
+    ordering = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, view):
+        ordering = request.query_params.get(self.ordering_query_param, self.ordering)
+        allowed = getattr(view, 'keyset_orderings', (self.ordering,))
+        if ordering not in allowed:
+            raise ValidationError({self.ordering_query_param: [f'Must be one of: {", ".join(allowed)}.']})
+
+        field = ordering.lstrip('-')
+        keys = ('id',) if field == 'id' else (field, 'id')
+
+        return keys, ordering.startswith('-')
+
+    def encode_cursor(self, position, reverse):
+        cursor = urlsafe_b64encode(json.dumps({'p': position, 'r': int(reverse)}).encode()).decode()
+
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()))
+            position, reverse = list(cursor['p']), bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # Every keyset key is an integer column.
+        if len(position) != len(self.keys) or not all(
+            type(value) == int and -MAX_DB_INT - 1 <= value <= MAX_DB_INT for value in position
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            return [item[key] for key in self.keys]
+
+        return [getattr(item, key) for key in self.keys]
+
+    def keyset_filter(self, position, descending):
+        """
+        Rows strictly after `position` in key order, i.e. the expansion of
+        `(k1, k2) > (v1, v2)`.
+        """
+        lookup = 'lt' if descending else 'gt'
+        condition = Q()
+        for index in reversed(range(len(self.keys))):
+            equal = {key: value for key, value in zip(self.keys[:index], position)}
+            condition = Q(**equal, **{f'{self.keys[index]}__{lookup}': position[index]}) | condition
+
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.keys, descending = self.get_ordering(request, view)
+        position, reverse = self.decode_cursor(request)
+
+        # Walking backwards is the same scan in the opposite direction.
+        scan_descending = descending != reverse
+        queryset = queryset.order_by(*(f'-{key}' if scan_descending else key for key in self.keys))
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(position, scan_descending))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
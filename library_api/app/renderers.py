@@ -0,0 +1,76 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from app.utils import chunked
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` that encodes with orjson when it is installed.
+
+    orjson produces the same compact UTF-8 output as the default settings
+    of `JSONRenderer`; anything orjson does not encode natively in the same
+    way (datetimes, decimals, lazy strings, ...) is handed to DRF's
+    `JSONEncoder.default`. Indented output (`Accept: application/json;
+    indent=4`, the browsable API) and non-default `UNICODE_JSON` /
+    `COMPACT_JSON` settings fall back to the stdlib encoder.
+    """
+    orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def can_use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.orjson_options)
+
+        # Same escaping of \u2028 and \u2029 as JSONRenderer.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    def iter_render(self, items, chunk_size=1000):
+        """
+        Render an iterable as one JSON array, `chunk_size` items at a time,
+        so arbitrarily long sequences never exist as a single string.
+        """
+        yield b'['
+        separator = b''
+        for chunk in chunked(items, chunk_size):
+            yield separator + self.render(chunk)[1:-1]
+            separator = b','
+        yield b']'
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Renders an already formatted Prometheus text exposition.
+    """
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets views answer `Accept: text/event-stream`; they return an
+    `EventStreamResponse`, which is not rendered.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset) if isinstance(data, str) else data
@@ -0,0 +1,57 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = threading.local()
+
+
+def replicas_enabled():
+    return getattr(_state, 'use_replicas', False)
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    previous = replicas_enabled()
+    _state.use_replicas = enabled
+    try:
+        yield
+    finally:
+        _state.use_replicas = previous
+
+
+def pin_primary():
+    """
+    Send the remaining reads of the current request to the primary.
+    """
+    _state.use_replicas = False
+
+
+class ReplicaRouter:
+    """
+    Routes reads to a random `READ_REPLICAS` database while inside
+    `use_replicas()` (safe-method requests, see ReplicaRoutingMiddleware)
+    and everything else to the primary. Reads inside a transaction stay on
+    the primary so they see its uncommitted writes.
+
+    Replicas are copies of the primary and are never migrated directly.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not settings.READ_REPLICAS or not replicas_enabled():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(settings.READ_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.READ_REPLICAS
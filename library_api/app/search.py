@@ -0,0 +1,131 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from app.models import Author, Book
+from app.utils import chunked
+
+SEARCH_CHUNK_SIZE = 500
+
+AUTHOR_DOCUMENT_SQL = (
+    "INSERT INTO app_author_search(rowid, document) "
+    "SELECT id, name || ' ' || surname FROM app_author WHERE {where}"
+)
+
+BOOK_DOCUMENT_SQL = (
+    "INSERT INTO app_book_search(rowid, document) "
+    "SELECT app_book.id, app_book.name || ' ' || app_author.name || ' ' || app_author.surname "
+    "FROM app_book JOIN app_author ON app_author.id = app_book.author_id WHERE {where}"
+)
+
+SEARCH_SQL = (
+    "SELECT kind, object_id FROM ("
+    "  SELECT 'authors' AS kind, rowid AS object_id, bm25(app_author_search) AS rank "
+    "  FROM app_author_search WHERE app_author_search MATCH %s "
+    "  UNION ALL "
+    "  SELECT 'books', rowid, bm25(app_book_search) "
+    "  FROM app_book_search WHERE app_book_search MATCH %s"
+    ") WHERE kind IN ({kinds}) ORDER BY rank, kind, object_id LIMIT %s OFFSET %s"
+)
+
+
+def in_clause(column, values):
+    return f'{column} IN ({", ".join(["%s"] * len(values))})'
+
+
+def build_match_query(query):
+    """
+    Turn free text into an FTS5 query where every word is a quoted prefix
+    term, so user input can never be parsed as FTS5 syntax.
+    """
+    words = re.findall(r'\w+', query)
+
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+class SQLiteSearchIndex:
+    """
+    Full-text index over authors and books stored in the FTS5 tables
+    `app_author_search` and `app_book_search` (created by migration 0003).
+
+    Documents use the model pk as rowid. A book's document also contains its
+    author's name, so "tolstoy war" finds War and Peace. The index is written
+    on the same connection as the models, so it commits or rolls back with
+    them.
+    """
+    kinds = ('authors', 'books')
+
+    def is_available(self):
+        return connection.vendor == 'sqlite'
+
+    def _execute(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _delete(self, table, pks):
+        for chunk in chunked(pks, SEARCH_CHUNK_SIZE):
+            self._execute(f'DELETE FROM {table} WHERE {in_clause("rowid", chunk)}', chunk)
+
+    def index_authors(self, pks):
+        for chunk in chunked(pks, SEARCH_CHUNK_SIZE):
+            self._execute(f'DELETE FROM app_author_search WHERE {in_clause("rowid", chunk)}', chunk)
+            self._execute(AUTHOR_DOCUMENT_SQL.format(where=in_clause('id', chunk)), chunk)
+
+    def index_books(self, pks):
+        for chunk in chunked(pks, SEARCH_CHUNK_SIZE):
+            self._execute(f'DELETE FROM app_book_search WHERE {in_clause("rowid", chunk)}', chunk)
+            self._execute(BOOK_DOCUMENT_SQL.format(where=in_clause('app_book.id', chunk)), chunk)
+
+    def index_books_of_authors(self, author_pks):
+        for chunk in chunked(author_pks, SEARCH_CHUNK_SIZE):
+            book_ids = f'SELECT id FROM app_book WHERE {in_clause("author_id", chunk)}'
+            self._execute(f'DELETE FROM app_book_search WHERE rowid IN ({book_ids})', chunk)
+            self._execute(BOOK_DOCUMENT_SQL.format(where=in_clause('app_book.author_id', chunk)), chunk)
+
+    def remove_authors(self, pks):
+        self._delete('app_author_search', pks)
+
+    def remove_books(self, pks):
+        self._delete('app_book_search', pks)
+
+    def rebuild(self):
+        self._execute('DELETE FROM app_author_search')
+        self._execute('DELETE FROM app_book_search')
+        self._execute(AUTHOR_DOCUMENT_SQL.format(where='1'))
+        self._execute(BOOK_DOCUMENT_SQL.format(where='1'))
+
+    def search(self, query, kinds=None, limit=20, offset=0):
+        """
+        Return `(kind, pk)` pairs, best bm25 match first.
+        """
+        match = build_match_query(query)
+        kinds = [kind for kind in (kinds or self.kinds) if kind in self.kinds]
+        if not match or not kinds:
+            return []
+
+        sql = SEARCH_SQL.format(kinds=', '.join(['%s'] * len(kinds)))
+
+        return self._execute(sql, [match, match, *kinds, limit, offset])
+
+
+@lru_cache(maxsize=None)
+def get_search_index():
+    return import_string(settings.SEARCH_INDEX)()
+
+
+def load_search_results(hits):
+    """
+    Resolve `(kind, pk)` hits to model instances, one query per kind,
+    keeping the ranked order.
+    """
+    models = {'authors': Author, 'books': Book}
+    instances = {
+        kind: models[kind]._default_manager.in_bulk([pk for hit_kind, pk in hits if hit_kind == kind])
+        for kind in {kind for kind, _ in hits}
+    }
+
+    return [(kind, instances[kind][pk]) for kind, pk in hits if pk in instances[kind]]
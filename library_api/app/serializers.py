@@ -1,15 +1,200 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import serializers
 
-from app.models import Author, Book
+from app.jobs import JOB_KINDS, enqueue
+from app.models import Author, Book, Job
+from app.utils import MAX_DB_INT
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key related field that resolves integer keys from `prefetched`,
+    when `BulkListSerializer` has loaded it for the whole batch, instead of
+    with one query per value.
+    """
+    prefetched = None
+
+    def to_internal_value(self, data):
+        if self.prefetched is None or type(data) != int:
+            return super().to_internal_value(data)
+
+        try:
+            return self.prefetched[data]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer that persists a whole batch with `bulk_create` /
+    `bulk_update` instead of saving every child one by one.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch_related_objects(data)
+
+        return super().to_internal_value(data)
+
+    def prefetch_related_objects(self, data):
+        # One `in_bulk` per related field resolves the keys of every item.
+        for name, field in self.child.fields.items():
+            if isinstance(field, PrefetchedPrimaryKeyRelatedField) and not field.read_only:
+                pks = {item.get(name) for item in data if isinstance(item, dict)}
+                field.prefetched = field.get_queryset().in_bulk(
+                    [pk for pk in pks if type(pk) == int and 1 <= pk <= MAX_DB_INT]
+                )
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
 
+        return model._default_manager.bulk_create([model(**attrs) for attrs in validated_data])
 
-class AuthorSerializer(serializers.ModelSerializer):
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        for instance, attrs in zip(instances, validated_data):
+            for field, value in attrs.items():
+                setattr(instance, field, value)
+            fields.update(attrs)
+
+        if fields:
+            model._default_manager.bulk_update(instances, fields)
+
+        return instances
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """
+    Model serializer that takes an optional `fields` argument and only
+    includes those of its fields.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class AuthorSerializer(SparseFieldsSerializer):
     class Meta:
         model = Author
-        fields = ('id', 'name', 'surname')
+        fields = ('id', 'name', 'surname', 'book_count')
+        list_serializer_class = BulkListSerializer
+
 
+class BookSerializer(SparseFieldsSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
 
-class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ('id', 'author', 'name')
+        list_serializer_class = BulkListSerializer
+
+
+class AuthorWithBooksSerializer(AuthorSerializer):
+    books = BookSerializer(many=True, read_only=True, source='book_set')
+
+    class Meta(AuthorSerializer.Meta):
+        fields = AuthorSerializer.Meta.fields + ('books',)
+
+
+class BookWithAuthorSerializer(BookSerializer):
+    author = AuthorSerializer(read_only=True)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    params = serializers.JSONField(required=False)
+    progress = serializers.SerializerMethodField()
+    result = serializers.JSONField(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = ('id', 'kind', 'params', 'status', 'attempts', 'max_attempts', 'progress', 'result', 'error',
+                  'created_at', 'started_at', 'finished_at')
+        read_only_fields = ('status', 'attempts', 'result', 'error', 'created_at', 'started_at', 'finished_at')
+        extra_kwargs = {
+            'max_attempts': {'required': False, 'min_value': 1},
+        }
+
+    def get_progress(self, job):
+        return {'done': job.progress_done, 'total': job.progress_total}
+
+    def validate_kind(self, kind):
+        if kind not in JOB_KINDS:
+            raise serializers.ValidationError(f'Unknown job kind, expected one of: {", ".join(sorted(JOB_KINDS))}.')
+
+        return kind
+
+    def validate(self, attrs):
+        kind = JOB_KINDS[attrs['kind']]
+        params = attrs.get('params') or {}
+        if kind.params_serializer is None:
+            params = {}
+        else:
+            serializer = kind.params_serializer(data=params)
+            if not serializer.is_valid():
+                raise serializers.ValidationError({'params': serializer.errors})
+            params = serializer.validated_data
+
+        return {**attrs, 'params': params}
+
+    def create(self, validated_data):
+        return enqueue(**validated_data)
+
+
+class RowEncoder:
+    """
+    Read-only fast path for list responses.
+
+    Builds the output of `serializer_class(instance).data` straight from
+    `QuerySet.values()` rows, skipping model instantiation and the per-field
+    serializer machinery. Fields whose representation is the database value
+    itself are copied as is; any other field still goes through its own
+    `to_representation`. Serializers with fields that cannot be read from a
+    single column (nested serializers, method fields, ...) are not supported
+    and `for_serializer` returns None for them, unless they are left out by
+    `fields`.
+    """
+    passthrough_fields = (serializers.CharField, serializers.IntegerField)
+    unsupported_fields = (serializers.BaseSerializer, serializers.RelatedField, serializers.SerializerMethodField)
+
+    def __init__(self, serializer_class, fields=None):
+        model = serializer_class.Meta.model
+        self.items = []
+        for name, field in serializer_class().fields.items():
+            if fields is not None and name not in fields:
+                continue
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                column = model._meta.get_field(field.source).attname
+                self.items.append((name, column, None))
+            elif isinstance(field, self.unsupported_fields) or field.source == '*' or '.' in field.source:
+                raise ValueError(f'{serializer_class.__name__}.{name} cannot be encoded from a single column.')
+            else:
+                column = model._meta.get_field(field.source).attname
+                to_representation = None if type(field) in self.passthrough_fields else field.to_representation
+                self.items.append((name, column, to_representation))
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_serializer(cls, serializer_class, fields=None):
+        try:
+            return cls(serializer_class, fields)
+        except (ValueError, FieldDoesNotExist):
+            return None
+
+    @property
+    def columns(self):
+        return [column for _, column, _ in self.items]
+
+    def encode(self, row):
+        return {
+            name: row[column] if to_representation is None or row[column] is None else to_representation(row[column])
+            for name, column, to_representation in self.items
+        }
+
+    def encode_many(self, rows):
+        return [self.encode(row) for row in rows]
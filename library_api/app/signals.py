@@ -0,0 +1,278 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from app.authentication import invalidate_token, invalidate_user_tokens
+from app.cache import response_cache
+from app.events import event_hub
+from app.models import Author, Book, CatalogCounter, Tombstone, post_bulk_delete, post_bulk_save
+from app.search import get_search_index
+from app.serializers import AuthorSerializer, BookSerializer, RowEncoder
+from app.utils import chunked
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver([post_save, post_delete], sender=Token)
+def evict_cached_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def evict_cached_user_tokens(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=Author)
+def index_saved_author(sender, instance, created, **kwargs):
+    search_index = get_search_index()
+    if not search_index.is_available():
+        return
+
+    search_index.index_authors([instance.pk])
+    if not created:
+        search_index.index_books_of_authors([instance.pk])
+
+
+@receiver(post_save, sender=Book)
+def index_saved_book(sender, instance, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        search_index.index_books([instance.pk])
+
+
+@receiver(post_bulk_save, sender=Author)
+def index_bulk_saved_authors(sender, instances, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        pks = [instance.pk for instance in instances if instance.pk is not None]
+        search_index.index_authors(pks)
+        search_index.index_books_of_authors(pks)
+
+
+@receiver(post_bulk_save, sender=Book)
+def index_bulk_saved_books(sender, instances, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        search_index.index_books([instance.pk for instance in instances if instance.pk is not None])
+
+
+@receiver(post_delete, sender=Author)
+def unindex_deleted_author(sender, instance, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        search_index.remove_authors([instance.pk])
+
+
+@receiver(post_delete, sender=Book)
+def unindex_deleted_book(sender, instance, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        search_index.remove_books([instance.pk])
+
+
+@receiver(post_bulk_delete, sender=Author)
+def unindex_bulk_deleted_authors(sender, instances, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        search_index.remove_authors([instance.pk for instance in instances])
+
+
+@receiver(post_bulk_delete, sender=Book)
+def unindex_bulk_deleted_books(sender, instances, **kwargs):
+    search_index = get_search_index()
+    if search_index.is_available():
+        search_index.remove_books([instance.pk for instance in instances])
+
+
+CACHE_RESOURCES = {
+    Author: 'authors',
+    Book: 'books',
+}
+
+
+def touch_cached_responses(model, pks):
+    resource = CACHE_RESOURCES[model]
+    dependencies = [resource, *(f'{resource}:{pk}' for pk in pks)]
+
+    # Touch again on commit so a response cached by a concurrent reader
+    # before the transaction became visible is invalidated as well.
+    response_cache.touch(*dependencies)
+    transaction.on_commit(lambda: response_cache.touch(*dependencies))
+
+
+@receiver([post_save, post_delete], sender=Author)
+@receiver([post_save, post_delete], sender=Book)
+def invalidate_cached_response(sender, instance, **kwargs):
+    touch_cached_responses(sender, [instance.pk])
+
+
+@receiver(post_bulk_save, sender=Author)
+@receiver(post_bulk_save, sender=Book)
+@receiver(post_bulk_delete, sender=Author)
+@receiver(post_bulk_delete, sender=Book)
+def invalidate_bulk_cached_responses(sender, instances, **kwargs):
+    touch_cached_responses(sender, [instance.pk for instance in instances])
+
+
+def change_book_counts(author_deltas):
+    for author_id, delta in author_deltas.items():
+        authors = Author.objects.filter(pk=author_id)
+        if delta < 0:
+            authors = authors.filter(book_count__gte=-delta)
+        authors.update(book_count=F('book_count') + delta)
+
+    # Author payloads include book_count.
+    touch_cached_responses(Author, author_deltas.keys())
+
+
+@receiver(post_save, sender=Author)
+def count_saved_author(sender, instance, created, **kwargs):
+    if created:
+        CatalogCounter.objects.increment('authors')
+
+
+@receiver(post_delete, sender=Author)
+def count_deleted_author(sender, instance, **kwargs):
+    CatalogCounter.objects.increment('authors', -1)
+
+
+@receiver(post_save, sender=Book)
+def count_saved_book(sender, instance, created, **kwargs):
+    loaded_author_id = getattr(instance, '_loaded_author_id', None)
+    if created:
+        CatalogCounter.objects.increment('books')
+        change_book_counts({instance.author_id: 1})
+    elif loaded_author_id is not None and loaded_author_id != instance.author_id:
+        change_book_counts({loaded_author_id: -1, instance.author_id: 1})
+
+    instance._loaded_author_id = instance.author_id
+
+
+@receiver(post_delete, sender=Book)
+def count_deleted_book(sender, instance, **kwargs):
+    CatalogCounter.objects.increment('books', -1)
+    change_book_counts({instance.author_id: -1})
+
+
+@receiver(post_bulk_delete, sender=Author)
+def count_bulk_deleted_authors(sender, instances, **kwargs):
+    CatalogCounter.objects.increment('authors', -len(instances))
+
+
+@receiver(post_bulk_delete, sender=Book)
+def count_bulk_deleted_books(sender, instances, **kwargs):
+    CatalogCounter.objects.increment('books', -len(instances))
+    deleted = Counter(instance.author_id for instance in instances)
+    change_book_counts({author_id: -count for author_id, count in deleted.items()})
+
+
+@receiver(post_bulk_save, sender=Author)
+def count_bulk_saved_authors(sender, instances, created, **kwargs):
+    if created:
+        CatalogCounter.objects.increment('authors', len(instances))
+
+
+@receiver(post_bulk_save, sender=Book)
+def count_bulk_saved_books(sender, instances, created, **kwargs):
+    author_ids = {instance.author_id for instance in instances}
+    if created:
+        CatalogCounter.objects.increment('books', len(instances))
+    else:
+        author_ids.update(getattr(instance, '_loaded_author_id', None) for instance in instances)
+        author_ids.discard(None)
+
+    for chunk in chunked(author_ids, 500):
+        Author.objects.filter(pk__in=chunk).refresh_book_counts()
+    touch_cached_responses(Author, author_ids)
+
+    for instance in instances:
+        instance._loaded_author_id = instance.author_id
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(resource=CACHE_RESOURCES[sender], object_id=instance.pk)
+
+
+@receiver(post_bulk_delete, sender=Author)
+@receiver(post_bulk_delete, sender=Book)
+def record_bulk_tombstones(sender, instances, using, **kwargs):
+    # A plain executemany: building a Tombstone instance per deleted row
+    # costs more than the delete itself. change_seq is stamped by a trigger.
+    connection = connections[using]
+    table = connection.ops.quote_name(Tombstone._meta.db_table)
+    deleted_at = Tombstone._meta.get_field('deleted_at').get_db_prep_value(timezone.now(), connection)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {table} (resource, object_id, deleted_at, change_seq) VALUES (%s, %s, %s, 0)',
+            [(CACHE_RESOURCES[sender], instance.pk, deleted_at) for instance in instances],
+        )
+
+
+EVENT_SERIALIZERS = {
+    Author: AuthorSerializer,
+    Book: BookSerializer,
+}
+
+
+def publish_events(model, name, instances):
+    resource = CACHE_RESOURCES[model]
+    if name == 'delete':
+        events = [{'resource': resource, 'id': instance.pk} for instance in instances]
+    else:
+        # Encoders read attnames, which are the keys of an instance __dict__.
+        serializer_class = EVENT_SERIALIZERS[model]
+        encoder = RowEncoder.for_serializer(serializer_class)
+        events = [
+            {
+                'resource': resource,
+                'id': instance.pk,
+                'object': encoder.encode(instance.__dict__) if encoder else serializer_class(instance).data,
+            }
+            for instance in instances
+        ]
+
+    # Only committed changes are announced.
+    transaction.on_commit(lambda: [event_hub.publish(name, data) for data in events])
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Book)
+def publish_saved(sender, instance, created, **kwargs):
+    publish_events(sender, 'create' if created else 'update', [instance])
+
+
+@receiver(post_bulk_save, sender=Author)
+@receiver(post_bulk_save, sender=Book)
+def publish_bulk_saved(sender, instances, created, **kwargs):
+    publish_events(sender, 'create' if created else 'update', [instance for instance in instances if instance.pk])
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+def publish_deleted(sender, instance, **kwargs):
+    publish_events(sender, 'delete', [instance])
+
+
+@receiver(post_bulk_delete, sender=Author)
+@receiver(post_bulk_delete, sender=Book)
+def publish_bulk_deleted(sender, instances, **kwargs):
+    publish_events(sender, 'delete', instances)
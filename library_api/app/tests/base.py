@@ -2,7 +2,10 @@ from abc import abstractmethod
 from typing import Type
 
 import pytest
-from django.db import models
+from django.core.cache import caches
+from django.db import connection, models
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from factory.django import DjangoModelFactory
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnList
@@ -15,9 +18,14 @@ class AbstractModelTest:
     def get_test_unsaved_instance(self):
         return self.factory.build()
 
+    def is_compared_field(self, field_name):
+        # auto_now timestamps are set by save() itself.
+        auto_now = {field.attname for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)}
+        return field_name != 'id' and not field_name.startswith('_') and field_name not in auto_now
+
     def assert_equal_instances_excluding_id(self, first, second):
         for field_name, value in first.__dict__.items():
-            if field_name == 'id' or field_name.startswith('_'):
+            if not self.is_compared_field(field_name):
                 continue
 
             assert second.__getattribute__(field_name) == value
@@ -40,7 +48,7 @@ class AbstractModelTest:
 
         # Set new params
         for field_name, value in new_unsaved_instance.__dict__.items():
-            if field_name == 'id' or field_name.startswith('_'):
+            if not self.is_compared_field(field_name):
                 continue
             existing_instance.__setattr__(field_name, value)
 
@@ -170,3 +178,45 @@ class AbstractModelSerializerTest:
         instance = serializer.save()
         for key, value in new_data.items():
             assert instance.serializable_value(key) == value
+
+
+class AbstractQueryCountTest:
+    """
+    N+1 guard for a GET endpoint: the request must issue the same number of
+    queries, at most `max_queries`, whether it returns 1 row or `many`.
+    """
+    max_queries: int
+    many = 500
+
+    @abstractmethod
+    def create_rows(self, count: int):
+        pass
+
+    @abstractmethod
+    def get_url(self) -> str:
+        pass
+
+    def get_rows(self, body) -> list:
+        return body['results']
+
+    def count_queries(self, client: Client, expected_rows: int):
+        caches['default'].clear()
+        url = self.get_url()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert len(self.get_rows(response.json())) == expected_rows
+
+        return len(context)
+
+    @pytest.mark.django_db
+    def test_should_not_query_per_row(self, client: Client):
+        self.create_rows(1)
+        single = self.count_queries(client, 1)
+
+        self.create_rows(self.many - 1)
+        many = self.count_queries(client, self.many)
+
+        assert single == many
+        assert many <= self.max_queries
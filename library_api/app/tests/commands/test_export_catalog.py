@@ -0,0 +1,29 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from app.tests.factories import BookFactory
+
+
+class TestExportCatalogCommand:
+    @pytest.mark.django_db
+    def test_should_write_ndjson_to_stdout(self):
+        books = BookFactory.create_batch(3)
+        stdout = io.StringIO()
+
+        call_command('export_catalog', 'books', '--chunk-size', '2', stdout=stdout)
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [row['id'] for row in rows] == [book.id for book in books]
+        assert rows[0] == {'id': books[0].id, 'author': books[0].author_id, 'name': books[0].name}
+
+    @pytest.mark.django_db
+    def test_should_write_csv_to_file(self, tmp_path):
+        book = BookFactory()
+        output = tmp_path / 'books.csv'
+
+        call_command('export_catalog', 'books', '--format', 'csv', '--output', str(output))
+
+        assert output.read_text().splitlines() == ['id,author,name', f'{book.id},{book.author_id},{book.name}']
@@ -0,0 +1,115 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command, CommandError
+
+from app.importer import CatalogImporter, CatalogImportError, Checkpoint
+from app.models import Author, Book, ImportCheckpoint
+from app.tests.factories import AuthorFactory
+
+
+def write_ndjson(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return str(path)
+
+
+class TestImportCatalogCommand:
+    @pytest.mark.django_db
+    def test_should_import_books_with_authors_from_file(self, tmp_path):
+        AuthorFactory()
+        authors = write_ndjson(tmp_path / 'authors.ndjson', [
+            {'id': 10, 'name': 'Leo', 'surname': 'Tolstoy'},
+            {'id': 20, 'name': 'Anton', 'surname': 'Chekhov'},
+        ])
+        books = write_ndjson(tmp_path / 'books.ndjson', [
+            {'author': 10, 'name': 'War and Peace'},
+            {'author': 20, 'name': 'The Seagull'},
+            {'author': 10, 'name': 'Anna Karenina'},
+        ])
+
+        call_command('import_catalog', '--authors', authors, '--books', books, '--batch-size', '2',
+                     stdout=io.StringIO())
+
+        assert sorted(Book.objects.filter(author__surname='Tolstoy').values_list('name', flat=True)) == \
+            ['Anna Karenina', 'War and Peace']
+        assert Book.objects.get(name='The Seagull').author.surname == 'Chekhov'
+
+    @pytest.mark.django_db
+    def test_should_import_csv_referencing_existing_authors(self, tmp_path):
+        author = AuthorFactory()
+        books = tmp_path / 'books.csv'
+        books.write_text(f'author,name\n{author.pk},First\n{author.pk},Second\n')
+
+        call_command('import_catalog', '--books', str(books), stdout=io.StringIO())
+
+        assert list(author.book_set.order_by('pk').values_list('name', flat=True)) == ['First', 'Second']
+
+    @pytest.mark.django_db
+    def test_should_report_throughput(self, tmp_path):
+        authors = write_ndjson(tmp_path / 'authors.ndjson', [{'name': 'a', 'surname': 'b'}] * 5)
+        stdout = io.StringIO()
+
+        call_command('import_catalog', '--authors', authors, '--transaction-size', '2', stdout=stdout)
+
+        lines = stdout.getvalue().splitlines()
+        assert len(lines) == 3
+        assert lines[-1].startswith('authors: 5 rows committed (')
+
+    @pytest.mark.django_db
+    def test_should_fail_on_unknown_author(self, tmp_path):
+        books = write_ndjson(tmp_path / 'books.ndjson', [{'author': 12345678, 'name': 'Orphan'}])
+
+        with pytest.raises(CommandError):
+            call_command('import_catalog', '--books', books, stdout=io.StringIO())
+
+        assert not Book.objects.exists()
+
+
+class TestCatalogImporterCheckpoint:
+    @pytest.mark.django_db
+    def test_should_resume_after_failed_chunk(self, tmp_path):
+        checkpoint_path = str(tmp_path / 'import.checkpoint')
+        write_ndjson(tmp_path / 'authors.ndjson', [{'id': 1, 'name': 'a', 'surname': 'b'}])
+        books_path = tmp_path / 'books.ndjson'
+        write_ndjson(books_path, [{'author': 1, 'name': 'one'}, {'author': 1, 'name': 'two'}, {'name': 'broken'}])
+
+        importer = CatalogImporter(transaction_size=2, checkpoint=Checkpoint(checkpoint_path))
+        importer.import_authors(str(tmp_path / 'authors.ndjson'))
+        with pytest.raises(CatalogImportError):
+            importer.import_books(str(books_path))
+
+        write_ndjson(books_path, [{'author': 1, 'name': 'one'}, {'author': 1, 'name': 'two'},
+                                  {'author': 1, 'name': 'three'}])
+        resumed = CatalogImporter(transaction_size=2, checkpoint=Checkpoint(checkpoint_path))
+        resumed.import_authors(str(tmp_path / 'authors.ndjson'))
+        resumed.import_books(str(books_path))
+
+        assert Author.objects.count() == 1
+        assert list(Book.objects.order_by('pk').values_list('name', flat=True)) == ['one', 'two', 'three']
+
+    @pytest.mark.django_db
+    def test_should_roll_back_chunk_with_its_checkpoint(self, tmp_path, monkeypatch):
+        authors_path = write_ndjson(tmp_path / 'authors.ndjson', [{'id': 1, 'name': 'a', 'surname': 'b'}])
+        books_path = write_ndjson(tmp_path / 'books.ndjson', [{'author': 1, 'name': str(i)} for i in range(4)])
+        commit = Checkpoint.commit
+
+        def crash_after_first_books_chunk(checkpoint, resource, count, author_map=None):
+            commit(checkpoint, resource, count, author_map)
+            if resource == 'books' and checkpoint.positions['books'] > 2:
+                raise RuntimeError('crashed before commit')
+
+        monkeypatch.setattr(Checkpoint, 'commit', crash_after_first_books_chunk)
+        importer = CatalogImporter(transaction_size=2, checkpoint=Checkpoint('catalog'))
+        importer.import_authors(authors_path)
+        with pytest.raises(RuntimeError):
+            importer.import_books(books_path)
+        monkeypatch.setattr(Checkpoint, 'commit', commit)
+
+        resumed = CatalogImporter(transaction_size=2, checkpoint=Checkpoint('catalog'))
+        resumed.import_authors(authors_path)
+        resumed.import_books(books_path)
+
+        assert Author.objects.count() == 1
+        assert list(Book.objects.order_by('pk').values_list('name', flat=True)) == ['0', '1', '2', '3']
+        assert ImportCheckpoint.objects.get(name='catalog', resource='books').position == 4
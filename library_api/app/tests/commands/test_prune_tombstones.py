@@ -0,0 +1,41 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from app.models import CatalogCounter, Tombstone, TombstoneHorizon
+
+
+class TestPruneTombstonesCommand:
+    @pytest.mark.django_db
+    def test_should_delete_tombstones_older_than_retention(self):
+        old = Tombstone.objects.create(resource='books', object_id=1, deleted_at=timezone.now() - timedelta(days=31))
+        recent = Tombstone.objects.create(resource='books', object_id=2)
+        stdout = io.StringIO()
+
+        call_command('prune_tombstones', '--days', '30', stdout=stdout)
+
+        assert list(Tombstone.objects.values_list('pk', flat=True)) == [recent.pk]
+        assert not Tombstone.objects.filter(pk=old.pk).exists()
+        assert stdout.getvalue().strip() == 'Deleted 1 tombstones.'
+
+    @pytest.mark.django_db
+    def test_should_record_horizon_outside_catalog_counters(self):
+        old = Tombstone.objects.create(resource='books', object_id=1, deleted_at=timezone.now() - timedelta(days=31))
+        old.refresh_from_db()
+
+        call_command('prune_tombstones', '--days', '30', stdout=io.StringIO())
+
+        assert TombstoneHorizon.objects.get_horizon() == old.change_seq > 0
+        assert 'tombstone_horizon' not in CatalogCounter.objects.values_dict()
+
+    @pytest.mark.django_db
+    def test_should_not_lower_horizon(self):
+        TombstoneHorizon.objects.raise_horizon(10 ** 12)
+        Tombstone.objects.create(resource='books', object_id=1, deleted_at=timezone.now() - timedelta(days=31))
+
+        call_command('prune_tombstones', '--days', '30', stdout=io.StringIO())
+
+        assert TombstoneHorizon.objects.get_horizon() == 10 ** 12
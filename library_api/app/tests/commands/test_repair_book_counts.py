@@ -0,0 +1,45 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from app.models import Author, CatalogCounter
+from app.tests.factories import AuthorFactory, BookFactory
+
+pytestmark = pytest.mark.usefixtures('shared_cache')
+
+
+class TestRepairBookCountsCommand:
+    @pytest.mark.django_db
+    def test_should_recompute_counts_and_totals(self):
+        author = AuthorFactory()
+        BookFactory.create_batch(3, author=author)
+        AuthorFactory()
+        stdout = io.StringIO()
+
+        call_command('repair_book_counts', stdout=stdout)
+
+        assert Author.objects.get(pk=author.pk).book_count == 3
+        assert CatalogCounter.objects.values_dict() == {'authors': 2, 'books': 3}
+        assert stdout.getvalue().strip() == 'Fixed book_count of 1 authors.'
+
+    @pytest.mark.django_db
+    def test_should_invalidate_cached_author_responses(self, client):
+        author = AuthorFactory()
+        BookFactory.bulk_create(2, author=author)
+        url = reverse('app:author_retrieve_update_delete', args=[author.pk])
+        etag = client.get(url)['ETag']
+
+        call_command('repair_book_counts', stdout=io.StringIO())
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.json()['book_count'] == 2
+
+    @pytest.mark.django_db
+    def test_should_refuse_to_run_with_process_local_cache(self, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+        with pytest.raises(CommandError, match='local to this process'):
+            call_command('repair_book_counts', stdout=io.StringIO())
@@ -0,0 +1,40 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from app.jobs import JOB_KINDS, JobKind, enqueue
+from app.models import Job
+
+pytestmark = pytest.mark.usefixtures('shared_cache')
+
+
+class TestRunWorkersCommand:
+    @pytest.mark.django_db(transaction=True)
+    def test_should_run_queued_jobs_until_none_is_left(self, monkeypatch):
+        monkeypatch.setitem(JOB_KINDS, 'test', JobKind(lambda run, n: {'n': n}))
+        jobs = [enqueue('test', {'n': n}) for n in range(6)]
+
+        call_command('run_workers', '--burst', '--threads', '2')
+
+        assert list(Job.objects.order_by('pk').values_list('status', 'result')) == [
+            (Job.SUCCEEDED, {'n': job.params['n']}) for job in jobs
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_only_run_given_kinds(self):
+        repair = enqueue('repair_book_counts')
+        export = enqueue('export_catalog', {'resource': 'authors'})
+
+        call_command('run_workers', '--burst', '--threads', '1', '--kind', 'repair_book_counts')
+
+        assert Job.objects.get(pk=repair.pk).status == Job.SUCCEEDED
+        assert Job.objects.get(pk=export.pk).status == Job.QUEUED
+
+    @pytest.mark.django_db
+    def test_should_refuse_to_run_with_process_local_cache(self, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        job = enqueue('repair_book_counts')
+
+        with pytest.raises(CommandError, match='local to this process'):
+            call_command('run_workers', '--burst')
+
+        assert Job.objects.get(pk=job.pk).status == Job.QUEUED
@@ -2,15 +2,58 @@ import datetime
 import factory
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
+from factory.declarations import BaseDeclaration, Sequence
 
-from app.models import Author, Book
+from app.models import Author, Book, post_bulk_save
 
 
 class LibraryAPIModelFactory(factory.django.DjangoModelFactory):
+    # Factories that mute post_save anyway can insert with one bulk_create.
+    _bulk_create_many = False
+
     @classmethod
     def create_many(cls, count=4, **kwargs):
+        if cls._bulk_create_many:
+            return cls.bulk_create(count, **kwargs)
+
         return [cls(**kwargs) for _ in range(count)]
 
+    @classmethod
+    def build_many(cls, count, **kwargs):
+        """
+        Build `count` unsaved instances, resolving the declarations once for
+        the whole batch. Plain values and `Sequence`s are supported; factories
+        with any other declaration fall back to `build_batch`.
+        """
+        declarations = {**cls._meta.declarations, **kwargs}
+        sequences = {name: value for name, value in declarations.items() if isinstance(value, Sequence)}
+        if cls._meta.parameters or any(
+            isinstance(value, BaseDeclaration) and name not in sequences for name, value in declarations.items()
+        ):
+            return cls.build_batch(count, **kwargs)
+
+        model = cls._meta.get_model_class()
+        instances = []
+        for _ in range(count):
+            attributes = dict(declarations)
+            if sequences:
+                sequence = cls._meta.next_sequence()
+                attributes.update((name, value.function(sequence)) for name, value in sequences.items())
+            instances.append(model(**attributes))
+
+        return instances
+
+    @classmethod
+    def bulk_create(cls, count, batch_size=None, **kwargs):
+        """
+        Insert `count` instances with `bulk_create`. No post_save is sent and
+        post_bulk_save is muted, so derived data (book counts, the search
+        index) is not maintained for them.
+        """
+        manager = cls._meta.get_model_class()._default_manager
+        with factory.django.mute_signals(post_bulk_save):
+            return manager.bulk_create(cls.build_many(count, **kwargs), batch_size=batch_size)
+
 
 class UserFactory(LibraryAPIModelFactory):
     class Meta:
@@ -29,6 +72,8 @@ class UserFactory(LibraryAPIModelFactory):
 
 @factory.django.mute_signals(post_save)
 class AuthorFactory(LibraryAPIModelFactory):
+    _bulk_create_many = True
+
     class Meta:
         model = Author
 
@@ -37,9 +82,29 @@ class AuthorFactory(LibraryAPIModelFactory):
 
 
 @factory.django.mute_signals(post_save)
-class BookFactory(factory.django.DjangoModelFactory):
+class BookFactory(LibraryAPIModelFactory):
+    _bulk_create_many = True
+
     class Meta:
         model = Book
 
     author = factory.SubFactory(AuthorFactory)
     name = 'Test Book Name'
+
+    @classmethod
+    def build_many(cls, count, authors=None, books_per_author=10, **kwargs):
+        """
+        Unless `author` is given, books are spread round-robin over `authors`,
+        or over a pool of one new author per `books_per_author` books, instead
+        of one new author per book.
+        """
+        if 'author' in kwargs:
+            return super().build_many(count, **kwargs)
+
+        if authors is None:
+            authors = AuthorFactory.bulk_create(max(count // books_per_author, 1))
+        books = super().build_many(count, author=None, **kwargs)
+        for i, book in enumerate(books):
+            book.author = authors[i % len(authors)]
+
+        return books
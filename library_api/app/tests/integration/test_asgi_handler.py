@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from django.urls import reverse
+
+from app.handlers import CatalogASGIHandler
+from app.serializers import AuthorSerializer
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+async def asgi_request(application, method, path, query_string=b'', headers=()):
+    messages = []
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver'), *headers],
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+
+    return messages[0]['status'], body
+
+
+class TestCatalogASGIHandler:
+    @pytest.mark.django_db(transaction=True)
+    def test_should_serve_list_view(self):
+        books = BookFactory.create_batch(3)
+
+        status, body = asyncio.run(asgi_request(CatalogASGIHandler(), 'GET', reverse('app:book_list_create')))
+
+        assert status == 200
+        assert [item['id'] for item in json.loads(body)['results']] == [book.id for book in books]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_run_reads_and_writes_on_separate_pools(self, monkeypatch):
+        handler = CatalogASGIHandler(read_threads=4)
+        threads = []
+        get_response_in_thread = handler.get_response_in_thread
+
+        def record_thread(request):
+            threads.append((request.method, threading.current_thread().name))
+            return get_response_in_thread(request)
+
+        monkeypatch.setattr(handler, 'get_response_in_thread', record_thread)
+
+        async def run():
+            await asyncio.gather(
+                *(asgi_request(handler, 'GET', reverse('app:author_list_create')) for _ in range(8)),
+                asgi_request(handler, 'DELETE', reverse('app:author_retrieve_update_delete', args=[1])),
+            )
+
+        asyncio.run(run())
+
+        assert all(name.startswith('catalog-read') for method, name in threads if method == 'GET')
+        assert all(name.startswith('catalog-write') for method, name in threads if method == 'DELETE')
+        assert len(threads) == 9
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_stream_export_on_read_pool(self, staff_user_token, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        authors = AuthorFactory.create_many(5)
+        headers = [(b'authorization', f'Token {staff_user_token}'.encode())]
+
+        status, body = asyncio.run(asgi_request(CatalogASGIHandler(), 'GET', reverse('app:export', args=[
+            'authors', 'ndjson',
+        ]), headers=headers))
+
+        assert status == 200
+        assert [json.loads(line) for line in body.splitlines()] == [AuthorSerializer(author).data for author in authors]
@@ -3,9 +3,9 @@ from django.test import Client
 from django.urls import reverse
 from rest_framework import status
 
-from app.models import Author
+from app.models import Author, Book
 from app.serializers import AuthorSerializer
-from app.tests.factories import AuthorFactory
+from app.tests.factories import AuthorFactory, BookFactory
 
 
 class AuthorTestHelperMixin:
@@ -31,8 +31,9 @@ class TestAuthorListAPI(AuthorTestHelperMixin):
         authors = AuthorFactory.create_many()
 
         response = client.get(self.url)
-        body = response.json()
+        body = response.json()['results']
 
+        assert len(body) == len(authors)
         for i in range(len(body)):
             self.assert_equal_author_jsons(body[i],
                                            self.get_serialized_author(authors[i]))
@@ -233,3 +234,18 @@ class TestAuthorDeleteAPI(AuthorTestHelperMixin):
         response = client.delete(url, HTTP_AUTHORIZATION=f'Token {staff_user_token}')
 
         assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    @pytest.mark.django_db
+    def test_should_delete_books_of_author(self, staff_user_token: str, client: Client, settings):
+        settings.DELETE_BATCH_SIZE = 2
+        author = AuthorFactory()
+        books = BookFactory.create_batch(5, author=author)
+        book_url = reverse('app:book_retrieve_update_delete', args=[books[0].pk])
+        assert client.get(book_url).status_code == status.HTTP_200_OK
+
+        response = client.delete(reverse(self.url_name, args=[author.pk]),
+                                 HTTP_AUTHORIZATION=f'Token {staff_user_token}')
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not Book.objects.filter(author_id=author.pk).exists()
+        assert client.get(book_url).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,204 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from app.models import Author, Book, post_bulk_delete
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+class BulkTestHelperMixin:
+    def send(self, client: Client, method: str, url: str, data, token=None):
+        headers = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+        return getattr(client, method)(url, data, content_type='application/json', **headers)
+
+
+class TestAuthorBulkAPI(BulkTestHelperMixin):
+    url = reverse('app:author_bulk')
+
+    @pytest.mark.django_db
+    def test_should_return_unauthorized_without_credentials(self, client: Client):
+        response = self.send(client, 'post', self.url, [{'name': 'a', 'surname': 'b'}])
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.django_db
+    def test_should_return_forbidden_if_user_is_not_staff(self, non_staff_user_token, client: Client):
+        response = self.send(client, 'post', self.url, [{'name': 'a', 'surname': 'b'}], non_staff_user_token)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.django_db
+    def test_should_create_batch_with_ids(self, staff_user_token, client: Client):
+        data = [{'name': f'name{i}', 'surname': f'surname{i}'} for i in range(5)]
+
+        response = self.send(client, 'post', self.url, data, staff_user_token)
+        body = response.json()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        for item in body:
+            author = Author.objects.get(pk=item['id'])
+            assert (author.name, author.surname) == (item['name'], item['surname'])
+
+    @pytest.mark.django_db
+    def test_should_create_batch_with_constant_queries(self, staff_user_token, client: Client):
+        def count_queries(size):
+            data = [{'name': f'name{i}', 'surname': f'surname{i}'} for i in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                self.send(client, 'post', self.url, data, staff_user_token)
+            return len(context.captured_queries)
+
+        count_queries(1)  # Warms up the token cache.
+
+        # 150 authors still fit in one INSERT under SQLite's 999 parameter limit.
+        assert count_queries(10) == count_queries(150)
+        assert Author.objects.count() == 161
+
+    @pytest.mark.django_db
+    def test_should_report_per_item_errors_and_save_nothing(self, staff_user_token, client: Client):
+        data = [{'name': 'ok', 'surname': 'ok'}, {'name': 'missing surname'}]
+
+        response = self.send(client, 'post', self.url, data, staff_user_token)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()[0] == {}
+        assert 'surname' in response.json()[1]
+        assert not Author.objects.exists()
+
+    @pytest.mark.django_db
+    def test_should_reject_non_list_payload(self, staff_user_token, client: Client):
+        response = self.send(client, 'post', self.url, {'name': 'a', 'surname': 'b'}, staff_user_token)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_should_update_batch(self, staff_user_token, client: Client):
+        authors = AuthorFactory.create_many(3)
+        data = [{'id': author.id, 'name': f'new{author.id}', 'surname': 'new'} for author in authors]
+
+        response = self.send(client, 'put', self.url, data, staff_user_token)
+
+        assert response.status_code == status.HTTP_200_OK
+        for author in authors:
+            author.refresh_from_db()
+            assert author.name == f'new{author.id}'
+
+    @pytest.mark.django_db
+    def test_should_partially_update_batch(self, staff_user_token, client: Client):
+        author = AuthorFactory(surname='kept')
+
+        self.send(client, 'patch', self.url, [{'id': author.id, 'name': 'changed'}], staff_user_token)
+
+        author.refresh_from_db()
+        assert (author.name, author.surname) == ('changed', 'kept')
+
+    @pytest.mark.django_db
+    def test_should_report_unknown_ids_on_update(self, staff_user_token, client: Client):
+        author = AuthorFactory()
+        data = [{'id': author.id, 'name': 'a', 'surname': 'b'}, {'id': 12345678, 'name': 'a', 'surname': 'b'}]
+
+        response = self.send(client, 'put', self.url, data, staff_user_token)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == [{}, {'id': ['Not found.']}]
+
+    @pytest.mark.django_db
+    def test_should_delete_batch(self, staff_user_token, client: Client):
+        authors = AuthorFactory.create_many(3)
+
+        response = self.send(client, 'delete', self.url, [author.id for author in authors[:2]], staff_user_token)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert list(Author.objects.values_list('id', flat=True)) == [authors[2].id]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_commit_each_delete_batch(self, staff_user_token, client: Client, settings):
+        settings.DELETE_BATCH_SIZE = 2
+        author = AuthorFactory()
+        BookFactory.create_batch(5, author=author)
+        pending = []
+
+        def record_pending(sender, **kwargs):
+            pending.append(len(connection.run_on_commit))
+
+        post_bulk_delete.connect(record_pending, sender=Book)
+        try:
+            response = self.send(client, 'delete', self.url, [author.id], staff_user_token)
+        finally:
+            post_bulk_delete.disconnect(record_pending, sender=Book)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        # On-commit work does not pile up across batches.
+        assert len(pending) == 3
+        assert len(set(pending)) == 1
+        assert not Book.objects.exists()
+
+
+class TestBookBulkAPI(BulkTestHelperMixin):
+    url = reverse('app:book_bulk')
+
+    @pytest.mark.django_db
+    def test_should_create_batch(self, staff_user_token, client: Client):
+        author = AuthorFactory()
+        data = [{'author': author.id, 'name': f'book{i}'} for i in range(3)]
+
+        response = self.send(client, 'post', self.url, data, staff_user_token)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Book.objects.filter(author=author).count() == 3
+
+    @pytest.mark.django_db
+    def test_should_create_batch_with_constant_queries(self, staff_user_token, client: Client):
+        authors = AuthorFactory.create_many(50)
+
+        def count_queries(size):
+            data = [{'author': authors[i % len(authors)].id, 'name': f'book{i}'} for i in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                self.send(client, 'post', self.url, data, staff_user_token)
+            return len(context.captured_queries)
+
+        count_queries(1)  # Warms up the token cache.
+
+        assert count_queries(10) == count_queries(200)
+        assert Book.objects.count() == 211
+
+    @pytest.mark.django_db
+    def test_should_update_batch_with_constant_queries(self, staff_user_token, client: Client):
+        authors = AuthorFactory.create_many(50)
+        books = BookFactory.bulk_create(200)
+
+        def count_queries(size):
+            data = [{'id': book.id, 'author': authors[i % len(authors)].id} for i, book in enumerate(books[:size])]
+            with CaptureQueriesContext(connection) as context:
+                self.send(client, 'patch', self.url, data, staff_user_token)
+            return len(context.captured_queries)
+
+        count_queries(1)  # Warms up the token cache.
+
+        assert count_queries(10) == count_queries(200)
+
+    @pytest.mark.django_db
+    def test_should_report_unknown_authors(self, staff_user_token, client: Client):
+        author = AuthorFactory()
+        data = [{'author': author.id, 'name': 'a'}, {'author': 12345678, 'name': 'b'}, {'author': 2 ** 70, 'name': 'c'}]
+
+        response = self.send(client, 'post', self.url, data, staff_user_token)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert errors[1]['author'] == ['Invalid pk "12345678" - object does not exist.']
+        assert 'author' in errors[2]
+        assert not Book.objects.exists()
+
+    @pytest.mark.django_db
+    def test_should_reassign_author_on_update(self, staff_user_token, client: Client):
+        book = BookFactory()
+        new_author = AuthorFactory()
+
+        self.send(client, 'patch', self.url, [{'id': book.id, 'author': new_author.id}], staff_user_token)
+
+        book.refresh_from_db()
+        assert book.author_id == new_author.id
@@ -0,0 +1,146 @@
+import io
+from base64 import urlsafe_b64encode
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from app.models import Author, Book
+from app.serializers import BookSerializer
+
+
+class TestChangeFeedAPI:
+    url = reverse('app:changes')
+
+    def read(self, client: Client, cursor=None, **params):
+        if cursor:
+            params['changed_since'] = cursor
+        return client.get(self.url, params).json()
+
+    def changed(self, body):
+        return [(change['resource'], change['id'], change['op']) for change in body['changes']]
+
+    @pytest.mark.django_db
+    def test_should_return_everything_without_cursor(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        book = Book.objects.create(author=author, name='War and Peace')
+
+        body = self.read(client)
+
+        assert set(self.changed(body)) == {('authors', author.id, 'upsert'), ('books', book.id, 'upsert')}
+        assert body['has_more'] is False
+        assert body['cursor']
+
+    @pytest.mark.django_db
+    def test_should_return_only_rows_changed_after_cursor(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        book = Book.objects.create(author=author, name='War and Peace')
+        Author.objects.create(name='Anton', surname='Chekhov')
+        cursor = self.read(client)['cursor']
+
+        book.name = 'Resurrection'
+        book.save()
+        body = self.read(client, cursor)
+
+        assert self.changed(body) == [('books', book.id, 'upsert')]
+        assert body['changes'][0]['object'] == BookSerializer(book).data
+        assert self.read(client, body['cursor'])['changes'] == []
+
+    @pytest.mark.django_db
+    def test_should_report_count_changes_of_authors(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        cursor = self.read(client)['cursor']
+
+        book = Book.objects.create(author=author, name='War and Peace')
+
+        assert set(self.changed(self.read(client, cursor))) == {
+            ('authors', author.id, 'upsert'), ('books', book.id, 'upsert'),
+        }
+
+    @pytest.mark.django_db
+    def test_should_report_bulk_updates(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        cursor = self.read(client)['cursor']
+
+        author.surname = 'Tolstoi'
+        Author.objects.bulk_update([author], ['surname'])
+
+        assert self.changed(self.read(client, cursor)) == [('authors', author.id, 'upsert')]
+
+    @pytest.mark.django_db
+    def test_should_report_deletes_including_cascades(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        book = Book.objects.create(author=author, name='War and Peace')
+        author_id, book_id = author.id, book.id
+        cursor = self.read(client)['cursor']
+
+        author.delete()
+
+        assert set(self.changed(self.read(client, cursor))) == {
+            ('authors', author_id, 'delete'), ('books', book_id, 'delete'),
+        }
+
+    @pytest.mark.django_db
+    def test_should_page_through_changes_without_gaps(self, client: Client):
+        authors = Author.objects.bulk_create([Author(name='Leo', surname=f'Tolstoy {i}') for i in range(4)])
+        books = Book.objects.bulk_create([Book(author=author, name='War and Peace') for author in authors])
+        Book.objects.filter(pk=books[0].pk).delete()
+
+        changes, body = [], {'cursor': None, 'has_more': True}
+        while body['has_more']:
+            body = self.read(client, body['cursor'], limit=2)
+            assert len(body['changes']) <= 2
+            changes.extend(self.changed(body))
+
+        assert sorted(changes) == sorted(
+            [('authors', author.id, 'upsert') for author in authors]
+            + [('books', book.id, 'upsert') for book in books[1:]]
+            + [('books', books[0].id, 'delete')]
+        )
+
+    @pytest.mark.django_db
+    def test_should_return_changes_in_commit_order(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        book = Book.objects.create(author=author, name='War and Peace')
+        author.surname = 'Tolstoi'
+        author.save()
+
+        body = self.read(client)
+
+        assert self.changed(body) == [('books', book.id, 'upsert'), ('authors', author.id, 'upsert')]
+
+    @pytest.mark.django_db
+    def test_should_keep_cursor_when_nothing_changed(self, client: Client):
+        Author.objects.create(name='Leo', surname='Tolstoy')
+        cursor = self.read(client)['cursor']
+
+        body = self.read(client, cursor)
+
+        assert body == {'cursor': cursor, 'has_more': False, 'next': None, 'changes': []}
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('cursor', [
+        'nonsense',
+        urlsafe_b64encode(b'[1.5]').decode(),
+        urlsafe_b64encode(b'[-1]').decode(),
+        urlsafe_b64encode(b'[100000000000000000000000000]').decode(),
+        urlsafe_b64encode(b'[1e400]').decode(),
+    ])
+    def test_should_reject_invalid_cursor(self, client: Client, cursor):
+        response = client.get(self.url, {'changed_since': cursor})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_should_expire_cursors_older_than_pruned_tombstones(self, client: Client):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        cursor = self.read(client)['cursor']
+        author.delete()
+        latest = self.read(client, cursor)['cursor']
+
+        call_command('prune_tombstones', '--days', '0', stdout=io.StringIO())
+
+        assert client.get(self.url, {'changed_since': cursor}).status_code == status.HTTP_410_GONE
+        assert client.get(self.url, {'changed_since': latest}).status_code == status.HTTP_200_OK
@@ -0,0 +1,226 @@
+import asyncio
+import json
+
+import pytest
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from app.events import RESET_EVENT, event_hub
+from app.handlers import CatalogASGIHandler
+from app.models import Author, Book
+
+
+class EventStreamClient:
+    """
+    Reads an event stream from `CatalogASGIHandler` until `disconnect()`.
+    """
+
+    def __init__(self, handler, headers=()):
+        self.handler = handler
+        self.headers = [(b'host', b'testserver'), *headers]
+        self.messages = []
+        self.received = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.request_sent = False
+
+    @property
+    def status(self):
+        return self.messages[0]['status']
+
+    @property
+    def body(self):
+        return b''.join(message.get('body', b'') for message in self.messages[1:])
+
+    async def receive(self):
+        if not self.request_sent:
+            self.request_sent = True
+            return {'type': 'http.request', 'body': b''}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.messages.append(message)
+        self.received.set()
+
+    def run(self):
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': reverse('app:events'),
+            'query_string': b'',
+            'headers': self.headers,
+        }
+        return asyncio.ensure_future(self.handler(scope, self.receive, self.send))
+
+    async def wait_for(self, text, timeout=5):
+        async def wait():
+            while text not in self.body:
+                self.received.clear()
+                await self.received.wait()
+
+        await asyncio.wait_for(wait(), timeout)
+
+    def disconnect(self):
+        self.disconnected.set()
+
+
+def parse_events(body):
+    events = []
+    for block in body.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+
+    return events
+
+
+class TestEventStream:
+    @pytest.mark.django_db(transaction=True)
+    def test_should_stream_committed_changes(self):
+        async def run():
+            stream = EventStreamClient(CatalogASGIHandler())
+            task = stream.run()
+            await stream.wait_for(b'retry: ')
+
+            loop = asyncio.get_running_loop()
+            author = await loop.run_in_executor(None, lambda: Author.objects.create(name='Leo', surname='Tolstoy'))
+            author_id = author.id
+            await stream.wait_for(b'event: create')
+            await loop.run_in_executor(None, author.delete)
+            await stream.wait_for(b'event: delete')
+
+            stream.disconnect()
+            await asyncio.wait_for(task, 5)
+            return stream, author_id
+
+        stream, author_id = asyncio.run(run())
+
+        assert stream.status == 200
+        assert dict(stream.messages[0]['headers'])[b'Content-Type'] == b'text/event-stream'
+        assert parse_events(stream.body) == [
+            ('create', {'resource': 'authors', 'id': author_id, 'object': {
+                'id': author_id, 'name': 'Leo', 'surname': 'Tolstoy', 'book_count': 0,
+            }}),
+            ('delete', {'resource': 'authors', 'id': author_id}),
+        ]
+        assert event_hub.subscriptions == set()
+
+    def test_should_resume_from_last_event_id(self):
+        seen = event_hub.publish('create', {'resource': 'books', 'id': 1})
+        event_hub.publish('update', {'resource': 'books', 'id': 1})
+
+        async def run():
+            stream = EventStreamClient(CatalogASGIHandler(), [(b'last-event-id', seen.id.encode())])
+            task = stream.run()
+            await stream.wait_for(b'event: update')
+            event_hub.publish('delete', {'resource': 'books', 'id': 1})
+            await stream.wait_for(b'event: delete')
+            stream.disconnect()
+            await asyncio.wait_for(task, 5)
+            return stream
+
+        stream = asyncio.run(run())
+
+        assert [name for name, _ in parse_events(stream.body)] == ['update', 'delete']
+
+    def test_should_reset_unknown_last_event_id(self):
+        async def run():
+            stream = EventStreamClient(CatalogASGIHandler(), [(b'last-event-id', b'gone-1')])
+            task = stream.run()
+            await stream.wait_for(RESET_EVENT)
+            stream.disconnect()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(run())
+
+    def test_should_send_heartbeats(self):
+        async def run():
+            stream = EventStreamClient(CatalogASGIHandler(heartbeat_seconds=0.01))
+            task = stream.run()
+            await stream.wait_for(b': keep-alive')
+            stream.disconnect()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(run())
+
+    def test_should_end_stream_of_client_that_falls_behind(self, monkeypatch):
+        monkeypatch.setattr(event_hub, 'max_pending', 2)
+
+        async def run():
+            stream = EventStreamClient(CatalogASGIHandler())
+            task = stream.run()
+            await stream.wait_for(b'retry: ')
+            for pk in range(3):
+                event_hub.publish('create', {'resource': 'books', 'id': pk})
+            await asyncio.wait_for(task, 5)
+            return stream
+
+        stream = asyncio.run(run())
+
+        assert stream.messages[-1] == {'type': 'http.response.body'}
+        assert event_hub.subscriptions == set()
+
+    def test_should_drop_client_stalled_in_send(self, monkeypatch):
+        monkeypatch.setattr(event_hub, 'max_pending', 2)
+
+        class StalledClient(EventStreamClient):
+            async def send(self, message):
+                await super().send(message)
+                if message.get('body', b'').startswith(b'id: '):
+                    await asyncio.Event().wait()
+
+        async def run():
+            stream = StalledClient(CatalogASGIHandler())
+            task = stream.run()
+            await stream.wait_for(b'retry: ')
+            event_hub.publish('create', {'resource': 'books', 'id': 0})
+            await stream.wait_for(b'event: create')
+            for pk in range(1, 4):
+                event_hub.publish('create', {'resource': 'books', 'id': pk})
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(run())
+
+        assert event_hub.subscriptions == set()
+
+    def test_should_refuse_subscribers_over_limit(self, monkeypatch):
+        monkeypatch.setattr(event_hub, 'max_subscribers', 0)
+
+        async def run():
+            stream = EventStreamClient(CatalogASGIHandler())
+            await asyncio.wait_for(stream.run(), 5)
+            return stream
+
+        assert asyncio.run(run()).status == 503
+
+    def test_should_send_missed_events_and_end_outside_asgi(self, client: Client):
+        seen = event_hub.publish('create', {'resource': 'books', 'id': 1})
+        event_hub.publish('update', {'resource': 'books', 'id': 1})
+
+        response = client.get(reverse('app:events'), HTTP_ACCEPT='text/event-stream', HTTP_LAST_EVENT_ID=seen.id)
+        body = b''.join(response.streaming_content)
+
+        assert response.status_code == 200
+        assert body.startswith(b'retry: 3000\n\n')
+        assert parse_events(body) == [('update', {'resource': 'books', 'id': 1})]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_publish_bulk_saves(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        event_hub.clear()
+
+        books = Book.objects.bulk_create([Book(author=author, name='War and Peace'), Book(author=author, name='Hadji')])
+
+        assert [(event.name, event.data['id']) for event in event_hub.backlog] == [
+            ('create', book.id) for book in books
+        ]
+        assert event_hub.backlog[0].data['object'] == {'id': books[0].id, 'author': author.id, 'name': 'War and Peace'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_not_publish_rolled_back_changes(self):
+        with pytest.raises(RuntimeError), transaction.atomic():
+            Author.objects.create(name='Leo', surname='Tolstoy')
+            raise RuntimeError
+
+        assert list(event_hub.backlog) == []
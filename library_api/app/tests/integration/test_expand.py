@@ -0,0 +1,63 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from app.serializers import AuthorSerializer
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+class TestBookExpandAuthor:
+    list_url = reverse('app:book_list_create')
+    detail_url_name = 'app:book_retrieve_update_delete'
+
+    @pytest.mark.django_db
+    def test_should_return_author_id_by_default(self, client: Client):
+        book = BookFactory()
+
+        body = client.get(self.list_url).json()
+
+        assert body['results'][0]['author'] == book.author_id
+
+    @pytest.mark.django_db
+    def test_should_nest_author_on_list(self, client: Client):
+        book = BookFactory()
+
+        body = client.get(self.list_url, {'expand': 'author'}).json()
+
+        assert body['results'][0]['author'] == AuthorSerializer(book.author).data
+
+    @pytest.mark.django_db
+    def test_should_nest_author_on_detail(self, client: Client):
+        book = BookFactory()
+
+        body = client.get(reverse(self.detail_url_name, args=[book.pk]), {'expand': 'author'}).json()
+
+        assert body['author'] == AuthorSerializer(book.author).data
+
+    @pytest.mark.django_db
+    def test_should_fetch_page_with_single_query(self, client: Client, django_assert_num_queries):
+        BookFactory.create_batch(10)
+
+        with django_assert_num_queries(1):
+            client.get(self.list_url, {'expand': 'author'})
+
+
+class TestAuthorExpandBooks:
+    list_url = reverse('app:author_list_create')
+
+    @pytest.mark.django_db
+    def test_should_nest_books_on_list(self, client: Client):
+        author = AuthorFactory()
+        books = BookFactory.create_batch(2, author=author)
+
+        body = client.get(self.list_url, {'expand': 'books'}).json()
+
+        assert [book['id'] for book in body['results'][0]['books']] == [book.id for book in books]
+
+    @pytest.mark.django_db
+    def test_should_prefetch_books_with_one_extra_query(self, client: Client, django_assert_num_queries):
+        for author in AuthorFactory.create_many(5):
+            BookFactory.create_batch(3, author=author)
+
+        with django_assert_num_queries(2):
+            client.get(self.list_url, {'expand': 'books'})
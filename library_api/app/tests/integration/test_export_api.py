@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from app.serializers import AuthorSerializer, BookSerializer
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+class TestCatalogExportAPI:
+    def get(self, client: Client, resource: str, export_format: str, token=None):
+        url = reverse('app:export', args=[resource, export_format])
+        headers = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+
+        return client.get(url, **headers)
+
+    def read_body(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    @pytest.mark.django_db
+    def test_should_return_unauthorized_without_credentials(self, client: Client):
+        response = self.get(client, 'authors', 'ndjson')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.django_db
+    def test_should_return_not_found_for_unknown_format(self, staff_user_token, client: Client):
+        response = self.get(client, 'authors', 'xml', staff_user_token)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.django_db
+    def test_should_stream_authors_as_ndjson(self, staff_user_token, client: Client):
+        authors = AuthorFactory.create_many(3)
+
+        response = self.get(client, 'authors', 'ndjson', staff_user_token)
+        rows = [json.loads(line) for line in self.read_body(response).splitlines()]
+
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert rows == [AuthorSerializer(author).data for author in authors]
+
+    @pytest.mark.django_db
+    def test_should_stream_books_as_csv(self, staff_user_token, client: Client):
+        books = BookFactory.create_batch(3)
+
+        response = self.get(client, 'books', 'csv', staff_user_token)
+        rows = list(csv.DictReader(io.StringIO(self.read_body(response))))
+
+        assert response['Content-Type'] == 'text/csv'
+        assert rows == [{key: str(value) for key, value in BookSerializer(book).data.items()} for book in books]
+
+    @pytest.mark.django_db
+    def test_should_stream_authors_as_json_array(self, staff_user_token, client: Client):
+        authors = AuthorFactory.create_many(3)
+
+        response = self.get(client, 'authors', 'json', staff_user_token)
+
+        assert response['Content-Type'] == 'application/json'
+        assert json.loads(self.read_body(response)) == [AuthorSerializer(author).data for author in authors]
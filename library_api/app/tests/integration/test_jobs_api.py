@@ -0,0 +1,112 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from app.jobs import Worker
+from app.models import Job
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+def staff(token):
+    return {'HTTP_AUTHORIZATION': f'Token {token}'}
+
+
+class TestJobsAPI:
+    url = reverse('app:job_create')
+
+    @pytest.mark.django_db
+    def test_should_queue_job_and_point_at_its_status(self, staff_user_token, client: Client):
+        response = client.post(self.url, {'kind': 'export_catalog', 'params': {'resource': 'books'}},
+                               content_type='application/json', **staff(staff_user_token))
+
+        job = Job.objects.get()
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response['Location'] == f'http://testserver{reverse("app:job_detail", args=[job.pk])}'
+        assert response.json()['status'] == Job.QUEUED
+        assert job.params == {'resource': 'books', 'format': 'ndjson'}
+        assert job.max_attempts == 3
+
+    @pytest.mark.django_db
+    def test_should_reject_unknown_kind(self, staff_user_token, client: Client):
+        response = client.post(self.url, {'kind': 'mine_bitcoin'}, content_type='application/json',
+                               **staff(staff_user_token))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'kind' in response.json()
+
+    @pytest.mark.django_db
+    def test_should_reject_invalid_params(self, staff_user_token, client: Client):
+        response = client.post(self.url, {'kind': 'delete_authors', 'params': {'ids': ['x']}},
+                               content_type='application/json', **staff(staff_user_token))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'ids' in response.json()['params']
+        assert not Job.objects.exists()
+
+    @pytest.mark.django_db
+    def test_should_require_staff(self, non_staff_user_token, client: Client):
+        response = client.post(self.url, {'kind': 'repair_book_counts'}, content_type='application/json',
+                               **staff(non_staff_user_token))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.django_db
+    def test_should_report_progress_and_result(self, staff_user_token, client: Client):
+        author = AuthorFactory()
+        BookFactory.create_batch(2, author=author)
+        response = client.post(self.url, {'kind': 'delete_authors', 'params': {'ids': [author.pk]}},
+                               content_type='application/json', **staff(staff_user_token))
+
+        Worker('test-worker').run(burst=True)
+        body = client.get(response['Location'], **staff(staff_user_token)).json()
+
+        assert body['status'] == Job.SUCCEEDED
+        assert body['progress'] == {'done': 3, 'total': 3}
+        assert body['result'] == {'deleted': 3}
+
+    @pytest.mark.django_db
+    def test_should_download_job_output(self, staff_user_token, client: Client, settings, tmp_path):
+        settings.JOB_OUTPUT_DIR = str(tmp_path)
+        AuthorFactory(name='Leo', surname='Tolstoy')
+        response = client.post(self.url, {'kind': 'export_catalog', 'params': {'resource': 'authors'}},
+                               content_type='application/json', **staff(staff_user_token))
+        job_id = response.json()['id']
+        output_url = reverse('app:job_output', args=[job_id])
+
+        assert client.get(output_url, **staff(staff_user_token)).status_code == status.HTTP_404_NOT_FOUND
+
+        Worker('test-worker').run(burst=True)
+        response = client.get(output_url, **staff(staff_user_token))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert b'"surname":"Tolstoy"' in b''.join(response.streaming_content).replace(b' ', b'')
+
+
+class TestDeferredAuthorDelete:
+    @pytest.mark.django_db
+    def test_should_delete_author_in_job_when_asked_to_respond_async(self, staff_user_token, client: Client):
+        author = AuthorFactory()
+        BookFactory.create_batch(3, author=author)
+
+        response = client.delete(reverse('app:author_retrieve_update_delete', args=[author.pk]),
+                                 HTTP_PREFER='respond-async', **staff(staff_user_token))
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()['kind'] == 'delete_authors'
+        assert client.get(reverse('app:author_retrieve_update_delete', args=[author.pk])).status_code == \
+            status.HTTP_200_OK
+
+        Worker('test-worker').run(burst=True)
+
+        assert client.get(response['Location'], **staff(staff_user_token)).json()['status'] == Job.SUCCEEDED
+        assert client.get(reverse('app:author_retrieve_update_delete', args=[author.pk])).status_code == \
+            status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.django_db
+    def test_should_not_queue_job_for_missing_author(self, staff_user_token, client: Client):
+        response = client.delete(reverse('app:author_retrieve_update_delete', args=[12345]),
+                                 HTTP_PREFER='respond-async', **staff(staff_user_token))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not Job.objects.exists()
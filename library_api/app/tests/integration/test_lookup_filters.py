@@ -0,0 +1,107 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+def get_query_plan(client: Client, url: str, params: dict):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url, params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {context.captured_queries[0]["sql"]}')
+        return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+
+class TestAuthorLookupFilters:
+    url = reverse('app:author_list_create')
+
+    @pytest.mark.django_db
+    def test_should_filter_by_surname(self, client: Client):
+        author = AuthorFactory(surname='Tolstoy')
+        AuthorFactory(surname='Chekhov')
+
+        body = client.get(self.url, {'surname': 'Tolstoy'}).json()
+
+        assert [item['id'] for item in body['results']] == [author.id]
+
+    @pytest.mark.django_db
+    def test_should_filter_by_name_prefix_case_sensitively(self, client: Client):
+        author = AuthorFactory(name='Leo')
+        AuthorFactory(name='leonid')
+        AuthorFactory(name='Lev')
+
+        body = client.get(self.url, {'name__startswith': 'Le'}).json()
+
+        assert sorted(item['name'] for item in body['results']) == ['Leo', 'Lev']
+        body = client.get(self.url, {'name__startswith': 'Leo'}).json()
+        assert [item['id'] for item in body['results']] == [author.id]
+
+    @pytest.mark.django_db
+    def test_should_use_like_for_prefix_outside_sqlite(self, client: Client, monkeypatch):
+        # A range is only a prefix match under SQLite's binary collation.
+        monkeypatch.setattr(connection, 'vendor', 'postgresql')
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.url, {'name__startswith': 'Le'})
+
+        assert ' LIKE ' in context.captured_queries[0]['sql']
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('prefix', ['\U0010ffff', 'L\U0010ffff\U0010ffff', 'L\ud7ff'])
+    def test_should_filter_by_prefix_ending_in_last_code_point(self, client: Client, prefix):
+        author = AuthorFactory(name=f'{prefix}eo')
+        AuthorFactory(name='M')
+
+        body = client.get(self.url, {'name__startswith': prefix}).json()
+
+        assert [item['id'] for item in body['results']] == [author.id]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params, index', [
+        ({'surname': 'Tolstoy'}, 'author_surname_name_idx'),
+        ({'surname': 'Tolstoy', 'name__startswith': 'L'}, 'author_surname_name_idx'),
+        ({'surname__startswith': 'Tol'}, 'author_surname_name_idx'),
+        ({'name__startswith': 'L'}, 'author_name_idx'),
+    ])
+    def test_should_use_index(self, client: Client, params, index):
+        plan = get_query_plan(client, self.url, params)
+
+        assert re.search(f'USING (COVERING )?INDEX {index} ', plan)
+
+
+class TestBookLookupFilters:
+    url = reverse('app:book_list_create')
+
+    @pytest.mark.django_db
+    def test_should_filter_by_author(self, client: Client):
+        book = BookFactory()
+        BookFactory()
+
+        body = client.get(self.url, {'author': book.author_id}).json()
+
+        assert [item['id'] for item in body['results']] == [book.id]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('author', ['abc', '9999999999999999999999999'])
+    def test_should_reject_non_integer_author(self, client: Client, author):
+        response = client.get(self.url, {'author': author})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params, index', [
+        ({'author': 1}, 'book_author_name_idx'),
+        ({'author': 1, 'name__startswith': 'War'}, 'book_author_name_idx'),
+        ({'name__startswith': 'War'}, 'book_name_idx'),
+    ])
+    def test_should_use_index(self, client: Client, params, index):
+        plan = get_query_plan(client, self.url, params)
+
+        assert re.search(f'USING (COVERING )?INDEX {index} ', plan)
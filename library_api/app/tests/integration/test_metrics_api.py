@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from app.metrics import request_metrics
+from app.tests.factories import BookFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_request_metrics():
+    request_metrics.clear()
+    yield
+    request_metrics.clear()
+
+
+class TestMetricsAPI:
+    url = reverse('metrics')
+
+    @pytest.mark.django_db
+    def test_should_record_latency_and_queries_per_view(self, client: Client):
+        BookFactory.create_batch(2)
+
+        client.get(reverse('app:book_list_create'))
+
+        count, _ = request_metrics.request_duration.get(('app:book_list_create', 'GET', 200))
+        assert count == 1
+        queries, _ = request_metrics.request_queries.get(('app:book_list_create', 'GET'))
+        assert queries == 1
+        assert request_metrics.response_size.get(('app:book_list_create', 'GET'))[1] > 0
+
+    @pytest.mark.django_db
+    def test_should_expose_prometheus_text(self, client: Client):
+        client.get(reverse('app:author_list_create'))
+
+        response = client.get(self.url)
+
+        assert response['Content-Type'] == 'text/plain; charset=utf-8'
+        body = response.content.decode()
+        assert '# TYPE library_api_request_duration_seconds histogram' in body
+        assert (
+            'library_api_request_duration_seconds_count{view="app:author_list_create",method="GET",status="200"} 1'
+            in body
+        )
+
+    @pytest.mark.django_db
+    def test_should_log_slow_requests_with_sql(self, client: Client, settings, caplog):
+        settings.SLOW_REQUEST_SECONDS = 0
+
+        with caplog.at_level(logging.WARNING, logger='app.middleware'):
+            client.get(reverse('app:book_list_create'))
+
+        message = caplog.records[-1].getMessage()
+        assert message.startswith('Slow request GET /api/v1/books: 200')
+        assert 'FROM "app_book"' in message
@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from app.serializers import AuthorSerializer, BookSerializer
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+class TestMultiGet:
+    books_url = reverse('app:book_list_create')
+    authors_url = reverse('app:author_list_create')
+
+    @pytest.mark.django_db
+    def test_should_return_books_in_requested_order_with_one_query(self, client: Client):
+        books = BookFactory.create_many(3)
+        ids = [books[2].id, books[0].id, books[1].id]
+
+        with CaptureQueriesContext(connection) as context:
+            body = client.get(self.books_url, {'ids': ','.join(map(str, ids))}).json()
+
+        assert body == {'results': [BookSerializer(books[i]).data for i in (2, 0, 1)], 'missing': []}
+        assert len(context) == 1
+
+    @pytest.mark.django_db
+    def test_should_report_missing_ids(self, client: Client):
+        author = AuthorFactory()
+
+        body = client.get(self.authors_url, {'ids': f'999,{author.id},998'}).json()
+
+        assert body == {'results': [AuthorSerializer(author).data], 'missing': [999, 998]}
+
+    @pytest.mark.django_db
+    def test_should_ignore_duplicate_ids(self, client: Client):
+        author = AuthorFactory()
+
+        body = client.get(self.authors_url, {'ids': f'{author.id},{author.id}'}).json()
+
+        assert [item['id'] for item in body['results']] == [author.id]
+
+    @pytest.mark.django_db
+    def test_should_combine_with_expand_and_fields(self, client: Client):
+        first, second = AuthorFactory.create_many(2)
+        book = BookFactory(author=second)
+
+        body = client.get(self.authors_url, {'ids': f'{second.id},{first.id}', 'expand': 'books',
+                                             'fields': 'id,books'}).json()
+
+        assert body['results'] == [
+            {'id': second.id, 'books': [BookSerializer(book).data]},
+            {'id': first.id, 'books': []},
+        ]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('ids', ['1,a', ',', '', '0', '-1', '9999999999999999999999999'])
+    def test_should_reject_invalid_ids(self, client: Client, ids):
+        response = client.get(self.books_url, {'ids': ids})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_should_cap_number_of_ids(self, client: Client, settings):
+        settings.MAX_MULTI_GET_IDS = 2
+
+        response = client.get(self.books_url, {'ids': '1,2,3'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'ids': ['Ensure this list has no more than 2 ids.']}
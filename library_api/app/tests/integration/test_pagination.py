@@ -0,0 +1,97 @@
+import json
+from base64 import urlsafe_b64encode
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from app.pagination import KeysetPagination
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+class TestKeysetPagination:
+    url = reverse('app:book_list_create')
+
+    def collect_all_pages(self, client: Client, url: str):
+        ids = []
+        while url:
+            body = client.get(url).json()
+            ids.extend(item['id'] for item in body['results'])
+            url = body['next']
+
+        return ids
+
+    @pytest.mark.django_db
+    def test_should_wrap_results_with_cursor_links(self, client: Client):
+        BookFactory.create_batch(3)
+
+        body = client.get(self.url).json()
+
+        assert set(body.keys()) == {'next', 'previous', 'results'}
+        assert body['previous'] is None
+
+    @pytest.mark.django_db
+    def test_should_limit_page_by_page_size_param(self, client: Client):
+        BookFactory.create_batch(5)
+
+        body = client.get(self.url, {'page_size': 2}).json()
+
+        assert len(body['results']) == 2
+        assert body['next'] is not None
+
+    @pytest.mark.django_db
+    def test_should_walk_every_row_once_in_pk_order(self, client: Client):
+        books = BookFactory.create_batch(7)
+
+        ids = self.collect_all_pages(client, f'{self.url}?page_size=3')
+
+        assert ids == sorted(book.id for book in books)
+
+    @pytest.mark.django_db
+    def test_should_be_stable_when_rows_are_inserted_between_pages(self, client: Client):
+        books = BookFactory.create_batch(4)
+        first_page = client.get(self.url, {'page_size': 2}).json()
+
+        BookFactory()
+        second_page = client.get(first_page['next']).json()
+
+        assert [item['id'] for item in second_page['results']] == [book.id for book in books[2:]]
+
+    @pytest.mark.django_db
+    def test_should_cap_page_size(self, client: Client, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, 'max_page_size', 2)
+        AuthorFactory.create_many(3)
+
+        body = client.get(reverse('app:author_list_create'), {'page_size': 10 ** 6}).json()
+
+        assert len(body['results']) == 2
+
+    @pytest.mark.django_db
+    def test_should_reject_invalid_cursor(self, client: Client):
+        response = client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('cursor, ordering', [
+        ({'p': ['abc'], 'r': 0}, 'id'),
+        ({'p': [{'a': 1}], 'r': 0}, 'id'),
+        ({'p': [None, 1], 'r': 0}, '-book_count'),
+        ({'p': [1.5], 'r': 0}, 'id'),
+        ({'p': [10 ** 25], 'r': 0}, 'id'),
+    ])
+    def test_should_reject_cursor_with_invalid_position(self, client: Client, cursor, ordering):
+        encoded = urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+        self.assert_not_found(client, encoded, ordering)
+
+    @pytest.mark.django_db
+    def test_should_reject_cursor_with_infinite_position(self, client: Client):
+        # json.dumps cannot write 1e400, which Python parses as infinity.
+        encoded = urlsafe_b64encode(b'{"p": [1e400], "r": 0}').decode()
+        self.assert_not_found(client, encoded, 'id')
+
+    def assert_not_found(self, client, encoded, ordering):
+        response = client.get(reverse('app:author_list_create'), {'cursor': encoded, 'ordering': ordering})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
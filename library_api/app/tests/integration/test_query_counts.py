@@ -0,0 +1,141 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from app.models import Author, Book
+from app.tests.base import AbstractQueryCountTest
+
+
+def create_authors(count: int):
+    return Author.objects.bulk_create([Author(name='Leo', surname=f'Tolstoy {i}') for i in range(count)])
+
+
+def create_books(count: int, author: Author = None):
+    authors = [author] * count if author else create_authors(count)
+    return Book.objects.bulk_create([Book(author=author, name=f'War and Peace {i}') for i, author in enumerate(authors)])
+
+
+class TestAuthorListQueries(AbstractQueryCountTest):
+    max_queries = 1
+
+    def create_rows(self, count: int):
+        create_authors(count)
+
+    def get_url(self):
+        return f'{reverse("app:author_list_create")}?page_size={self.many}'
+
+
+class TestAuthorListByBookCountQueries(TestAuthorListQueries):
+    def get_url(self):
+        return f'{super().get_url()}&ordering=-book_count'
+
+
+class TestExpandedAuthorListQueries(AbstractQueryCountTest):
+    max_queries = 2
+
+    def create_rows(self, count: int):
+        create_books(count)
+
+    def get_url(self):
+        return f'{reverse("app:author_list_create")}?page_size={self.many}&expand=books'
+
+
+class TestBookListQueries(AbstractQueryCountTest):
+    max_queries = 1
+
+    def create_rows(self, count: int):
+        create_books(count)
+
+    def get_url(self):
+        return f'{reverse("app:book_list_create")}?page_size={self.many}'
+
+
+class TestExpandedBookListQueries(TestBookListQueries):
+    def get_url(self):
+        return f'{super().get_url()}&expand=author'
+
+
+class TestSparseExpandedBookListQueries(TestBookListQueries):
+    def get_url(self):
+        return f'{super().get_url()}&expand=author&fields=id,author'
+
+
+class TestMultiGetExpandedBookQueries(AbstractQueryCountTest):
+    many = 100
+    max_queries = 1
+
+    def create_rows(self, count: int):
+        create_books(count)
+
+    def get_url(self):
+        ids = ','.join(str(pk) for pk in Book.objects.values_list('pk', flat=True))
+        return f'{reverse("app:book_list_create")}?ids={ids}&expand=author'
+
+
+class TestExpandedAuthorDetailQueries(AbstractQueryCountTest):
+    max_queries = 2
+    author = None
+
+    def create_rows(self, count: int):
+        self.author = self.author or Author.objects.create(name='Leo', surname='Tolstoy')
+        create_books(count, self.author)
+
+    def get_url(self):
+        return f'{reverse("app:author_retrieve_update_delete", args=[self.author.pk])}?expand=books'
+
+    def get_rows(self, body):
+        return body['books']
+
+
+class TestSearchQueries(AbstractQueryCountTest):
+    max_queries = 4
+
+    def create_rows(self, count: int):
+        create_books(count)
+
+    def get_url(self):
+        return f'{reverse("app:search")}?q=peace&type=books&limit={self.many}'
+
+
+class TestChangeFeedQueries(AbstractQueryCountTest):
+    max_queries = 3
+
+    def create_rows(self, count: int):
+        create_authors(count)
+
+    def get_url(self):
+        return f'{reverse("app:changes")}?limit={self.many}'
+
+    def get_rows(self, body):
+        return body['changes']
+
+
+class TestStatsQueries(AbstractQueryCountTest):
+    many = 10
+    max_queries = 2
+
+    def create_rows(self, count: int):
+        create_books(count)
+
+    def get_url(self):
+        return reverse('app:stats')
+
+    def get_rows(self, body):
+        return body['top_authors']
+
+
+class TestDetailQueries:
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('query', ['', '?expand=author'])
+    def test_book_detail_should_use_one_query(self, client: Client, django_assert_num_queries, query):
+        book, = create_books(1)
+
+        with django_assert_num_queries(1):
+            client.get(f'{reverse("app:book_retrieve_update_delete", args=[book.pk])}{query}')
+
+    @pytest.mark.django_db
+    def test_author_detail_should_use_one_query(self, client: Client, django_assert_num_queries):
+        author, = create_authors(1)
+
+        with django_assert_num_queries(1):
+            client.get(reverse('app:author_retrieve_update_delete', args=[author.pk]))
@@ -0,0 +1,130 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from app.models import Author, Book
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+class TestResponseCache:
+    list_url = reverse('app:book_list_create')
+    detail_url_name = 'app:book_retrieve_update_delete'
+
+    @pytest.mark.django_db
+    def test_should_serve_repeated_get_from_cache(self, client: Client, django_assert_num_queries):
+        BookFactory.create_batch(3)
+        first = client.get(self.list_url)
+
+        with django_assert_num_queries(0):
+            second = client.get(self.list_url)
+
+        assert second.json() == first.json()
+        assert second['ETag'] == first['ETag']
+
+    @pytest.mark.django_db
+    def test_should_key_cache_by_query_params(self, client: Client):
+        BookFactory.create_batch(3)
+        client.get(self.list_url)
+
+        body = client.get(self.list_url, {'page_size': 1}).json()
+
+        assert len(body['results']) == 1
+
+    @pytest.mark.django_db
+    def test_should_return_not_modified_for_matching_etag(self, client: Client, django_assert_num_queries):
+        book = BookFactory()
+        url = reverse(self.detail_url_name, args=[book.pk])
+        etag = client.get(url)['ETag']
+
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    @pytest.mark.django_db
+    def test_should_return_not_modified_since_last_modified(self, client: Client):
+        last_modified = client.get(self.list_url)['Last-Modified']
+
+        response = client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.django_db
+    def test_should_move_last_modified_on_change_within_same_second(self, client: Client, monkeypatch):
+        monkeypatch.setattr('app.cache.time.time', lambda: 1000.2)
+        author = AuthorFactory()
+        url = reverse('app:author_retrieve_update_delete', args=[author.pk])
+        last_modified = client.get(url)['Last-Modified']
+
+        author.name = 'Renamed'
+        author.save()
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['name'] == 'Renamed'
+        assert response['Last-Modified'] != last_modified
+
+    @pytest.mark.django_db
+    def test_should_invalidate_list_on_create(self, client: Client):
+        author = Author.objects.create(name='a', surname='b')
+        etag = client.get(self.list_url)['ETag']
+
+        book = Book.objects.create(author=author, name='New')
+        response = client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.json()['results']] == [book.id]
+
+    @pytest.mark.django_db
+    def test_should_invalidate_only_the_changed_detail(self, client: Client):
+        first, second = BookFactory(), BookFactory()
+        first_url = reverse(self.detail_url_name, args=[first.pk])
+        second_url = reverse(self.detail_url_name, args=[second.pk])
+        first_etag, second_etag = client.get(first_url)['ETag'], client.get(second_url)['ETag']
+
+        first.name = 'Renamed'
+        first.save()
+
+        assert client.get(first_url, HTTP_IF_NONE_MATCH=first_etag).json()['name'] == 'Renamed'
+        assert client.get(second_url, HTTP_IF_NONE_MATCH=second_etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.django_db
+    def test_should_invalidate_expanded_books_when_author_changes(self, client: Client):
+        author = AuthorFactory()
+        BookFactory(author=author)
+        client.get(self.list_url, {'expand': 'author'})
+
+        author.name = 'Renamed'
+        author.save()
+        body = client.get(self.list_url, {'expand': 'author'}).json()
+
+        assert body['results'][0]['author']['name'] == 'Renamed'
+
+    @pytest.mark.django_db
+    def test_should_invalidate_on_delete(self, client: Client):
+        book = BookFactory()
+        url = reverse(self.detail_url_name, args=[book.pk])
+        client.get(url)
+
+        book.delete()
+
+        assert client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.django_db
+    def test_should_invalidate_on_bulk_update(self, client: Client):
+        book = BookFactory()
+        client.get(self.list_url)
+
+        book.name = 'Bulk renamed'
+        Book.objects.bulk_update([book], ['name'])
+
+        assert client.get(self.list_url).json()['results'][0]['name'] == 'Bulk renamed'
+
+    @pytest.mark.django_db
+    def test_should_not_cache_not_found(self, client: Client):
+        response = client.get(reverse(self.detail_url_name, args=[12345678]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not response.has_header('ETag')
@@ -0,0 +1,112 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from app.models import Author, Book
+from app.search import build_match_query, get_search_index
+
+
+@pytest.fixture
+def tolstoy():
+    author = Author.objects.create(name='Leo', surname='Tolstoy')
+    Book.objects.create(author=author, name='War and Peace')
+    Book.objects.create(author=author, name='Anna Karenina')
+
+    return author
+
+
+class TestSearchAPI:
+    url = reverse('app:search')
+
+    def search(self, client: Client, **params):
+        response = client.get(self.url, params)
+        return [(item['type'], item['object']['id']) for item in response.json()['results']]
+
+    @pytest.mark.django_db
+    def test_should_require_query(self, client: Client):
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_should_find_books_and_authors_by_prefix(self, client: Client, tolstoy):
+        war_and_peace = tolstoy.book_set.get(name='War and Peace')
+
+        assert self.search(client, q='pea') == [('books', war_and_peace.id)]
+        assert ('authors', tolstoy.id) in self.search(client, q='tolst')
+
+    @pytest.mark.django_db
+    def test_should_match_all_words(self, client: Client, tolstoy):
+        anna_karenina = tolstoy.book_set.get(name='Anna Karenina')
+
+        assert self.search(client, q='tolstoy anna') == [('books', anna_karenina.id)]
+
+    @pytest.mark.django_db
+    def test_should_rank_better_matches_first(self, client: Client):
+        author = Author.objects.create(name='Some', surname='One')
+        weak = Book.objects.create(author=author, name='Gardens of the moon and other long stories of many kinds')
+        strong = Book.objects.create(author=author, name='Moon')
+
+        assert self.search(client, q='moon', type='books') == [('books', strong.id), ('books', weak.id)]
+
+    @pytest.mark.django_db
+    def test_should_filter_by_type(self, client: Client, tolstoy):
+        assert self.search(client, q='tolstoy', type='authors') == [('authors', tolstoy.id)]
+
+    @pytest.mark.django_db
+    def test_should_paginate_with_limit_and_offset(self, client: Client, tolstoy):
+        first_page = client.get(self.url, {'q': 'tolstoy', 'limit': 2}).json()
+        second_page = client.get(first_page['next']).json()
+
+        assert len(first_page['results']) == 2
+        assert len(second_page['results']) == 1
+        assert second_page['next'] is None
+
+    @pytest.mark.django_db
+    def test_should_cap_offset(self, client: Client, tolstoy, settings):
+        settings.MAX_SEARCH_OFFSET = 1
+
+        body = client.get(self.url, {'q': 'tolstoy', 'limit': 1, 'offset': '9999999999999999999999999'}).json()
+
+        assert len(body['results']) == 1
+        assert 'offset=0' in body['previous']
+
+    @pytest.mark.django_db
+    def test_should_follow_updates_and_deletes(self, client: Client, tolstoy):
+        book = tolstoy.book_set.get(name='War and Peace')
+        book.name = 'Resurrection'
+        book.save()
+        tolstoy.surname = 'Tolstoi'
+        tolstoy.save()
+
+        assert self.search(client, q='war') == []
+        assert self.search(client, q='tolstoi resurrection') == [('books', book.id)]
+
+        tolstoy.delete()
+        assert self.search(client, q='tolstoi') == []
+
+    @pytest.mark.django_db
+    def test_should_index_bulk_created_rows(self, client: Client):
+        authors = Author.objects.bulk_create([Author(name='Fyodor', surname='Dostoevsky')])
+
+        assert self.search(client, q='dostoevsky') == [('authors', authors[0].id)]
+
+    @pytest.mark.django_db
+    def test_should_ignore_fts_syntax_in_query(self, client: Client, tolstoy):
+        response = client.get(self.url, {'q': 'war" OR NEAR(* ^'})
+
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.django_db
+    def test_rebuild_command_should_restore_index(self, client: Client, tolstoy):
+        get_search_index().remove_authors([tolstoy.id])
+
+        call_command('rebuild_search_index')
+
+        assert ('authors', tolstoy.id) in self.search(client, q='tolstoy')
+
+
+def test_build_match_query_should_quote_words():
+    assert build_match_query('war "and" pe') == '"war"* "and"* "pe"*'
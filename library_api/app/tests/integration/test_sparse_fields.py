@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from app.models import Author, Book
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+def get_with_queries(client: Client, url: str, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+class TestSparseFields:
+    @pytest.mark.django_db
+    def test_should_trim_book_list_output_and_projection(self, client: Client):
+        book = BookFactory()
+
+        response, queries = get_with_queries(client, reverse('app:book_list_create'), fields='id,name')
+
+        assert response.json()['results'] == [{'id': book.id, 'name': book.name}]
+        assert '"author_id"' not in queries[-1]
+
+    @pytest.mark.django_db
+    def test_should_keep_serializer_field_order(self, client: Client):
+        BookFactory()
+
+        response = client.get(reverse('app:book_list_create'), {'fields': 'name,id'})
+
+        assert list(response.json()['results'][0]) == ['id', 'name']
+
+    @pytest.mark.django_db
+    def test_should_page_list_without_id_field(self, client: Client):
+        books = BookFactory.create_many(2)
+
+        body = client.get(reverse('app:book_list_create'), {'fields': 'name', 'page_size': 1}).json()
+
+        assert body['results'] == [{'name': books[0].name}]
+        assert client.get(body['next']).json()['results'] == [{'name': books[1].name}]
+
+    @pytest.mark.django_db
+    def test_should_trim_detail_output_and_projection(self, client: Client):
+        author = AuthorFactory()
+        url = reverse('app:author_retrieve_update_delete', args=[author.pk])
+
+        response, queries = get_with_queries(client, url, fields='surname')
+
+        assert response.json() == {'surname': author.surname}
+        assert '"name"' not in queries[-1]
+
+    @pytest.mark.django_db
+    def test_should_reject_unknown_fields(self, client: Client):
+        response = client.get(reverse('app:book_list_create'), {'fields': 'id,isbn'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'isbn' in response.json()['fields'][0]
+
+    @pytest.mark.django_db
+    def test_should_combine_with_expand(self, client: Client):
+        book = BookFactory()
+
+        response = client.get(reverse('app:book_retrieve_update_delete', args=[book.pk]),
+                              {'fields': 'id,author', 'expand': 'author'})
+
+        assert response.json() == {
+            'id': book.id,
+            'author': {'id': book.author.id, 'name': book.author.name, 'surname': book.author.surname,
+                       'book_count': book.author.book_count},
+        }
+
+    @pytest.mark.django_db
+    def test_should_not_expand_field_left_out(self, client: Client):
+        author = AuthorFactory()
+        BookFactory(author=author)
+
+        response, queries = get_with_queries(client, reverse('app:author_list_create'), fields='id', expand='books')
+
+        assert response.json()['results'] == [{'id': author.id}]
+        assert not any('"app_book"' in sql for sql in queries)
+
+    @pytest.mark.django_db
+    def test_should_page_by_ordering_left_out_of_fields(self, client: Client):
+        authors = [Author.objects.create(name='Leo', surname=f'Tolstoy {i}') for i in range(3)]
+        Book.objects.create(author=authors[1], name='War and Peace')
+
+        response = client.get(reverse('app:author_list_create'),
+                              {'fields': 'id', 'ordering': '-book_count', 'page_size': 1})
+        body = response.json()
+        next_body = client.get(body['next']).json()
+
+        assert body['results'] == [{'id': authors[1].id}]
+        assert next_body['results'] == [{'id': authors[2].id}]
@@ -0,0 +1,52 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from app.models import Author, Book
+
+
+class TestStatsAPI:
+    url = reverse('app:stats')
+
+    @pytest.mark.django_db
+    def test_should_report_totals_and_top_authors(self, client: Client):
+        tolstoy = Author.objects.create(name='Leo', surname='Tolstoy')
+        chekhov = Author.objects.create(name='Anton', surname='Chekhov')
+        Book.objects.create(author=tolstoy, name='War and Peace')
+        Book.objects.create(author=tolstoy, name='Resurrection')
+        Book.objects.create(author=chekhov, name='The Seagull')
+
+        body = client.get(self.url).json()
+
+        assert body['authors'] == 2
+        assert body['books'] == 3
+        assert body['books_per_author'] == 1.5
+        assert [author['id'] for author in body['top_authors']] == [tolstoy.id, chekhov.id]
+        assert body['top_authors'][0]['book_count'] == 2
+
+    @pytest.mark.django_db
+    def test_should_report_zeros_for_empty_catalog(self, client: Client):
+        body = client.get(self.url).json()
+
+        assert body == {'authors': 0, 'books': 0, 'books_per_author': 0, 'top_authors': []}
+
+
+class TestAuthorBookCountOrdering:
+    url = reverse('app:author_list_create')
+
+    @pytest.mark.django_db
+    def test_should_page_by_book_count_across_ties(self, client: Client):
+        authors = [Author.objects.create(name=f'Name {i}', surname=f'Surname {i}') for i in range(5)]
+        for count, author in zip((2, 0, 2, 1, 0), authors):
+            for i in range(count):
+                Book.objects.create(author=author, name=f'Book {i}')
+
+        ids = []
+        url = f'{self.url}?ordering=-book_count&page_size=2'
+        while url:
+            body = client.get(url).json()
+            ids.extend(item['id'] for item in body['results'])
+            url = body['next']
+
+        expected = sorted(authors, key=lambda author: (-Author.objects.get(pk=author.pk).book_count, -author.id))
+        assert ids == [author.id for author in expected]
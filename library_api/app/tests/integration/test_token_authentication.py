@@ -0,0 +1,102 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from app.authentication import CachedTokenAuthentication, stamp_key, token_cache
+from app.tests.factories import AuthorFactory
+
+
+class TestCachedTokenAuthentication:
+    url = reverse('app:author_list_create')
+
+    def post_author(self, client: Client, token):
+        return client.post(self.url,
+                           {'name': 'name', 'surname': 'surname'},
+                           content_type='application/json',
+                           HTTP_AUTHORIZATION=f'Token {token}')
+
+    @pytest.mark.django_db
+    def test_should_cache_token_after_first_request(self, staff_user_token: Token, client: Client):
+        self.post_author(client, staff_user_token)
+
+        _, user_values, token_values = token_cache.get(staff_user_token.key)
+        assert token_values[:2] == (staff_user_token.key, staff_user_token.user_id)
+        assert user_values[0] == staff_user_token.user_id
+
+    @pytest.mark.django_db
+    def test_should_build_new_user_for_each_cache_hit(self, staff_user_token: Token):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(staff_user_token.key)
+
+        first, _ = authentication.authenticate_credentials(staff_user_token.key)
+        second, token = authentication.authenticate_credentials(staff_user_token.key)
+
+        assert first is not second
+        assert first == second == staff_user_token.user
+        assert (second.is_active, second.is_staff) == (True, True)
+        assert token == staff_user_token and token.user is second
+
+    @pytest.mark.django_db
+    def test_should_skip_token_query_on_cache_hit(self, staff_user_token: Token, client: Client):
+        self.post_author(client, staff_user_token)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_author(client, staff_user_token)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not [query for query in context.captured_queries if 'authtoken_token' in query['sql']]
+
+    @pytest.mark.django_db
+    def test_should_reject_deleted_token(self, staff_user_token: Token, client: Client):
+        key = staff_user_token.key
+        self.post_author(client, key)
+
+        staff_user_token.delete()
+        response = self.post_author(client, key)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.django_db
+    def test_should_reject_deactivated_user(self, staff_user_token: Token, client: Client):
+        self.post_author(client, staff_user_token)
+
+        user = staff_user_token.user
+        user.is_active = False
+        user.save()
+        response = self.post_author(client, staff_user_token)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.django_db
+    def test_should_forbid_user_after_staff_revoked(self, staff_user_token: Token, client: Client):
+        author = AuthorFactory()
+        self.post_author(client, staff_user_token)
+
+        user = staff_user_token.user
+        user.is_staff = False
+        user.save()
+        response = client.delete(reverse('app:author_retrieve_update_delete', args=[author.pk]),
+                                 HTTP_AUTHORIZATION=f'Token {staff_user_token}')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.django_db
+    def test_should_reload_when_another_process_replaces_stamp(self, staff_user_token: Token, client: Client):
+        author = AuthorFactory()
+        self.post_author(client, staff_user_token)
+
+        # Another worker revokes staff and replaces the stamp in the shared
+        # cache; this process's LRU entry is left in place.
+        get_user_model().objects.filter(pk=staff_user_token.user_id).update(is_staff=False)
+        cache.set(stamp_key.format(staff_user_token.key), 'replaced')
+        response = client.delete(reverse('app:author_retrieve_update_delete', args=[author.pk]),
+                                 HTTP_AUTHORIZATION=f'Token {staff_user_token}')
+
+        assert token_cache.get(staff_user_token.key) is not None
+        assert response.status_code == status.HTTP_403_FORBIDDEN
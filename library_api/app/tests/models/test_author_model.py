@@ -24,3 +24,23 @@ class TestAuthorModelManager(AbstractModelManagerTest):
             "name": author.name,
             "surname": author.surname
         }
+
+
+class TestAuthorBulkCreate:
+    @pytest.mark.django_db
+    def test_should_assign_primary_keys(self):
+        AuthorFactory()
+        authors = [AuthorFactory.build() for _ in range(3)]
+
+        created = Author.objects.bulk_create(authors)
+
+        assert [author.pk for author in created] == list(
+            Author.objects.order_by('pk').values_list('pk', flat=True)[1:])
+
+    @pytest.mark.django_db
+    def test_should_cap_batch_size_to_backend_limits(self):
+        authors = [AuthorFactory.build() for _ in range(1200)]
+
+        Author.objects.bulk_create(authors, batch_size=5000)
+
+        assert Author.objects.count() == 1200
@@ -0,0 +1,95 @@
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.models import Author, Book, CatalogCounter, Tombstone, post_bulk_delete
+from app.search import get_search_index
+from app.tests.factories import AuthorFactory, BookFactory
+
+
+def create_author_with_books(count):
+    author = AuthorFactory()
+    BookFactory.bulk_create(count, author=author)
+    # The bulk factories skip the signals that keep these up to date.
+    Author.objects.filter(pk=author.pk).refresh_book_counts()
+    CatalogCounter.objects.increment('authors')
+    CatalogCounter.objects.increment('books', count)
+
+    return author
+
+
+class TestDeleteInBatches:
+    @pytest.mark.django_db
+    def test_should_delete_books_in_batches(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        other = Author.objects.create(name='Anton', surname='Chekhov')
+        Book.objects.bulk_create([Book(author=author, name=f'Book {i}') for i in range(5)])
+        kept = Book.objects.create(author=other, name='The Seagull')
+
+        deleted = Book.objects.filter(author=author).delete_in_batches(batch_size=2)
+
+        assert deleted == 5
+        assert list(Book.objects.all()) == [kept]
+        assert Author.objects.get(pk=author.pk).book_count == 0
+        assert CatalogCounter.objects.values_dict() == {'authors': 2, 'books': 1}
+        assert Tombstone.objects.filter(resource='books').count() == 5
+
+    @pytest.mark.django_db
+    def test_should_take_write_lock_before_reading_each_batch(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        Book.objects.bulk_create([Book(author=author, name=f'Book {i}') for i in range(3)])
+
+        with CaptureQueriesContext(connection) as context:
+            Book.objects.filter(author=author).delete_in_batches(batch_size=2)
+
+        statements = [query['sql'] for query in context.captured_queries]
+        lock = 'DELETE FROM "app_book" WHERE 0'
+        # Two batches and the empty read that ends the loop.
+        assert statements[0] == lock
+        assert statements.count(lock) == 3
+
+    @pytest.mark.django_db
+    def test_should_remove_deleted_books_from_search_index(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        Book.objects.create(author=author, name='War and Peace')
+
+        Book.objects.all().delete_in_batches()
+
+        assert get_search_index().search('peace') == []
+
+    @pytest.mark.django_db
+    def test_should_delete_author_with_books(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        Book.objects.bulk_create([Book(author=author, name=f'Book {i}') for i in range(5)])
+
+        deleted = Author.objects.filter(pk=author.pk).delete_in_batches(batch_size=2)
+
+        assert deleted == 6
+        assert not Author.objects.exists()
+        assert not Book.objects.exists()
+        assert CatalogCounter.objects.values_dict() == {'authors': 0, 'books': 0}
+        assert sorted(Tombstone.objects.values_list('resource', flat=True)) == ['authors'] + ['books'] * 5
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_delete_author_with_100k_books_a_batch_at_a_time(self):
+        author = create_author_with_books(100_000)
+        batches = []
+
+        def record_batch(sender, instances, **kwargs):
+            batches.append(len(instances))
+
+        post_bulk_delete.connect(record_batch, sender=Book)
+        try:
+            deleted = Author.objects.filter(pk=author.pk).delete_in_batches(batch_size=500)
+        finally:
+            post_bulk_delete.disconnect(record_batch, sender=Book)
+
+        assert deleted == 100_001
+        # Never more than a batch of books in memory, where delete() would
+        # collect all 100k of them.
+        assert max(batches) == 500
+        assert sum(batches) == 100_000
+        assert not Book.objects.exists()
+        assert CatalogCounter.objects.values_dict() == {'authors': 0, 'books': 0}
+        assert Tombstone.objects.count() == 100_001
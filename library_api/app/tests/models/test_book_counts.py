@@ -0,0 +1,52 @@
+import pytest
+
+from app.models import Author, Book, CatalogCounter
+
+
+def get_book_count(author: Author):
+    return Author.objects.values_list('book_count', flat=True).get(pk=author.pk)
+
+
+class TestBookCounts:
+    @pytest.mark.django_db
+    def test_should_count_created_and_deleted_books(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        book = Book.objects.create(author=author, name='War and Peace')
+        Book.objects.create(author=author, name='Resurrection')
+
+        assert get_book_count(author) == 2
+
+        book.delete()
+
+        assert get_book_count(author) == 1
+        assert CatalogCounter.objects.values_dict() == {'authors': 1, 'books': 1}
+
+    @pytest.mark.django_db
+    def test_should_move_count_when_book_is_reassigned(self):
+        first = Author.objects.create(name='Leo', surname='Tolstoy')
+        second = Author.objects.create(name='Anton', surname='Chekhov')
+        book = Book.objects.create(author=first, name='Resurrection')
+
+        book.author = second
+        book.save()
+
+        assert get_book_count(first) == 0
+        assert get_book_count(second) == 1
+
+    @pytest.mark.django_db
+    def test_should_count_bulk_created_books(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+
+        Book.objects.bulk_create([Book(author=author, name=f'Book {i}') for i in range(5)])
+
+        assert get_book_count(author) == 5
+        assert CatalogCounter.objects.values_dict()['books'] == 5
+
+    @pytest.mark.django_db
+    def test_should_drop_author_from_totals_on_cascade(self):
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        Book.objects.create(author=author, name='Resurrection')
+
+        author.delete()
+
+        assert CatalogCounter.objects.values_dict() == {'authors': 0, 'books': 0}
@@ -0,0 +1,70 @@
+import pytest
+from django.core.cache import caches
+from django.test import Client
+from django.urls import reverse
+
+from app.models import Author, Book
+from app.serializers import AuthorSerializer, BookSerializer, AuthorWithBooksSerializer, BookWithAuthorSerializer, \
+    RowEncoder
+from app.tests.factories import AuthorFactory, BookFactory
+from app.views import FastListMixin
+
+
+class TestRowEncoder:
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('serializer_class, factory', [
+        (AuthorSerializer, AuthorFactory),
+        (BookSerializer, BookFactory),
+    ])
+    def test_should_match_serializer_output(self, serializer_class, factory):
+        factory.create_batch(3, name='Ünïcode "quoted" name')
+        model = serializer_class.Meta.model
+        encoder = RowEncoder.for_serializer(serializer_class)
+
+        rows = model.objects.order_by('pk').values(*encoder.columns)
+
+        assert encoder.encode_many(rows) == serializer_class(model.objects.order_by('pk'), many=True).data
+
+    @pytest.mark.parametrize('serializer_class', [AuthorWithBooksSerializer, BookWithAuthorSerializer])
+    def test_should_not_support_nested_serializers(self, serializer_class):
+        assert RowEncoder.for_serializer(serializer_class) is None
+
+    def test_should_read_foreign_keys_from_attname(self):
+        assert RowEncoder.for_serializer(BookSerializer).columns == ['id', 'author_id', 'name']
+
+
+class TestFastListResponses:
+    def get_both(self, client: Client, monkeypatch, url, params):
+        fast = client.get(url, params).content
+        caches['default'].clear()
+        monkeypatch.setattr(FastListMixin, 'fast_list', False)
+        slow = client.get(url, params).content
+        monkeypatch.undo()
+
+        return fast, slow
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('url_name, params', [
+        ('app:author_list_create', {}),
+        ('app:author_list_create', {'page_size': 2}),
+        ('app:author_list_create', {'surname': 'Tolstoy'}),
+        ('app:book_list_create', {}),
+        ('app:book_list_create', {'page_size': 2}),
+        ('app:book_list_create', {'name__startswith': 'W'}),
+    ])
+    def test_should_be_byte_identical_to_serializer(self, client: Client, monkeypatch, url_name, params):
+        author = Author.objects.create(name='Лев', surname='Tolstoy')
+        for name in ('War and Peace', 'Anna Karenina', 'Воскресение'):
+            Book.objects.create(author=author, name=name)
+        BookFactory.create_batch(2)
+
+        fast, slow = self.get_both(client, monkeypatch, reverse(url_name), params)
+
+        assert fast == slow
+
+    @pytest.mark.django_db
+    def test_should_not_instantiate_models(self, client: Client, monkeypatch):
+        BookFactory.create_batch(3)
+        monkeypatch.setattr(Book, 'from_db', classmethod(lambda *args: pytest.fail('model instantiated')))
+
+        client.get(reverse('app:book_list_create'))
@@ -0,0 +1,36 @@
+from app.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_should_evict_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+
+        cache.set('c', 3)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+
+    def test_should_expire_entries_after_ttl(self, monkeypatch):
+        cache = LRUCache(ttl=10)
+        now = 1000.0
+        monkeypatch.setattr('app.cache.time.monotonic', lambda: now)
+        cache.set('a', 1)
+
+        now += 11
+
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_should_delete_entries_matching_predicate(self):
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        cache.delete_where(lambda value: value == 2)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    settings_dict = {**connections.databases['default'], 'NAME': str(tmp_path / 'db.sqlite3')}
+    wrapper = DatabaseWrapper(settings_dict, alias='file')
+    yield wrapper
+    wrapper.close()
+
+
+def read_pragma(wrapper, pragma):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {pragma}')
+        return cursor.fetchone()[0]
+
+
+class TestSQLiteConnection:
+    @pytest.mark.django_db
+    def test_should_enable_wal_on_new_connections(self, file_connection):
+        assert read_pragma(file_connection, 'journal_mode') == 'wal'
+        assert read_pragma(file_connection, 'synchronous') == 1
+
+    @pytest.mark.django_db
+    def test_should_commit_writes_while_reader_is_open(self, file_connection):
+        writer = DatabaseWrapper({**file_connection.settings_dict, 'OPTIONS': {'timeout': 0}}, alias='writer')
+        with writer.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+
+        reader = file_connection.cursor()
+        try:
+            reader.execute('BEGIN')
+            reader.execute('SELECT COUNT(*) FROM item')
+
+            with writer.cursor() as cursor:
+                cursor.execute('INSERT INTO item DEFAULT VALUES')
+                cursor.execute('SELECT COUNT(*) FROM item')
+                assert cursor.fetchone()[0] == 1
+        finally:
+            reader.execute('ROLLBACK')
+            reader.close()
+            writer.close()
+
+    @pytest.mark.django_db
+    def test_should_configure_default_connection(self):
+        assert read_pragma(connection, 'synchronous') == 1
@@ -0,0 +1,104 @@
+import asyncio
+
+from app.events import RESET_EVENT, EventHub, encode_replay
+
+
+class TestEventHub:
+    def test_should_replay_events_after_last_event_id(self):
+        hub = EventHub()
+        first = hub.publish('create', {'id': 1})
+        second = hub.publish('update', {'id': 1})
+        third = hub.publish('delete', {'id': 1})
+
+        assert hub.replay(first.id) == [second, third]
+        assert hub.replay(third.id) == []
+        assert hub.replay(None) == []
+
+    def test_should_not_replay_unknown_event_ids(self):
+        hub = EventHub(backlog=2)
+        first = hub.publish('create', {'id': 1})
+        hub.publish('create', {'id': 2})
+        hub.publish('create', {'id': 3})
+
+        assert hub.replay(first.id) is None
+        assert hub.replay('other-process-1') is None
+        assert encode_replay(None) == RESET_EVENT
+
+    def test_should_push_events_to_every_subscriber(self):
+        hub = EventHub()
+        (first, _), (second, _) = hub.subscribe(), hub.subscribe()
+
+        event = hub.publish('create', {'id': 1})
+
+        assert first.drain() == [event]
+        assert second.drain() == [event]
+
+    def test_should_subscribe_with_replay_of_missed_events(self):
+        hub = EventHub()
+        seen = hub.publish('create', {'id': 1})
+        missed = hub.publish('create', {'id': 2})
+
+        subscription, replayed = hub.subscribe(seen.id)
+        live = hub.publish('create', {'id': 3})
+
+        assert replayed == [missed]
+        assert subscription.drain() == [live]
+
+    def test_should_drop_subscribers_that_fall_behind(self):
+        hub = EventHub(max_pending=2)
+        (slow, _), (fast, _) = hub.subscribe(), hub.subscribe()
+
+        for pk in range(3):
+            hub.publish('create', {'id': pk})
+            if pk < 2:
+                fast.drain()
+
+        assert slow.overflowed
+        assert slow.drain() == []
+        assert not fast.overflowed
+        assert len(fast.drain()) == 1
+
+    def test_should_limit_subscribers(self):
+        hub = EventHub(max_subscribers=1)
+        subscription, _ = hub.subscribe()
+
+        assert hub.subscribe() is None
+
+        hub.unsubscribe(subscription)
+        assert hub.subscribe() is not None
+
+    def test_should_wake_waiting_subscriber_from_other_thread(self):
+        hub = EventHub()
+        subscription, _ = hub.subscribe()
+
+        async def wait_for_event():
+            loop = asyncio.get_running_loop()
+            subscription.bind()
+            waiting = asyncio.ensure_future(subscription.wait())
+            await asyncio.sleep(0)
+            await loop.run_in_executor(None, hub.publish, 'create', {'id': 1})
+            await asyncio.wait_for(waiting, timeout=1)
+            return subscription.drain()
+
+        events = asyncio.run(wait_for_event())
+
+        assert [event.data for event in events] == [{'id': 1}]
+
+    def test_should_wake_on_overflow(self):
+        hub = EventHub(max_pending=1)
+        subscription, _ = hub.subscribe()
+
+        async def wait_for_overflow():
+            subscription.bind()
+            hub.publish('create', {'id': 1})
+            hub.publish('create', {'id': 2})
+            await asyncio.wait_for(subscription.wait_overflowed(), timeout=1)
+
+        asyncio.run(wait_for_overflow())
+
+        assert subscription.overflowed
+
+    def test_should_encode_server_sent_event(self):
+        event = EventHub().publish('create', {'resource': 'books', 'id': 1})
+
+        assert event.encode() == f'id: {event.id}\nevent: create\ndata: {{"resource":"books","id":1}}\n\n'.encode()
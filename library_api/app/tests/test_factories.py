@@ -0,0 +1,42 @@
+import factory
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.models import Author, Book
+from app.tests.factories import AuthorFactory, BookFactory, UserFactory
+
+
+class SequencedAuthorFactory(AuthorFactory):
+    surname = factory.Sequence(lambda n: f'surname{n}')
+
+
+class TestBulkFactories:
+    @pytest.mark.django_db
+    def test_create_many_should_not_insert_row_by_row(self):
+        with CaptureQueriesContext(connection) as few:
+            AuthorFactory.create_many(2)
+        with CaptureQueriesContext(connection) as many:
+            AuthorFactory.create_many(150)
+
+        assert len(few) == len(many)
+        assert Author.objects.count() == 152
+
+    @pytest.mark.django_db
+    def test_should_spread_books_over_shared_author_pool(self):
+        books = BookFactory.bulk_create(20, books_per_author=5)
+
+        assert Author.objects.count() == 4
+        assert {book.author_id for book in Book.objects.all()} == {book.author_id for book in books}
+        assert Book.objects.filter(author=books[0].author).count() == 5
+
+    def test_should_resolve_sequences_per_instance(self):
+        authors = SequencedAuthorFactory.build_many(3)
+
+        assert len({author.surname for author in authors}) == 3
+        assert {author.name for author in authors} == {'test_name'}
+
+    def test_should_fall_back_to_build_batch_for_other_declarations(self):
+        users = UserFactory.build_many(2)
+
+        assert all(user.check_password('password') for user in users)
@@ -0,0 +1,244 @@
+import os
+from datetime import timedelta
+
+import pytest
+from django.db import OperationalError
+from django.utils import timezone
+
+from app.jobs import JOB_KINDS, JobFailed, JobKind, JobRun, LeaseLost, Worker, enqueue
+from app.models import Author, Book, Job
+from app.tests.factories import BookFactory
+
+
+@pytest.fixture
+def register(monkeypatch):
+    def register(kind, handler, max_attempts=None):
+        monkeypatch.setitem(JOB_KINDS, kind, JobKind(handler, max_attempts=max_attempts))
+
+    return register
+
+
+def run_jobs(**options):
+    Worker('test-worker', **options).run(burst=True)
+
+
+class TestJobClaim:
+    @pytest.mark.django_db
+    def test_should_claim_each_job_once(self):
+        job = Job.objects.create(kind='test')
+
+        claimed = Job.objects.claim('first', lease_seconds=60)
+
+        assert claimed.pk == job.pk
+        assert claimed.status == Job.RUNNING
+        assert claimed.leased_by == 'first'
+        assert claimed.attempts == 1
+        assert Job.objects.claim('second', lease_seconds=60) is None
+
+    @pytest.mark.django_db
+    def test_should_not_claim_jobs_before_run_after(self):
+        Job.objects.create(kind='test', run_after=timezone.now() + timedelta(minutes=1))
+
+        assert Job.objects.claim('worker', lease_seconds=60) is None
+
+    @pytest.mark.django_db
+    def test_should_claim_jobs_with_expired_lease_again(self):
+        job = Job.objects.create(kind='test')
+        Job.objects.claim('crashed', lease_seconds=60)
+        Job.objects.filter(pk=job.pk).update(leased_until=timezone.now() - timedelta(seconds=1))
+
+        claimed = Job.objects.claim('worker', lease_seconds=60)
+
+        assert claimed.leased_by == 'worker'
+        assert claimed.attempts == 2
+
+    @pytest.mark.django_db
+    def test_should_only_claim_given_kinds(self):
+        Job.objects.create(kind='other')
+        job = Job.objects.create(kind='test')
+
+        assert Job.objects.claim('worker', lease_seconds=60, kinds=['test']).pk == job.pk
+
+
+class TestWorker:
+    @pytest.mark.django_db
+    def test_should_store_result_and_progress(self, register):
+        def handler(run, count):
+            for done in range(count + 1):
+                run.progress(done, count)
+            return {'count': count}
+
+        register('test', handler)
+        job = enqueue('test', {'count': 3})
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+        assert job.result == {'count': 3}
+        assert (job.progress_done, job.progress_total) == (3, 3)
+        assert job.finished_at is not None
+
+    @pytest.mark.django_db
+    def test_should_retry_failed_job_with_backoff(self, register):
+        def handler(run):
+            raise RuntimeError('boom')
+
+        register('test', handler)
+        job = enqueue('test', max_attempts=2)
+
+        run_jobs(retry_seconds=60)
+
+        job.refresh_from_db()
+        assert job.status == Job.QUEUED
+        assert job.attempts == 1
+        assert 'RuntimeError: boom' in job.error
+        assert job.run_after > timezone.now() + timedelta(seconds=50)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_jobs(retry_seconds=60)
+
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert job.attempts == 2
+
+    @pytest.mark.django_db
+    def test_should_not_retry_job_failed_by_handler(self, register):
+        def handler(run):
+            raise JobFailed('Nothing to do.')
+
+        register('test', handler)
+        job = enqueue('test')
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert (job.status, job.attempts, job.error) == (Job.FAILED, 1, 'Nothing to do.')
+
+    @pytest.mark.django_db
+    def test_should_fail_unknown_kinds(self):
+        job = Job.objects.create(kind='unknown')
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert (job.status, job.error) == (Job.FAILED, 'Unknown job kind: unknown')
+
+    @pytest.mark.django_db
+    def test_should_stop_handler_that_lost_its_lease(self, register):
+        def handler(run):
+            Job.objects.filter(pk=run.job.pk).update(leased_by='other')
+            run.progress(1)
+
+        register('test', handler)
+        job = enqueue('test')
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert (job.status, job.leased_by, job.progress_done) == (Job.RUNNING, 'other', 0)
+
+    @pytest.mark.django_db
+    def test_should_fail_job_whose_lease_expired_on_last_attempt(self, register):
+        register('test', lambda run: None)
+        job = enqueue('test', max_attempts=1)
+        Job.objects.filter(pk=job.pk).update(status=Job.RUNNING, attempts=1,
+                                             leased_until=timezone.now() - timedelta(seconds=1))
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+
+    @pytest.mark.django_db
+    def test_should_raise_lease_lost_after_failed_renewal(self):
+        job = Job.objects.create(kind='test')
+        run = JobRun(Job.objects.claim('worker', lease_seconds=60), Worker('worker'))
+        Job.objects.filter(pk=job.pk).update(status=Job.QUEUED)
+
+        run.renew_lease()
+
+        with pytest.raises(LeaseLost):
+            run.progress(1)
+
+    @pytest.mark.django_db
+    def test_should_retry_finishing_job_while_database_is_busy(self, register, monkeypatch):
+        register('test', lambda run: {'ok': True})
+        job = enqueue('test')
+        monkeypatch.setattr('app.jobs.time.sleep', lambda seconds: None)
+        leased = JobRun.leased
+        failures = [OperationalError('database is locked')]
+
+        def flaky_leased(run):
+            if failures:
+                raise failures.pop()
+            return leased(run)
+
+        monkeypatch.setattr(JobRun, 'leased', flaky_leased)
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+        assert job.result == {'ok': True}
+
+
+class TestJobKinds:
+    @pytest.mark.django_db
+    def test_should_delete_authors_with_progress(self, settings):
+        settings.DELETE_BATCH_SIZE = 2
+        author = Author.objects.create(name='Leo', surname='Tolstoy')
+        Book.objects.bulk_create([Book(author=author, name=f'Book {i}') for i in range(5)])
+        job = enqueue('delete_authors', {'ids': [author.pk]})
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+        assert job.result == {'deleted': 6}
+        assert (job.progress_done, job.progress_total) == (6, 6)
+        assert not Author.objects.exists()
+
+    @pytest.mark.django_db
+    def test_should_export_catalog_to_file(self, settings, tmp_path):
+        settings.JOB_OUTPUT_DIR = str(tmp_path)
+        Author.objects.create(name='Leo', surname='Tolstoy')
+        job = enqueue('export_catalog', {'resource': 'authors', 'format': 'csv'})
+
+        run_jobs()
+
+        job.refresh_from_db()
+        path = os.path.join(tmp_path, job.result['file'])
+        assert job.status == Job.SUCCEEDED
+        assert open(path).read().splitlines()[1].endswith('Leo,Tolstoy,0')
+        assert os.listdir(tmp_path) == [job.result['file']]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('export_format', ['csv', 'json', 'ndjson'])
+    def test_should_report_export_progress_in_rows(self, settings, tmp_path, monkeypatch, export_format):
+        settings.JOB_OUTPUT_DIR = str(tmp_path)
+        settings.EXPORT_CHUNK_SIZE = 10
+        BookFactory.bulk_create(95)
+        reported = []
+        progress = JobRun.progress
+        monkeypatch.setattr(JobRun, 'progress', lambda run, done, total=None: (
+            reported.append(done), progress(run, done, total)
+        ))
+        job = enqueue('export_catalog', {'resource': 'books', 'format': export_format})
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+        assert reported == [0, *range(10, 100, 10), 95, 95]
+        assert (job.progress_done, job.progress_total) == (95, 95)
+
+    @pytest.mark.django_db
+    @pytest.mark.usefixtures('shared_cache')
+    def test_should_repair_book_counts(self):
+        job = enqueue('repair_book_counts')
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.result == {'output': 'Fixed book_count of 0 authors.'}
@@ -0,0 +1,36 @@
+from app.metrics import Histogram, QueryRecorder
+
+
+class TestHistogram:
+    def test_should_render_cumulative_buckets(self):
+        histogram = Histogram('latency_seconds', 'Latency.', ('view',), (0.1, 1))
+        histogram.observe(('books',), 0.05)
+        histogram.observe(('books',), 0.5)
+        histogram.observe(('books',), 3)
+
+        assert histogram.render().splitlines() == [
+            '# HELP latency_seconds Latency.',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{view="books",le="0.1"} 1',
+            'latency_seconds_bucket{view="books",le="1"} 2',
+            'latency_seconds_bucket{view="books",le="+Inf"} 3',
+            'latency_seconds_sum{view="books"} 3.55',
+            'latency_seconds_count{view="books"} 3',
+        ]
+
+    def test_should_escape_label_values(self):
+        histogram = Histogram('size', 'Size.', ('view',), (1,))
+        histogram.observe(('a"b',), 1)
+
+        assert 'size_count{view="a\\"b"} 1' in histogram.render()
+
+
+class TestQueryRecorder:
+    def test_should_count_and_keep_limited_statements(self):
+        recorder = QueryRecorder(max_statements=1)
+
+        for sql in ('SELECT 1', 'SELECT 2'):
+            recorder(lambda *args: None, sql, (), False, {})
+
+        assert recorder.count == 2
+        assert [sql for _, sql in recorder.statements] == ['SELECT 1']
@@ -0,0 +1,49 @@
+import datetime
+import decimal
+import json
+from collections import OrderedDict
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from app import renderers
+from app.renderers import FastJSONRenderer
+
+PAYLOAD = OrderedDict([
+    ('next', None),
+    ('results', [
+        {'id': 1, 'author': 2, 'name': 'War and Peace'},
+        {'id': 2, 'author': 2, 'name': 'Воскресение   "quoted" \\  '},
+    ]),
+    ('created', datetime.datetime(2020, 7, 16, 16, 6, 1, 123456, tzinfo=datetime.timezone.utc)),
+    ('price', decimal.Decimal('1.50')),
+    (3, 'non string key'),
+])
+
+
+class TestFastJSONRenderer:
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_should_match_json_renderer_output(self, monkeypatch, use_orjson):
+        if use_orjson:
+            pytest.importorskip('orjson')
+        else:
+            monkeypatch.setattr(renderers, 'orjson', None)
+
+        assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+    def test_should_indent_when_requested(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+
+        assert rendered == b'{\n    "a": 1\n}'
+
+    def test_should_render_empty_body_for_none(self):
+        assert FastJSONRenderer().render(None) == b''
+
+    @pytest.mark.parametrize('count', [0, 1, 5, 7])
+    def test_iter_render_should_produce_one_array(self, count):
+        items = ({'id': i} for i in range(count))
+
+        chunks = list(FastJSONRenderer().iter_render(items, chunk_size=2))
+
+        assert json.loads(b''.join(chunks)) == [{'id': i} for i in range(count)]
+        assert len(chunks) == 2 + (count + 1) // 2
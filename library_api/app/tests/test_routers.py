@@ -0,0 +1,80 @@
+import pytest
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from app.middleware import ReplicaRoutingMiddleware
+from app.models import Author
+from app.routers import ReplicaRouter, pin_primary, replicas_enabled, use_replicas
+
+
+@pytest.fixture
+def replica_settings(settings):
+    settings.READ_REPLICAS = ['replica_0']
+    settings.REPLICA_STICKY_SECONDS = 5
+
+
+@pytest.mark.usefixtures('replica_settings')
+class TestReplicaRouter:
+    router = ReplicaRouter()
+
+    def test_should_read_from_primary_by_default(self):
+        assert self.router.db_for_read(Author) == 'default'
+
+    def test_should_read_from_replica_when_enabled(self):
+        with use_replicas():
+            assert self.router.db_for_read(Author) == 'replica_0'
+            assert self.router.db_for_write(Author) == 'default'
+
+        assert not replicas_enabled()
+
+    def test_should_read_from_primary_after_pin(self):
+        with use_replicas():
+            pin_primary()
+
+            assert self.router.db_for_read(Author) == 'default'
+
+    @pytest.mark.django_db
+    def test_should_read_from_primary_inside_transaction(self):
+        with use_replicas(), transaction.atomic():
+            assert self.router.db_for_read(Author) == 'default'
+
+    def test_should_not_migrate_replicas(self):
+        assert self.router.allow_migrate('default', 'app')
+        assert not self.router.allow_migrate('replica_0', 'app')
+
+
+@pytest.mark.usefixtures('replica_settings')
+class TestReplicaRoutingMiddleware:
+    factory = RequestFactory()
+
+    def handle(self, request):
+        routed = []
+
+        def get_response(request):
+            routed.append(replicas_enabled())
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(get_response)(request)
+        return routed[0]
+
+    def test_should_route_safe_requests_to_replicas(self):
+        assert self.handle(self.factory.get('/api/v1/books')) is True
+
+    def test_should_route_writes_to_primary(self):
+        assert self.handle(self.factory.post('/api/v1/books')) is False
+
+    def test_should_keep_writing_client_on_primary(self):
+        self.handle(self.factory.post('/api/v1/books', HTTP_AUTHORIZATION='Token a'))
+
+        assert self.handle(self.factory.get('/api/v1/books', HTTP_AUTHORIZATION='Token a')) is False
+        assert self.handle(self.factory.get('/api/v1/books', HTTP_AUTHORIZATION='Token b')) is True
+
+    def test_should_release_client_after_sticky_window(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr('django.core.cache.backends.locmem.time.time', lambda: now)
+        self.handle(self.factory.delete('/api/v1/books/1', HTTP_AUTHORIZATION='Token a'))
+
+        now += 6
+
+        assert self.handle(self.factory.get('/api/v1/books', HTTP_AUTHORIZATION='Token a')) is True
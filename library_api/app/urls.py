@@ -1,13 +1,25 @@
 from django.urls import path
 
 from app.views import AuthorListCreateAPIView, AuthorRetrieveUpdateDeleteAPIView, BookListCreateAPIView, \
-    BookRetrieveUpdateDeleteAPIView
+    BookRetrieveUpdateDeleteAPIView, AuthorBulkAPIView, BookBulkAPIView, CatalogExportAPIView, \
+    SearchAPIView, StatsAPIView, ChangeFeedAPIView, EventStreamAPIView, \
+    JobCreateAPIView, JobRetrieveAPIView, JobOutputAPIView
 
 app_name = 'app'
 
 urlpatterns = [
     path('authors', AuthorListCreateAPIView.as_view(), name='author_list_create'),
+    path('authors/bulk', AuthorBulkAPIView.as_view(), name='author_bulk'),
     path('authors/<int:pk>', AuthorRetrieveUpdateDeleteAPIView.as_view(), name='author_retrieve_update_delete'),
     path('books', BookListCreateAPIView.as_view(), name='book_list_create'),
-    path('books/<int:pk>', BookRetrieveUpdateDeleteAPIView.as_view(), name='book_retrieve_update_delete')
+    path('books/bulk', BookBulkAPIView.as_view(), name='book_bulk'),
+    path('books/<int:pk>', BookRetrieveUpdateDeleteAPIView.as_view(), name='book_retrieve_update_delete'),
+    path('export/<str:resource>.<str:export_format>', CatalogExportAPIView.as_view(), name='export'),
+    path('search', SearchAPIView.as_view(), name='search'),
+    path('stats', StatsAPIView.as_view(), name='stats'),
+    path('changes', ChangeFeedAPIView.as_view(), name='changes'),
+    path('events', EventStreamAPIView.as_view(), name='events'),
+    path('jobs', JobCreateAPIView.as_view(), name='job_create'),
+    path('jobs/<int:pk>', JobRetrieveAPIView.as_view(), name='job_detail'),
+    path('jobs/<int:pk>/output', JobOutputAPIView.as_view(), name='job_output')
 ]
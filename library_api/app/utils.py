@@ -0,0 +1,18 @@
+import itertools
+
+
+def chunked(iterable, size):
+    """
+    Lazily split `iterable` into lists of at most `size` items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Largest value of the 64-bit signed integer columns, which is as far as
+# SQLite and PostgreSQL bigint go.
+MAX_DB_INT = 2 ** 63 - 1
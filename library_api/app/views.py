@@ -1,13 +1,316 @@
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+import os
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError, APIException
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListCreateAPIView, RetrieveAPIView, \
+    RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from app.cache import response_cache
+from app.changes import ChangeFeed, InvalidCursor, decode_cursor, encode_cursor
+from app.events import EventStreamResponse, event_hub
+from app.jobs import enqueue
+from app.export import EXPORT_COLUMNS, EXPORT_FORMATS, iter_export
+from app.filters import IndexedLookupFilter
+from app.metrics import request_metrics
+from app.models import Author, Book, CatalogCounter, Job, TombstoneHorizon
+from app.pagination import KeysetPagination
+from app.renderers import EventStreamRenderer, PrometheusRenderer
+from app.routers import pin_primary
+from app.search import get_search_index, load_search_results
+from app.serializers import AuthorSerializer, BookSerializer, AuthorWithBooksSerializer, BookWithAuthorSerializer, \
+    JobSerializer, RowEncoder
+from app.utils import MAX_DB_INT
+
+
+def get_requested_fields(request, query_param='fields'):
+    """
+    Field names asked for with `?fields=a,b` on a GET, or None for all fields.
+    """
+    if request.method != 'GET':
+        return None
+
+    fields = [name for name in request.query_params.get(query_param, '').split(',') if name]
+    return fields or None
+
+
+class SparseFieldsMixin:
+    """
+    Lets read requests pick the fields of the response with `?fields=`.
+
+    The serializer drops the other fields and the queryset only selects the
+    columns the requested fields, the keyset ordering and an expanded
+    relation need.
+    """
+
+    def get_sparse_fields(self):
+        requested = get_requested_fields(self.request)
+        if requested is None:
+            return None
+
+        available = self.get_serializer_class().Meta.fields
+        unknown = [name for name in requested if name not in available]
+        if unknown:
+            raise ValidationError({'fields': [f'Unknown fields: {", ".join(unknown)}. '
+                                              f'Must be any of: {", ".join(available)}.']})
+
+        return tuple(name for name in available if name in requested)
+
+    def get_sparse_columns(self, fields):
+        model = self.queryset.model
+        orderings = (ordering.lstrip('-') for ordering in getattr(self, 'keyset_orderings', ()))
+        names = {model._meta.pk.name, *fields, *orderings}
+        if self.is_expanded():
+            names.add(self.expand_field)
+
+        columns = []
+        for name in names:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                columns.append(name)
+
+        return columns
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            queryset = queryset.only(*self.get_sparse_columns(fields))
+
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+
+        return super().get_serializer(*args, **kwargs)
+
+
+class ExpandMixin:
+    """
+    Lets read requests opt in to nested related data with `?expand=<field>`.
+
+    The expanded serializer is only used for GET, and only if `?fields=`
+    does not leave the expanded field out. `expand_queryset` must join or
+    prefetch the relation so the response does not cost a query per row.
+    """
+    expand_query_param = 'expand'
+    expand_field: str
+    expanded_serializer_class = None
+
+    def is_expanded(self):
+        if self.request.method != 'GET':
+            return False
+
+        expand = self.request.query_params.get(self.expand_query_param, '')
+        fields = get_requested_fields(self.request)
+        return self.expand_field in expand.split(',') and (fields is None or self.expand_field in fields)
+
+    @abstractmethod
+    def expand_queryset(self, queryset):
+        pass
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.is_expanded():
+            queryset = self.expand_queryset(queryset)
+
+        return queryset
+
+    def get_serializer_class(self):
+        if self.is_expanded():
+            return self.expanded_serializer_class
+
+        return super().get_serializer_class()
+
+
+class FastListMixin(SparseFieldsMixin):
+    """
+    Encodes list pages from `values()` rows with `RowEncoder` instead of
+    instantiating models and running the serializer, whenever the serializer
+    in use supports it. Output is identical to the serializer's.
+    """
+    fast_list = True
+
+    def get_values_columns(self, encoder):
+        # Keyset pagination reads the primary key and ordering keys from the rows.
+        key_columns = {self.queryset.model._meta.pk.attname}
+        key_columns.update(ordering.lstrip('-') for ordering in getattr(self, 'keyset_orderings', ()))
+
+        return encoder.columns + sorted(key_columns - set(encoder.columns))
+
+    def get_row_encoder(self):
+        if not self.fast_list:
+            return None
+
+        return RowEncoder.for_serializer(self.get_serializer_class(), self.get_sparse_fields())
+
+    def list(self, request, *args, **kwargs):
+        encoder = self.get_row_encoder()
+        if encoder is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.get_values_columns(encoder))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(encoder.encode_many(page))
+
+        return Response(encoder.encode_many(queryset))
 
-from app.models import Author, Book
-from app.serializers import AuthorSerializer, BookSerializer
 
+class MultiGetMixin:
+    """
+    Serves `?ids=3,17,42` on a list view: the listed objects in the requested
+    order from one `pk__in` query, plus the ids that do not exist. Filters
+    and pagination do not apply; at most `MAX_MULTI_GET_IDS` ids are
+    accepted. Works with `FastListMixin`'s row encoding.
+    """
+    ids_query_param = 'ids'
 
-class AuthorListCreateAPIView(ListCreateAPIView):
+    def get_requested_ids(self):
+        value = self.request.query_params.get(self.ids_query_param)
+        if value is None:
+            return None
+
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in value.split(',') if pk))
+        except ValueError:
+            ids = None
+        if ids is None or not all(1 <= pk <= MAX_DB_INT for pk in ids):
+            raise ValidationError({self.ids_query_param: ['A comma separated list of integers is required.']})
+
+        if not ids:
+            raise ValidationError({self.ids_query_param: ['At least one id is required.']})
+        if len(ids) > settings.MAX_MULTI_GET_IDS:
+            raise ValidationError({
+                self.ids_query_param: [f'Ensure this list has no more than {settings.MAX_MULTI_GET_IDS} ids.']
+            })
+
+        return ids
+
+    def get_objects_by_id(self, ids):
+        queryset = self.get_queryset().filter(pk__in=ids)
+        pk_column = self.queryset.model._meta.pk.attname
+
+        encoder = self.get_row_encoder()
+        if encoder is not None:
+            rows = queryset.values(*dict.fromkeys([*encoder.columns, pk_column]))
+            return {row[pk_column]: encoder.encode(row) for row in rows}
+
+        instances = list(queryset)
+        data = self.get_serializer(instances, many=True).data
+        return {instance.pk: item for instance, item in zip(instances, data)}
+
+    def list(self, request, *args, **kwargs):
+        ids = self.get_requested_ids()
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+
+        found = self.get_objects_by_id(ids)
+        return Response(OrderedDict([
+            ('results', [found[pk] for pk in ids if pk in found]),
+            ('missing', [pk for pk in ids if pk not in found]),
+        ]))
+
+
+class CachedResponseMixin:
+    """
+    Serves GET from `response_cache` with ETag and Last-Modified headers.
+
+    A list depends on `cache_resource`, a detail view on
+    `<cache_resource>:<pk>`, and an expanded response also on the expanded
+    resource. Matching `If-None-Match`/`If-Modified-Since` requests get a
+    304 without any database query.
+    """
+    cache_resource: str
+
+    def get_cache_dependencies(self):
+        pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        dependencies = [self.cache_resource if pk is None else f'{self.cache_resource}:{pk}']
+        if self.is_expanded():
+            dependencies.append(self.expand_resource)
+
+        return dependencies
+
+    def get(self, request, *args, **kwargs):
+        versions = response_cache.get_versions(self.get_cache_dependencies())
+        key = response_cache.make_key(request.build_absolute_uri(), request.META.get('HTTP_ACCEPT', ''), versions)
+        etag = f'"{key}"'
+        last_modified = int(max(versions))
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        # A replica may not have caught up with a recent change yet, and the
+        # response would be cached under the post-change key.
+        if time.time() - max(versions) < settings.REPLICA_STICKY_SECONDS:
+            pin_primary()
+
+        data = response_cache.get(key)
+        if data is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            response_cache.set(key, response.data)
+        else:
+            response = Response(data)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+
+        return response
+
+
+class AuthorExpandMixin(ExpandMixin):
+    expand_field = 'books'
+    expand_resource = 'books'
+    expanded_serializer_class = AuthorWithBooksSerializer
+
+    def expand_queryset(self, queryset):
+        return queryset.prefetch_related('book_set')
+
+
+class BookExpandMixin(ExpandMixin):
+    expand_field = 'author'
+    expand_resource = 'authors'
+    expanded_serializer_class = BookWithAuthorSerializer
+
+    def expand_queryset(self, queryset):
+        return queryset.select_related('author')
+
+
+class AuthorListCreateAPIView(CachedResponseMixin, MultiGetMixin, FastListMixin, AuthorExpandMixin, ListCreateAPIView):
+    cache_resource = 'authors'
     serializer_class = AuthorSerializer
     queryset = Author.objects.all()
+    pagination_class = KeysetPagination
+    keyset_orderings = ('id', 'book_count', '-book_count')
+    filter_backends = [IndexedLookupFilter]
+    lookup_filters = {
+        'surname': ('surname', 'exact'),
+        'surname__startswith': ('surname', 'startswith'),
+        'name': ('name', 'exact'),
+        'name__startswith': ('name', 'startswith'),
+    }
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -19,7 +322,9 @@ class AuthorListCreateAPIView(ListCreateAPIView):
         return [permission() for permission in permission_classes]
 
 
-class AuthorRetrieveUpdateDeleteAPIView(RetrieveUpdateDestroyAPIView):
+class AuthorRetrieveUpdateDeleteAPIView(CachedResponseMixin, SparseFieldsMixin, AuthorExpandMixin,
+                                        RetrieveUpdateDestroyAPIView):
+    cache_resource = 'authors'
     serializer_class = AuthorSerializer
     queryset = Author.objects.all()
 
@@ -32,10 +337,39 @@ class AuthorRetrieveUpdateDeleteAPIView(RetrieveUpdateDestroyAPIView):
 
         return [permission() for permission in permission_classes]
 
+    def destroy(self, request, *args, **kwargs):
+        # `Prefer: respond-async` (RFC 7240) hands the delete to a worker.
+        if 'respond-async' not in request.META.get('HTTP_PREFER', ''):
+            return super().destroy(request, *args, **kwargs)
 
-class BookListCreateAPIView(ListCreateAPIView):
+        job = enqueue('delete_authors', {'ids': [self.get_object().pk]})
+        return job_accepted_response(request, job)
+
+    def perform_destroy(self, instance):
+        # Each batch of books commits on its own, so a prolific author never
+        # holds the write lock for the whole delete.
+        Author.objects.filter(pk=instance.pk).delete_in_batches(settings.DELETE_BATCH_SIZE)
+
+
+def job_accepted_response(request, job):
+    """
+    202 Accepted for a queued job, pointing at its status with `Location`.
+    """
+    url = request.build_absolute_uri(reverse('app:job_detail', args=[job.pk]))
+    return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': url})
+
+
+class BookListCreateAPIView(CachedResponseMixin, MultiGetMixin, FastListMixin, BookExpandMixin, ListCreateAPIView):
+    cache_resource = 'books'
     serializer_class = BookSerializer
     queryset = Book.objects.all()
+    pagination_class = KeysetPagination
+    filter_backends = [IndexedLookupFilter]
+    lookup_filters = {
+        'author': ('author_id', 'int'),
+        'name': ('name', 'exact'),
+        'name__startswith': ('name', 'startswith'),
+    }
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -47,7 +381,9 @@ class BookListCreateAPIView(ListCreateAPIView):
         return [permission() for permission in permission_classes]
 
 
-class BookRetrieveUpdateDeleteAPIView(RetrieveUpdateDestroyAPIView):
+class BookRetrieveUpdateDeleteAPIView(CachedResponseMixin, SparseFieldsMixin, BookExpandMixin,
+                                      RetrieveUpdateDestroyAPIView):
+    cache_resource = 'books'
     queryset = Book.objects.all()
     serializer_class = BookSerializer
 
@@ -60,3 +396,316 @@ class BookRetrieveUpdateDeleteAPIView(RetrieveUpdateDestroyAPIView):
 
         return [permission() for permission in permission_classes]
 
+
+class BulkAPIView(GenericAPIView):
+    """
+    Batch writes for a resource.
+
+    POST takes a list of objects to create, PUT/PATCH a list of objects with
+    their `id`, and DELETE a list of ids. The batch is all-or-nothing: on any
+    invalid item the response is a 400 with a list of errors aligned with the
+    request items (`{}` for the valid ones). Creates and updates run in a
+    single transaction; a valid DELETE is carried out in batches that each
+    commit on their own, as in `delete_in_batches`.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    max_batch_size = settings.MAX_BULK_SIZE
+
+    def get_batch(self):
+        batch = self.request.data
+        if not isinstance(batch, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+
+        if len(batch) > self.max_batch_size:
+            raise ValidationError({'non_field_errors': [f'Ensure this list has at most {self.max_batch_size} items.']})
+
+        return batch
+
+    def get_batch_instances(self, ids):
+        instances = self.get_queryset().in_bulk([pk for pk in ids if type(pk) == int])
+        errors = []
+        seen = set()
+        for pk in ids:
+            if type(pk) != int:
+                errors.append({'id': ['A valid integer is required.']})
+            elif pk not in instances:
+                errors.append({'id': ['Not found.']})
+            elif pk in seen:
+                errors.append({'id': ['Duplicate id.']})
+            else:
+                errors.append({})
+            seen.add(pk)
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        return [instances[pk] for pk in ids]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=self.get_batch(), many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(partial=True)
+
+    def bulk_update(self, partial):
+        batch = self.get_batch()
+        ids = [item.get('id') if isinstance(item, dict) else None for item in batch]
+        with transaction.atomic():
+            self.get_queryset().lock_for_write()
+            instances = self.get_batch_instances(ids)
+            serializer = self.get_serializer(instances, data=batch, many=True, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        return Response(serializer.data)
+
+    def delete(self, request, *args, **kwargs):
+        ids = self.get_batch()
+        self.get_batch_instances(ids)
+        # Not in one transaction: it would hold the write lock, and the cache
+        # touches and events of every deleted row, until the last batch.
+        self.get_queryset().filter(pk__in=ids).delete_in_batches(settings.DELETE_BATCH_SIZE)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AuthorBulkAPIView(BulkAPIView):
+    serializer_class = AuthorSerializer
+    queryset = Author.objects.all()
+
+
+class BookBulkAPIView(BulkAPIView):
+    serializer_class = BookSerializer
+    queryset = Book.objects.all()
+
+
+class CatalogExportAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+        'json': 'application/json',
+    }
+
+    def get(self, request, resource, export_format):
+        if resource not in EXPORT_COLUMNS or export_format not in EXPORT_FORMATS:
+            raise Http404
+
+        response = StreamingHttpResponse(iter_export(resource, export_format, settings.EXPORT_CHUNK_SIZE),
+                                         content_type=self.content_types[export_format])
+        response['Content-Disposition'] = f'attachment; filename="{resource}.{export_format}"'
+
+        return response
+
+
+class SearchUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Full-text search is not available on this database backend.'
+    default_code = 'search_unavailable'
+
+
+class IntParamMixin:
+    def get_int_param(self, name, default):
+        value = self.request.query_params.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({name: ['A valid integer is required.']})
+
+        if value < 0:
+            raise ValidationError({name: ['Ensure this value is greater than or equal to 0.']})
+
+        return value
+
+
+class SearchAPIView(IntParamMixin, APIView):
+    """
+    Ranked full-text search over authors and books.
+
+    `q` is matched word by word as prefixes, `type` optionally restricts
+    results to `authors` or `books`, and `limit`/`offset` page through hits.
+    """
+    permission_classes = [AllowAny]
+    serializer_classes = {
+        'authors': AuthorSerializer,
+        'books': BookSerializer,
+    }
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This field is required.']})
+
+        search_index = get_search_index()
+        if not search_index.is_available():
+            raise SearchUnavailable
+
+        kinds = request.query_params.get('type')
+        kinds = kinds.split(',') if kinds else None
+        limit = min(self.get_int_param('limit', settings.PAGE_SIZE), settings.MAX_PAGE_SIZE) or 1
+        offset = min(self.get_int_param('offset', 0), settings.MAX_SEARCH_OFFSET)
+
+        hits = search_index.search(query, kinds=kinds, limit=limit + 1, offset=offset)
+        results = [
+            {'type': kind, 'object': self.serializer_classes[kind](instance).data}
+            for kind, instance in load_search_results(hits[:limit])
+        ]
+
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'offset', offset + limit) if len(hits) > limit else None,
+            'previous': replace_query_param(url, 'offset', max(offset - limit, 0)) if offset else None,
+            'results': results,
+        })
+
+
+class StatsAPIView(APIView):
+    """
+    Catalog totals and the most prolific authors, read from the maintained
+    counters rather than aggregated over the book table.
+    """
+    permission_classes = [AllowAny]
+    top_authors_count = 10
+
+    def get(self, request):
+        counters = CatalogCounter.objects.values_dict()
+        authors, books = counters.get('authors', 0), counters.get('books', 0)
+        top_authors = Author.objects.order_by('-book_count', '-id')[:self.top_authors_count]
+
+        return Response({
+            'authors': authors,
+            'books': books,
+            'books_per_author': round(books / authors, 2) if authors else 0,
+            'top_authors': AuthorSerializer(top_authors, many=True).data,
+        })
+
+
+class MetricsAPIView(APIView):
+    """
+    Request metrics of this process in the Prometheus text format.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(request_metrics.render())
+
+
+class ChangeFeedExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Changes before this cursor have been pruned, sync again without changed_since.'
+    default_code = 'change_feed_expired'
+
+
+class ChangeFeedAPIView(IntParamMixin, APIView):
+    """
+    Authors and books created, updated or deleted after `changed_since`.
+
+    Start without a cursor, apply the `changes`, and pass the returned
+    `cursor` as `changed_since` on the next call; `has_more` tells whether
+    to call again right away.
+    """
+    permission_classes = [AllowAny]
+    cursor_query_param = 'changed_since'
+
+    def get_key(self):
+        cursor = self.request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            change_seq = decode_cursor(cursor)
+        except InvalidCursor:
+            raise ValidationError({self.cursor_query_param: ['Invalid cursor.']})
+
+        if change_seq < TombstoneHorizon.objects.get_horizon():
+            raise ChangeFeedExpired
+
+        return change_seq
+
+    def get(self, request):
+        change_seq = self.get_key()
+        limit = min(self.get_int_param('limit', settings.PAGE_SIZE), settings.MAX_PAGE_SIZE) or 1
+
+        changes, last_seq, has_more = ChangeFeed().read(change_seq, limit)
+        cursor = encode_cursor(last_seq) if last_seq is not None else None
+        url = request.build_absolute_uri()
+
+        return Response(OrderedDict([
+            ('cursor', cursor),
+            ('has_more', has_more),
+            ('next', replace_query_param(url, self.cursor_query_param, cursor) if has_more else None),
+            ('changes', changes),
+        ]))
+
+
+class EventStreamAPIView(APIView):
+    """
+    Server-sent events for authors and books as they are created, updated
+    and deleted.
+
+    Each event carries an `id`; EventSource clients send the last one back
+    as `Last-Event-ID` when they reconnect and are replayed what they
+    missed. A `reset` event means the missed events are gone and the
+    client has to catch up through the change feed.
+
+    Events are only published by the web process that made the change:
+    writes by background jobs and management commands are not broadcast,
+    and only show up in the change feed.
+    """
+    permission_classes = [AllowAny]
+    renderer_classes = [EventStreamRenderer]
+    last_event_id_query_param = 'last_event_id'
+
+    def get(self, request):
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or \
+            request.query_params.get(self.last_event_id_query_param)
+
+        return EventStreamResponse(event_hub, last_event_id)
+
+
+class JobCreateAPIView(CreateAPIView):
+    """
+    Queue a background job; poll the URL in `Location` for its progress.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    serializer_class = JobSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+
+        return job_accepted_response(request, job)
+
+
+class JobRetrieveAPIView(RetrieveAPIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    serializer_class = JobSerializer
+    queryset = Job.objects.all()
+
+
+class JobOutputAPIView(GenericAPIView):
+    """
+    The file written by a succeeded job, such as a catalog export.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    queryset = Job.objects.filter(status=Job.SUCCEEDED)
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        file_name = job.result.get('file') if isinstance(job.result, dict) else None
+        if not file_name or not os.path.isfile(os.path.join(settings.JOB_OUTPUT_DIR, file_name)):
+            raise Http404
+
+        path = os.path.join(settings.JOB_OUTPUT_DIR, file_name)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=file_name)
@@ -0,0 +1,7 @@
+"""
+Standalone micro-benchmarks. Run from the project directory, e.g.
+
+    python -m benchmarks.bulk_write
+
+Each benchmark runs against a throwaway test database.
+"""
@@ -0,0 +1,128 @@
+"""
+Load test the read path under WSGI and ASGI with slow clients.
+
+A WSGI worker is busy until the client has received the whole response,
+so `--wsgi-workers` sync workers serve at most that many slow clients at a
+time and the rest wait for a free worker; `--buffering-proxy` frees the
+worker as soon as the response is built instead, as a proxy that buffers
+responses would. Under ASGI the event loop keeps sending to slow clients
+while the bounded read pool of `--read-threads` threads serves the next
+requests. Both sides get as many workers as read threads unless told
+otherwise.
+
+Both applications are driven in-process with `--concurrency` clients that
+take `--client-delay` seconds to drain each response. Latency is measured
+from the moment a client is connected until it has received the whole
+response.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.base import test_database, percentile
+
+
+def print_report(name, latencies, elapsed):
+    print(f'{name:<8} {len(latencies) / elapsed:>8.0f} req/s   '
+          f'p50 {percentile(latencies, 50) * 1000:>7.1f} ms   p99 {percentile(latencies, 99) * 1000:>7.1f} ms')
+
+
+def make_path(i, bypass_cache):
+    return '/api/v1/books', f'page_size=50&_={i}' if bypass_cache else 'page_size=50'
+
+
+def run_wsgi(args):
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+
+    workers = threading.Semaphore(args.wsgi_workers)
+
+    def request(i):
+        path, query_string = make_path(i, args.no_cache)
+        environ = {'PATH_INFO': path, 'QUERY_STRING': query_string, 'REQUEST_METHOD': 'GET'}
+        setup_testing_defaults(environ)
+        started = time.perf_counter()
+        with workers:
+            for _ in application(environ, lambda status, headers: None):
+                pass
+            if not args.buffering_proxy:
+                time.sleep(args.client_delay)
+        if args.buffering_proxy:
+            time.sleep(args.client_delay)
+
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as clients:
+        latencies = list(clients.map(request, range(args.requests)))
+
+    print_report('WSGI', latencies, time.perf_counter() - started)
+
+
+def run_asgi(args):
+    from app.handlers import CatalogASGIHandler
+    application = CatalogASGIHandler(read_threads=args.read_threads)
+
+    async def request(i, semaphore):
+        path, query_string = make_path(i, args.no_cache)
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string.encode(),
+                 'headers': [(b'host', b'testserver')]}
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and not message.get('more_body'):
+                await asyncio.sleep(args.client_delay)
+
+        async with semaphore:
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            return time.perf_counter() - started
+
+    async def main():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        return await asyncio.gather(*(request(i, semaphore) for i in range(args.requests)))
+
+    started = time.perf_counter()
+    latencies = asyncio.run(main())
+    print_report('ASGI', latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--books', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--client-delay', type=float, default=0.05)
+    parser.add_argument('--read-threads', type=int, default=16)
+    parser.add_argument('--wsgi-workers', type=int, help='Sync WSGI workers, as many as --read-threads by default.')
+    parser.add_argument('--buffering-proxy', action='store_true',
+                        help='Free a WSGI worker before its client has drained the response.')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the response cache.')
+    args = parser.parse_args()
+    if args.wsgi_workers is None:
+        args.wsgi_workers = args.read_threads
+
+    from app.models import Author, Book
+
+    with test_database():
+        authors = Author.objects.bulk_create([Author(name=f'name{i}', surname=f'surname{i}') for i in range(100)])
+        Book.objects.bulk_create([Book(author=authors[i % 100], name=f'book{i}') for i in range(args.books)])
+
+        print(f'{args.requests} requests from {args.concurrency} clients draining each response in '
+              f'{args.client_delay * 1000:.0f} ms, response cache {"bypassed" if args.no_cache else "used"}')
+        print(f'WSGI: {args.wsgi_workers} sync workers, each held until its client has drained the response'
+              if not args.buffering_proxy else
+              f'WSGI: {args.wsgi_workers} sync workers behind a buffering proxy')
+        print(f'ASGI: {args.read_threads} read threads, responses drained by the event loop')
+
+        run_wsgi(args)
+        run_asgi(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'library_api.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+
+@contextmanager
+def test_database():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """
+    Return the best wall time in seconds of `repeat` calls.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+
+    return best
+
+
+def percentile(latencies, q):
+    return statistics.quantiles(latencies, n=100)[q - 1] if len(latencies) > 1 else latencies[0]
+
+
+def report(name, rows, seconds):
+    print(f'{name:<40} {rows:>8} rows {seconds * 1000:>10.1f} ms {rows / seconds:>12.0f} rows/s')
+
+
+def staff_client():
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+    from app.tests.factories import UserFactory
+
+    token = Token.objects.create(user=UserFactory(is_staff=True))
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    return client
@@ -0,0 +1,45 @@
+"""
+Compare creating authors and books one POST at a time with a single bulk
+POST per resource.
+"""
+import argparse
+
+from benchmarks.base import test_database, timed, report, staff_client
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--authors', type=int, default=100, help='Authors the books are spread over.')
+    args = parser.parse_args()
+
+    from django.urls import reverse
+    from app.models import Author, Book
+
+    with test_database():
+        client = staff_client()
+        data = [{'name': f'name{i}', 'surname': f'surname{i}'} for i in range(args.rows)]
+
+        def single(url_name, items):
+            for item in items:
+                client.post(reverse(url_name), item, format='json')
+
+        def bulk(url_name, items):
+            client.post(reverse(url_name), items, format='json')
+
+        report('POST authors (one per request)', args.rows, timed(single, 'app:author_list_create', data))
+        Author.objects.all().delete()
+        report('POST authors/bulk', args.rows, timed(bulk, 'app:author_bulk', data))
+
+        # Books reference many distinct authors, so the bulk POST also shows
+        # the cost of resolving them.
+        author_ids = list(Author.objects.values_list('pk', flat=True)[:args.authors])
+        books = [{'author': author_ids[i % len(author_ids)], 'name': f'book{i}'} for i in range(args.rows)]
+
+        report('POST books (one per request)', args.rows, timed(single, 'app:book_list_create', books))
+        Book.objects.all().delete()
+        report('POST books/bulk', args.rows, timed(bulk, 'app:book_bulk', books))
+
+
+if __name__ == '__main__':
+    main()
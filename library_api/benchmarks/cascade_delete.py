@@ -0,0 +1,45 @@
+"""
+Compare deleting an author with many books through Django's collector with
+the batched delete behind DELETE authors/<pk>, in time and peak memory.
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.base import test_database, timed, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--books', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    from app.models import Author, CatalogCounter
+    from app.tests.factories import AuthorFactory, BookFactory
+
+    def seed():
+        author = AuthorFactory()
+        BookFactory.bulk_create(args.books, author=author)
+        # The factories skip the signals that keep these up to date.
+        authors = Author.objects.filter(pk=author.pk)
+        authors.refresh_book_counts()
+        CatalogCounter.objects.increment('authors')
+        CatalogCounter.objects.increment('books', args.books)
+        return authors
+
+    def measure(name, delete):
+        authors = seed()
+        tracemalloc.start()
+        seconds = timed(delete, authors)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report(name, args.books, seconds)
+        print(f'{"":<40} peak memory {peak / 1024 / 1024:.1f} MB')
+
+    with test_database():
+        measure('delete() through the collector', lambda authors: authors.delete())
+        measure('delete_in_batches()', lambda authors: authors.delete_in_batches(args.batch_size))
+
+
+if __name__ == '__main__':
+    main()
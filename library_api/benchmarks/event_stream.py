@@ -0,0 +1,108 @@
+"""
+Fan events out to many concurrent event stream subscribers.
+
+`--subscribers` in-process ASGI connections are opened on
+CatalogASGIHandler, then `--events` events are published from another
+thread, and the time until every subscriber has received each event is
+reported. `--slow` of the subscribers never finish a send, to show that a
+stalled client is dropped without delaying the others.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from benchmarks.base import percentile
+
+
+class Subscriber:
+    def __init__(self, handler, slow=False):
+        self.handler = handler
+        self.slow = slow
+        self.received = {}
+        self.disconnected = asyncio.Event()
+        self.request_sent = False
+
+    async def receive(self):
+        if not self.request_sent:
+            self.request_sent = True
+            return {'type': 'http.request', 'body': b''}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if self.slow and message.get('body', b'').startswith(b'id: '):
+            await self.disconnected.wait()
+        now = time.perf_counter()
+        for line in message.get('body', b'').split(b'\n'):
+            if line.startswith(b'id: '):
+                self.received[line[4:].decode()] = now
+
+    def run(self):
+        scope = {'type': 'http', 'method': 'GET', 'path': '/api/v1/events', 'query_string': b'',
+                 'headers': [(b'host', b'localhost')]}
+        return asyncio.ensure_future(self.handler(scope, self.receive, self.send))
+
+
+async def run(args):
+    from app.events import event_hub
+    from app.handlers import CatalogASGIHandler
+
+    handler = CatalogASGIHandler()
+    subscribers = [Subscriber(handler, slow=i < args.slow) for i in range(args.subscribers)]
+    started = time.perf_counter()
+    tasks = [subscriber.run() for subscriber in subscribers]
+    while len(event_hub.subscriptions) < args.subscribers:
+        await asyncio.sleep(0.01)
+    print(f'connected {args.subscribers} subscribers in {time.perf_counter() - started:.2f}s')
+
+    published = {}
+
+    def publish():
+        for pk in range(args.events):
+            published[event_hub.publish('update', {'resource': 'books', 'id': pk}).id] = time.perf_counter()
+            time.sleep(args.interval)
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    await asyncio.get_running_loop().run_in_executor(None, publisher.join)
+    # Readers that could not keep up are dropped as well.
+    fast = [subscriber for subscriber in subscribers if not subscriber.slow]
+    while any(len(subscriber.received) < args.events and not task.done()
+              for subscriber, task in zip(subscribers, tasks) if not subscriber.slow):
+        await asyncio.sleep(0.01)
+    dropped = [subscriber for subscriber in fast if len(subscriber.received) < args.events]
+    fast = [subscriber for subscriber in fast if subscriber not in dropped]
+
+    latencies = [
+        max(subscriber.received[event_id] for subscriber in fast) - published_at
+        for event_id, published_at in published.items()
+    ]
+    print(f'fan-out to {len(fast)} subscribers: p50 {percentile(latencies, 50) * 1000:.1f} ms, '
+          f'p99 {percentile(latencies, 99) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms')
+    stalled = sum(task.done() for subscriber, task in zip(subscribers, tasks) if subscriber.slow)
+    print(f'dropped: {len(dropped)} of {len(fast) + len(dropped)} readers, {stalled} of {args.slow} stalled')
+
+    for subscriber in subscribers:
+        subscriber.disconnected.set()
+    await asyncio.gather(*tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=0.005, help='seconds between published events')
+    parser.add_argument('--slow', type=int, default=10)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    settings.EVENT_STREAM_MAX_PENDING = min(settings.EVENT_STREAM_MAX_PENDING, args.events // 2)
+    from app.events import event_hub
+    event_hub.max_pending = settings.EVENT_STREAM_MAX_PENDING
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
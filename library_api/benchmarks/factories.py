@@ -0,0 +1,29 @@
+"""
+Compare seeding books through the factories row by row and in bulk.
+"""
+import argparse
+
+from benchmarks.base import test_database, timed, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--row-by-row', type=int, default=1000, help='rows for the row-by-row baseline')
+    args = parser.parse_args()
+
+    from app.models import Author, Book
+    from app.tests.factories import BookFactory
+
+    def reset():
+        Book.objects.all().delete()
+        Author.objects.all().delete()
+
+    with test_database():
+        report('BookFactory.create_batch', args.row_by_row, timed(BookFactory.create_batch, args.row_by_row))
+        reset()
+        report('BookFactory.bulk_create', args.rows, timed(BookFactory.bulk_create, args.rows))
+
+
+if __name__ == '__main__':
+    main()
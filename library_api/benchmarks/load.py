@@ -0,0 +1,347 @@
+"""
+Load test every catalog route against a locally started server.
+
+The catalog is seeded into a fresh SQLite file with `--authors` authors and
+`--books` books through the bulk factories, then `--server-command` is started
+on it (Django's threaded `runserver` by default; any WSGI/ASGI server works,
+e.g. `uvicorn library_api.asgi:application --port {port}`). Each scenario
+is driven by `--clients` concurrent clients, and throughput and
+latency percentiles are printed and written as JSON to `--output`. Pass a
+previous report as `--baseline` to print the relative change per scenario.
+
+The DELETE scenarios remove spare authors and books seeded for them alone.
+The `events` scenario times connecting to the event stream until the first
+event has arrived: it resumes from an unknown event id, so the first event
+is the `reset` that any handler sends right away. Jobs are queued but not
+run, as no `run_workers` is started.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+os.environ.update({
+    'DATABASE_ENGINE': 'sqlite3',
+    'DATABASE_NAME': os.path.join(tempfile.mkdtemp(prefix='library-api-benchmark-'), 'db.sqlite3'),
+    'DATABASE_REPLICAS': '',
+    'DEBUG': '0',
+})
+
+from benchmarks.base import percentile  # noqa: E402
+
+WORDS = ('war', 'peace', 'anna', 'karenina', 'idiot', 'demons', 'seagull', 'mother', 'dead', 'souls')
+
+
+class Scenario:
+    def __init__(self, name, method, make_path, make_body=None, staff=False, weight=1.0, first_event=False):
+        self.name = name
+        self.method = method
+        self.make_path = make_path
+        self.make_body = make_body
+        self.staff = staff
+        self.weight = weight
+        self.first_event = first_event
+
+
+def get_scenarios(ids):
+    author_ids, book_ids = ids['authors'], ids['books']
+
+    def author_body(i):
+        return {'name': f'Name {i}', 'surname': f'Surname {i}'}
+
+    def book_body(i):
+        return {'author': random.choice(author_ids), 'name': f'{random.choice(WORDS)} {i}'}
+
+    return [
+        Scenario('authors.list', 'GET', lambda i: '/api/v1/authors'),
+        Scenario('authors.list.expand', 'GET', lambda i: '/api/v1/authors?expand=books'),
+        Scenario('authors.list.by_book_count', 'GET', lambda i: '/api/v1/authors?ordering=-book_count'),
+        Scenario('authors.list.filter', 'GET', lambda i: f'/api/v1/authors?surname__startswith=Surname%20{i % 10}'),
+        Scenario('authors.detail', 'GET', lambda i: f'/api/v1/authors/{random.choice(author_ids)}'),
+        Scenario('authors.detail.expand', 'GET', lambda i: f'/api/v1/authors/{random.choice(author_ids)}?expand=books'),
+        Scenario('books.list', 'GET', lambda i: '/api/v1/books'),
+        Scenario('books.list.expand', 'GET', lambda i: '/api/v1/books?expand=author'),
+        Scenario('books.list.filter', 'GET', lambda i: f'/api/v1/books?author={random.choice(author_ids)}'),
+        Scenario('books.multi_get', 'GET', lambda i: '/api/v1/books?ids=' + ','.join(
+            str(pk) for pk in random.sample(book_ids, min(len(book_ids), 50))
+        )),
+        Scenario('books.detail', 'GET', lambda i: f'/api/v1/books/{random.choice(book_ids)}'),
+        Scenario('books.detail.expand', 'GET', lambda i: f'/api/v1/books/{random.choice(book_ids)}?expand=author'),
+        Scenario('search', 'GET', lambda i: f'/api/v1/search?q={random.choice(WORDS)}'),
+        Scenario('stats', 'GET', lambda i: '/api/v1/stats'),
+        Scenario('changes', 'GET', lambda i: '/api/v1/changes'),
+        Scenario('metrics', 'GET', lambda i: '/metrics'),
+        Scenario('export.books.ndjson', 'GET', lambda i: '/api/v1/export/books.ndjson', staff=True, weight=0.02),
+        Scenario('authors.create', 'POST', lambda i: '/api/v1/authors', author_body, staff=True, weight=0.2),
+        Scenario('books.create', 'POST', lambda i: '/api/v1/books', book_body, staff=True, weight=0.2),
+        Scenario('books.update', 'PATCH', lambda i: f'/api/v1/books/{random.choice(book_ids)}', book_body,
+                 staff=True, weight=0.2),
+        Scenario('authors.replace', 'PUT', lambda i: f'/api/v1/authors/{random.choice(author_ids)}', author_body,
+                 staff=True, weight=0.2),
+        Scenario('books.replace', 'PUT', lambda i: f'/api/v1/books/{random.choice(book_ids)}', book_body,
+                 staff=True, weight=0.2),
+        # Request i deletes spare row i, so no row is deleted twice.
+        Scenario('authors.delete', 'DELETE', lambda i: f'/api/v1/authors/{ids["spare_authors"][i]}',
+                 staff=True, weight=0.2),
+        Scenario('books.delete', 'DELETE', lambda i: f'/api/v1/books/{ids["spare_books"][i]}',
+                 staff=True, weight=0.2),
+        Scenario('authors.bulk', 'POST', lambda i: '/api/v1/authors/bulk',
+                 lambda i: [author_body(f'{i}.{j}') for j in range(100)], staff=True, weight=0.05),
+        Scenario('books.bulk', 'POST', lambda i: '/api/v1/books/bulk',
+                 lambda i: [book_body(f'{i}.{j}') for j in range(100)], staff=True, weight=0.05),
+        Scenario('events', 'GET', lambda i: '/api/v1/events?last_event_id=unknown', first_event=True, weight=0.2),
+        Scenario('jobs.create', 'POST', lambda i: '/api/v1/jobs', lambda i: {'kind': 'repair_book_counts'},
+                 staff=True, weight=0.2),
+        Scenario('jobs.detail', 'GET', lambda i: f'/api/v1/jobs/{random.choice(ids["jobs"])}', staff=True),
+    ]
+
+
+def seed(authors, books, spare):
+    import factory
+    from django.core.management import call_command
+    from django.db import connections
+    from rest_framework.authtoken.models import Token
+    from app.jobs import enqueue
+    from app.models import Author, CatalogCounter
+    from app.tests.factories import AuthorFactory, BookFactory, UserFactory
+
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    author_objs = AuthorFactory.bulk_create(authors, surname=factory.Sequence(lambda n: f'Surname {n}'))
+    book_objs = BookFactory.bulk_create(books, authors=author_objs, name=factory.Sequence(
+        lambda n: f'{WORDS[n % len(WORDS)]} {n}'
+    ))
+    # Rows for the DELETE scenarios, each spare author with one book.
+    spare_authors = AuthorFactory.bulk_create(spare)
+    BookFactory.bulk_create(spare, authors=spare_authors)
+    spare_books = BookFactory.bulk_create(spare, authors=author_objs)
+    # The factories skip the signals that keep these up to date. The server
+    # starts with an empty cache, so unlike repair_book_counts this needs no
+    # shared one.
+    Author.objects.all().refresh_book_counts()
+    CatalogCounter.objects.increment('authors', authors + spare)
+    CatalogCounter.objects.increment('books', books + 2 * spare)
+    call_command('rebuild_search_index', stdout=io.StringIO())
+    print(f'seeded {authors} authors and {books} books in {time.perf_counter() - started:.1f}s')
+
+    token = Token.objects.create(user=UserFactory(is_staff=True)).key
+    ids = {
+        'authors': [author.pk for author in author_objs],
+        'books': [book.pk for book in book_objs],
+        'spare_authors': [author.pk for author in spare_authors],
+        'spare_books': [book.pk for book in spare_books],
+        'jobs': [enqueue('repair_book_counts').pk for _ in range(10)],
+    }
+    connections.close_all()
+
+    return token, ids
+
+
+def start_server(command, port, timeout=30):
+    server = subprocess.Popen(shlex.split(command.format(port=port)), stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f'server exited with {server.returncode}: {command}')
+        try:
+            connection = HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/v1/stats')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.terminate()
+    raise SystemExit(f'server did not answer on port {port} within {timeout}s')
+
+
+class LoadClient(threading.local):
+    """
+    Per-thread HTTP client. Without `keep_alive` every request uses a new
+    connection: runserver answers keep-alive requests with the headers and
+    body in separate writes, which stalls on delayed ACKs (~40 ms each).
+    """
+
+    def __init__(self, port, keep_alive):
+        self.port = port
+        self.keep_alive = keep_alive
+        self.connection = None
+
+    def request(self, method, path, body, headers, first_event=False):
+        if self.connection is None:
+            self.connection = HTTPConnection('127.0.0.1', self.port, timeout=60)
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            if first_event:
+                read_first_event(response)
+                # The stream may still be open.
+                self.close()
+            else:
+                response.read()
+            return response.status
+        except OSError:
+            self.close()
+            raise
+        finally:
+            if not self.keep_alive:
+                self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def read_first_event(response):
+    """
+    Read a `text/event-stream` response up to the end of its first event.
+    """
+    in_event = False
+    for line in iter(response.readline, b''):
+        if line.startswith(b'event:'):
+            in_event = True
+        elif line == b'\n' and in_event:
+            return
+
+
+def run_scenario(scenario, requests, clients, port, token, bypass_cache, keep_alive):
+    client = LoadClient(port, keep_alive)
+    headers = {'Content-Type': 'application/json'}
+    if scenario.staff:
+        headers['Authorization'] = f'Token {token}'
+
+    def send(i):
+        path = scenario.make_path(i)
+        if bypass_cache and scenario.method == 'GET':
+            path += f'{"&" if "?" in path else "?"}_={i}'
+        body = json.dumps(scenario.make_body(i)) if scenario.make_body else None
+
+        started = time.perf_counter()
+        try:
+            ok = client.request(scenario.method, path, body, headers, scenario.first_event) < 400
+        except OSError:
+            ok = False
+
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        results = list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    return {
+        'method': scenario.method,
+        'requests': requests,
+        'errors': sum(not ok for _, ok in results),
+        'throughput_rps': round(requests / elapsed, 1),
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies) * 1000, 2),
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p90': round(percentile(latencies, 90) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(max(latencies) * 1000, 2),
+        },
+    }
+
+
+def get_git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def change(new, old):
+    return f'{(new - old) / old * 100:+6.1f}%' if old else '    n/a'
+
+
+def print_results(results, baseline):
+    print(f'{"scenario":<28} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8} {"errors":>6}')
+    for name, result in results.items():
+        latency = result['latency_ms']
+        line = (f'{name:<28} {result["throughput_rps"]:>8.0f} {latency["p50"]:>8.1f} {latency["p99"]:>8.1f} '
+                f'{result["errors"]:>6}')
+        old = baseline.get(name)
+        if old:
+            line += (f'   req/s {change(result["throughput_rps"], old["throughput_rps"])}'
+                     f'   p99 {change(latency["p99"], old["latency_ms"]["p99"])}')
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--authors', type=int, default=1000)
+    parser.add_argument('--books', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario (times its weight)')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--scenario', action='append', help='only run scenarios starting with this prefix')
+    parser.add_argument('--keep-alive', action='store_true', help='reuse connections (not with runserver)')
+    parser.add_argument('--bypass-cache', action='store_true', help='make every GET miss the response cache')
+    parser.add_argument('--server-command', default=f'{sys.executable} manage.py runserver --noreload 127.0.0.1:{{port}}')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', default='benchmark-report.json')
+    parser.add_argument('--baseline', help='previous report to compare against')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # Enough spare rows for every request of a DELETE scenario.
+    token, ids = seed(args.authors, args.books, spare=args.requests)
+    scenarios = [
+        scenario for scenario in get_scenarios(ids)
+        if not args.scenario or scenario.name.startswith(tuple(args.scenario))
+    ]
+
+    server = start_server(args.server_command, args.port)
+    try:
+        results = {}
+        for scenario in scenarios:
+            requests = max(int(args.requests * scenario.weight), 1)
+            results[scenario.name] = run_scenario(scenario, requests, args.clients, args.port, token,
+                                                  args.bypass_cache, args.keep_alive)
+    finally:
+        server.terminate()
+        server.wait()
+
+    import django
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_commit': get_git_commit(),
+            'python': sys.version.split()[0],
+            'django': django.get_version(),
+            'server_command': args.server_command,
+            'authors': args.authors,
+            'books': args.books,
+            'clients': args.clients,
+            'requests': args.requests,
+            'bypass_cache': args.bypass_cache,
+            'keep_alive': args.keep_alive,
+        },
+        'scenarios': results,
+    }
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['scenarios']
+    print_results(results, baseline)
+    print(f'report written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
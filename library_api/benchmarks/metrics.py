@@ -0,0 +1,34 @@
+"""
+Measure the per-request overhead of MetricsMiddleware on a cached detail GET.
+"""
+import argparse
+
+from benchmarks.base import test_database, timed, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    from django.test import Client
+    from app.tests.factories import BookFactory
+
+    with test_database():
+        url = f'/api/v1/books/{BookFactory().pk}'
+        client = Client()
+
+        def run():
+            for _ in range(args.requests):
+                client.get(url)
+
+        for enabled in (False, True):
+            settings.METRICS_ENABLED = enabled
+            run()
+            report(f'metrics {"on" if enabled else "off"}', args.requests, timed(run, repeat=args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Compare JSONRenderer and FastJSONRenderer on author and book list payloads.
+"""
+import argparse
+
+from benchmarks.base import test_database, timed, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from rest_framework.renderers import JSONRenderer
+    from app.models import Author, Book
+    from app.renderers import FastJSONRenderer, orjson
+    from app.serializers import AuthorSerializer, BookSerializer
+
+    print(f'orjson: {"available" if orjson else "not installed, stdlib fallback"}')
+    with test_database():
+        authors = Author.objects.bulk_create(
+            [Author(name=f'name{i}', surname=f'surname{i}') for i in range(args.rows)]
+        )
+        Book.objects.bulk_create([Book(author=authors[i], name=f'Книга {i}') for i in range(args.rows)])
+        payloads = {
+            'authors': {'next': None, 'previous': None, 'results': AuthorSerializer(authors, many=True).data},
+            'books': {'next': None, 'previous': None, 'results': BookSerializer(Book.objects.all(), many=True).data},
+        }
+
+        for name, payload in payloads.items():
+            for renderer in (JSONRenderer(), FastJSONRenderer()):
+                report(f'{type(renderer).__name__} {name}', args.rows,
+                       timed(renderer.render, payload, repeat=args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare the FTS5 search index with a naive `icontains` scan.
+"""
+import argparse
+import random
+import string
+
+from benchmarks.base import test_database, timed, report
+
+
+def random_word(rng):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--books', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from django.db.models import Q
+    from app.models import Author, Book
+    from app.search import get_search_index, load_search_results
+
+    rng = random.Random(0)
+    with test_database():
+        authors = Author.objects.bulk_create(
+            [Author(name=random_word(rng), surname=random_word(rng)) for _ in range(args.books // 10)]
+        )
+        Book.objects.bulk_create(
+            [Book(author=rng.choice(authors), name=' '.join(random_word(rng) for _ in range(3)))
+             for _ in range(args.books)],
+            batch_size=5000
+        )
+        term = Book.objects.order_by('?').first().name.split()[0]
+
+        def naive():
+            return list(Book.objects.filter(
+                Q(name__icontains=term) | Q(author__name__icontains=term) | Q(author__surname__icontains=term)
+            )[:20])
+
+        def fts():
+            return load_search_results(get_search_index().search(term, kinds=['books'], limit=20))
+
+        report(f'icontains "{term}"', args.books, timed(naive, repeat=args.repeat))
+        report(f'fts5 "{term}"', args.books, timed(fts, repeat=args.repeat))
+
+
+if __name__ == '__main__':
+    main()
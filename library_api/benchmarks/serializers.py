@@ -0,0 +1,36 @@
+"""
+Compare BookSerializer(many=True) on model instances with RowEncoder on
+values() rows, database fetch included.
+"""
+import argparse
+
+from benchmarks.base import test_database, timed, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from app.models import Author, Book
+    from app.serializers import BookSerializer, RowEncoder
+
+    with test_database():
+        authors = Author.objects.bulk_create([Author(name=f'name{i}', surname=f'surname{i}') for i in range(100)])
+        Book.objects.bulk_create([Book(author=authors[i % 100], name=f'book{i}') for i in range(args.rows)])
+        encoder = RowEncoder.for_serializer(BookSerializer)
+
+        def serializer():
+            return BookSerializer(Book.objects.order_by('pk'), many=True).data
+
+        def row_encoder():
+            return encoder.encode_many(Book.objects.order_by('pk').values(*encoder.columns))
+
+        assert serializer() == row_encoder()
+        report('BookSerializer(many=True)', args.rows, timed(serializer, repeat=args.repeat))
+        report('RowEncoder', args.rows, timed(row_encoder, repeat=args.repeat))
+
+
+if __name__ == '__main__':
+    main()
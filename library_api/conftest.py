@@ -1,6 +1,9 @@
 import pytest
+from django.core.cache import caches
 from rest_framework.authtoken.models import Token
 
+from app.authentication import token_cache
+from app.events import event_hub
 from app.tests.factories import UserFactory
 
 
@@ -18,3 +21,31 @@ def staff_user_token():
     token, _ = Token.objects.get_or_create(user=user)
 
     return token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    caches['default'].clear()
+    yield
+    caches['default'].clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': str(tmp_path / 'cache')},
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_event_hub():
+    event_hub.clear()
+    yield
+    event_hub.clear()
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'library_api.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+from django.conf import settings  # noqa: E402
+from app.handlers import CatalogASGIHandler  # noqa: E402
+
+application = CatalogASGIHandler(read_threads=settings.ASGI_READ_THREADS,
+                                 write_threads=settings.ASGI_WRITE_THREADS,
+                                 heartbeat_seconds=settings.EVENT_STREAM_HEARTBEAT_SECONDS)
@@ -48,7 +48,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'app.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,14 +79,86 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'library_api.wsgi.application'
 
+ASGI_READ_THREADS = int(os.environ.get('ASGI_READ_THREADS', '16'))
+ASGI_WRITE_THREADS = int(os.environ.get('ASGI_WRITE_THREADS', '1'))
+
 
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
-DATABASES = {
+# Persistent connections: with CONN_MAX_AGE each request thread (see
+# ASGI_READ_THREADS / ASGI_WRITE_THREADS) keeps its connection open, which
+# acts as a connection pool sized to the thread pools.
+CONN_MAX_AGE = int(os.environ.get('CONN_MAX_AGE', '60'))
+
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite3')
+
+if DATABASE_ENGINE == 'postgresql':
+    # Requires psycopg2. Set DATABASE_POOLER=1 when connecting through a
+    # transaction-mode pooler such as PgBouncer, which cannot keep
+    # server-side cursors open across transactions.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DATABASE_NAME', 'library_api'),
+            'USER': os.environ.get('DATABASE_USER', 'library_api'),
+            'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+            'HOST': os.environ.get('DATABASE_HOST', 'localhost'),
+            'PORT': os.environ.get('DATABASE_PORT', '5432'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'DISABLE_SERVER_SIDE_CURSORS': bool(int(os.environ.get('DATABASE_POOLER', '0'))),
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DATABASE_CONNECT_TIMEOUT', '5')),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DATABASE_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'OPTIONS': {
+                # Seconds a connection waits on a lock before "database is locked".
+                'timeout': float(os.environ.get('SQLITE_BUSY_TIMEOUT', '20')),
+            },
+        }
+    }
+
+# Read replicas: comma-separated SQLite files (copies of the primary) or
+# PostgreSQL hosts, registered as `replica_<n>` and used by app.routers.
+READ_REPLICAS = []
+for index, replica in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(','))):
+    alias = f'replica_{index}'
+    location = {'HOST': replica} if DATABASE_ENGINE == 'postgresql' else {'NAME': replica}
+    DATABASES[alias] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+    READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['app.routers.ReplicaRouter']
+
+# Seconds after a write during which the writing client reads from the primary.
+REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS', '5'))
+
+# Applied to every new SQLite connection (see app.signals). WAL lets readers
+# run alongside the single writer, and synchronous=NORMAL is durable in WAL mode.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'temp_store': 'memory',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'library-api'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '10000')),
+        },
     }
 }
 
@@ -129,6 +203,55 @@ STATIC_URL = '/static/'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication'
+        'app.authentication.CachedTokenAuthentication'
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ]
 }
+
+PAGE_SIZE = int(os.environ.get('PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '1000'))
+
+MAX_BULK_SIZE = int(os.environ.get('MAX_BULK_SIZE', '5000'))
+# Rows per DELETE when removing authors and their books.
+DELETE_BATCH_SIZE = int(os.environ.get('DELETE_BATCH_SIZE', '500'))
+
+MAX_MULTI_GET_IDS = int(os.environ.get('MAX_MULTI_GET_IDS', '100'))
+
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '2000'))
+
+SEARCH_INDEX = os.environ.get('SEARCH_INDEX', 'app.search.SQLiteSearchIndex')
+# Deepest search hit that can be paged to; the index still ranks every hit
+# before the offset.
+MAX_SEARCH_OFFSET = int(os.environ.get('MAX_SEARCH_OFFSET', '10000'))
+
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30'))
+
+# Server-sent catalog events (/api/v1/events). Each process keeps the last
+# EVENT_STREAM_BACKLOG events for clients resuming with Last-Event-ID, and a
+# client more than EVENT_STREAM_MAX_PENDING events behind is disconnected.
+EVENT_STREAM_BACKLOG = int(os.environ.get('EVENT_STREAM_BACKLOG', '10000'))
+EVENT_STREAM_MAX_PENDING = int(os.environ.get('EVENT_STREAM_MAX_PENDING', '1000'))
+EVENT_STREAM_MAX_SUBSCRIBERS = int(os.environ.get('EVENT_STREAM_MAX_SUBSCRIBERS', '10000'))
+EVENT_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('EVENT_STREAM_HEARTBEAT_SECONDS', '15'))
+
+# Background jobs (app.jobs), run by `manage.py run_workers`. A job whose
+# worker stops renewing its lease for JOB_LEASE_SECONDS is run again.
+JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', '1'))
+JOB_WORKER_THREADS = int(os.environ.get('JOB_WORKER_THREADS', '4'))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', '1'))
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', '60'))
+JOB_RETRY_SECONDS = int(os.environ.get('JOB_RETRY_SECONDS', '10'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+JOB_OUTPUT_DIR = os.environ.get('JOB_OUTPUT_DIR', os.path.join(BASE_DIR, 'job-output'))
+
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '600'))
+
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', '60'))
+
+METRICS_ENABLED = bool(int(os.environ.get('METRICS_ENABLED', '1')))
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', '1'))
+SLOW_REQUEST_MAX_STATEMENTS = int(os.environ.get('SLOW_REQUEST_MAX_STATEMENTS', '50'))
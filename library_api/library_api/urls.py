@@ -16,7 +16,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from app.views import MetricsAPIView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/v1/', include('app.urls', 'app'))
+    path('api/v1/', include('app.urls', 'app')),
+    path('metrics', MetricsAPIView.as_view(), name='metrics')
 ]